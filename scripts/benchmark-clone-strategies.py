@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Benchmark clone strategies on a local bare repository.
+
+Builds a bare repository with git fast-import, then for each clone
+strategy measures the clone time, the size of the clone's .git directory,
+and the cost of a later pull after new commits land upstream. Clones go
+through file:// so depth and filters are honored as with a real remote.
+
+Usage:
+    uv run python scripts/benchmark-clone-strategies.py [--commits 2000] [--files 500] [--new-commits 20]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from setup_repo.core.git_operations import BasicGitOperations, CloneStrategy
+from setup_repo.models.result import ResultStatus
+from setup_repo.utils.logging import configure_logging
+
+# Commits appended upstream are kept here so clones do not see them until the pull
+_NEXT_REF = "refs/bench/next"
+
+
+def _git(cwd: Path, *args: str, stdin: bytes | None = None) -> str:
+    result = subprocess.run(["git", *args], cwd=cwd, input=stdin, check=True, capture_output=True)
+    return result.stdout.decode().strip()
+
+
+def _blob(rng: random.Random, size: int) -> bytes:
+    """Build a text blob that compresses like source code rather than like zeros."""
+    words = [f"token_{rng.randrange(5000)}" for _ in range(size // 10)]
+    return " ".join(words).encode()[:size] + b"\n"
+
+
+def _commits(rng: random.Random, files: int, commits: int, start: int, parent: str | None) -> bytes:
+    """Build a fast-import stream of commits each touching a few files."""
+    out: list[bytes] = []
+    for n in range(commits):
+        changed = range(files) if parent is None and n == 0 else rng.sample(range(files), k=min(5, files))
+        lines = [
+            b"commit refs/heads/main\n",
+            f"committer Bench <bench@example.com> {1_700_000_000 + start + n} +0000\n".encode(),
+            f"data {len(msg := f'commit {start + n}'.encode())}\n".encode() + msg + b"\n",
+        ]
+        if n == 0 and parent is not None:
+            lines.append(f"from {parent}\n".encode())
+        for index in changed:
+            content = _blob(rng, rng.randrange(500, 8000))
+            lines.append(f"M 100644 inline src/module_{index // 50}/file_{index}.py\n".encode())
+            lines.append(f"data {len(content)}\n".encode() + content + b"\n")
+        out.extend(lines)
+    return b"".join(out)
+
+
+def _build_origin(path: Path, files: int, commits: int, new_commits: int) -> tuple[str, str]:
+    """Create the bare repository and return the base and next main SHAs."""
+    rng = random.Random(42)
+    _git(path.parent, "init", "-q", "--bare", "-b", "main", str(path))
+    _git(path, "config", "uploadpack.allowFilter", "true")
+    _git(path, "fast-import", "--quiet", stdin=_commits(rng, files, commits, 0, None))
+    base = _git(path, "rev-parse", "main")
+    _git(path, "fast-import", "--quiet", stdin=_commits(rng, files, new_commits, commits, base))
+    new = _git(path, "rev-parse", "main")
+    _git(path, "update-ref", _NEXT_REF, new)
+    _git(path, "update-ref", "refs/heads/main", base)
+    _git(path, "repack", "-a", "-d", "-q")
+    return base, new
+
+
+def _size_mb(path: Path) -> float:
+    total = 0
+    for root, _, names in os.walk(path):
+        total += sum((Path(root) / name).stat().st_size for name in names)
+    return total / 1024 / 1024
+
+
+def _measure(origin: Path, work: Path, strategy: CloneStrategy, base: str, new: str) -> dict[str, float]:
+    """Clone at the base commit, then pull the new commits."""
+    ops = BasicGitOperations(clone_strategy=strategy)
+    dest = work / strategy.value
+    _git(origin, "update-ref", "refs/heads/main", base)
+
+    start = time.perf_counter()
+    result = ops.clone(origin.as_uri(), dest, "main")
+    clone_s = time.perf_counter() - start
+    if result.status != ResultStatus.SUCCESS:
+        raise RuntimeError(f"{strategy} clone failed: {result.error}")
+    git_mb = _size_mb(dest / ".git")
+
+    _git(origin, "update-ref", "refs/heads/main", new)
+    result = ops.pull(dest)
+    if result.status != ResultStatus.SUCCESS:
+        raise RuntimeError(f"{strategy} pull failed: {result.error}")
+
+    row = {
+        "clone_s": clone_s,
+        "git_mb": git_mb,
+        "fetch_s": result.timings.get("fetch", 0.0),
+        "merge_s": result.timings.get("merge", 0.0),
+        "git_mb_after_pull": _size_mb(dest / ".git"),
+    }
+    if ops.is_shallow(dest):
+        start = time.perf_counter()
+        ops.deepen(dest)
+        row["unshallow_s"] = time.perf_counter() - start
+    shutil.rmtree(dest)
+    return row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commits", type=int, default=2000, help="Commits in the fixture history")
+    parser.add_argument("--files", type=int, default=500, help="Files in the fixture tree")
+    parser.add_argument("--new-commits", type=int, default=20, help="Commits pulled after cloning")
+    args = parser.parse_args()
+    configure_logging(level="WARNING")
+
+    with tempfile.TemporaryDirectory(prefix="clone-bench-") as tmp:
+        work = Path(tmp)
+        origin = work / "origin.git"
+        start = time.perf_counter()
+        base, new = _build_origin(origin, args.files, args.commits, args.new_commits)
+        print(f"fixture: {args.commits} commits, {args.files} files, {_size_mb(origin):.1f} MB packed", end="")
+        print(f" (built in {time.perf_counter() - start:.1f}s)\n")
+
+        header = f"{'strategy':<14}  {'clone s':>8}  {'.git MB':>8}  {'fetch s':>8}  {'merge s':>8}"
+        print(f"{header}  {'MB after':>8}  {'unshallow s':>11}")
+        for strategy in CloneStrategy:
+            row = _measure(origin, work, strategy, base, new)
+            unshallow = f"{row['unshallow_s']:>11.3f}" if "unshallow_s" in row else f"{'-':>11}"
+            print(
+                f"{strategy.value:<14}  {row['clone_s']:>8.3f}  {row['git_mb']:>8.2f}  "
+                f"{row['fetch_s']:>8.3f}  {row['merge_s']:>8.3f}  {row['git_mb_after_pull']:>8.2f}  {unshallow}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Benchmark the dirty check on a large synthetic working tree.
+
+Builds a repository with many tracked files plus an ignored build
+directory, then times has_changes() with git status and with the fast
+check that stops at the first change, for a clean tree and for trees with
+one change of each kind.
+
+Usage:
+    uv run python scripts/benchmark-dirty-check.py [--files 100000] [--dirs 1000] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from setup_repo.core.git_operations import BasicGitOperations
+from setup_repo.utils.logging import configure_logging
+
+_ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "Bench",
+    "GIT_AUTHOR_EMAIL": "bench@example.com",
+    "GIT_COMMITTER_NAME": "Bench",
+    "GIT_COMMITTER_EMAIL": "bench@example.com",
+}
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, env=_ENV)
+
+
+def _build_tree(path: Path, files: int, dirs: int, build_files: int) -> None:
+    """Create and commit the tracked tree, then add an ignored build directory."""
+    _git(path.parent, "init", "-q", "-b", "main", str(path))
+    per_dir = max(1, files // dirs)
+    for index in range(files):
+        directory = path / "src" / f"pkg_{index // per_dir:04d}"
+        if index % per_dir == 0:
+            directory.mkdir(parents=True)
+        (directory / f"module_{index % per_dir:03d}.py").write_text(f"VALUE = {index}\n")
+    (path / ".gitignore").write_text("build/\n")
+    _git(path, "add", "-A")
+    _git(path, "commit", "-q", "-m", "tree")
+    for index in range(build_files):
+        directory = path / "build" / f"obj_{index // 100:04d}"
+        if index % 100 == 0:
+            directory.mkdir(parents=True)
+        (directory / f"out_{index % 100:02d}.o").write_bytes(b"")
+
+
+def _scenarios(repo: Path) -> dict[str, tuple[Callable[[], None], Callable[[], None]]]:
+    """Changes to apply before each run and to revert afterwards."""
+    first = repo / "src" / "pkg_0000" / "module_000.py"
+    last = max((repo / "src").iterdir()) / "module_000.py"
+    deep_new = sorted((repo / "src").iterdir())[len(list((repo / "src").iterdir())) // 2] / "new" / "generated.py"
+    touched = sorted((repo / "src").iterdir())[:5]
+
+    def write(path: Path, text: str) -> Callable[[], None]:
+        return lambda: path.write_text(text)
+
+    def add_untracked() -> None:
+        deep_new.parent.mkdir(exist_ok=True)
+        deep_new.write_text("")
+
+    def remove_untracked() -> None:
+        deep_new.unlink()
+        deep_new.parent.rmdir()
+
+    def touch() -> None:
+        # Same content, new mtime: the index's stat data no longer matches
+        now = time.time() + 10
+        for directory in touched:
+            for file in directory.iterdir():
+                os.utime(file, (now, now))
+
+    return {
+        "clean": (lambda: None, lambda: None),
+        "touched files": (touch, lambda: None),
+        "modified (first)": (write(first, "changed\n"), write(first, first.read_text())),
+        "modified (last)": (write(last, "changed\n"), write(last, last.read_text())),
+        "staged": (
+            lambda: _git(repo, "rm", "-q", "--cached", str(first.relative_to(repo))),
+            lambda: _git(repo, "add", str(first.relative_to(repo))),
+        ),
+        "untracked": (add_untracked, remove_untracked),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=100_000, help="Tracked files in the fixture")
+    parser.add_argument("--dirs", type=int, default=1000, help="Directories the tracked files are spread over")
+    parser.add_argument("--build-files", type=int, default=20_000, help="Files in the ignored build directory")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (median is reported)")
+    args = parser.parse_args()
+    configure_logging(level="WARNING")
+
+    ops = BasicGitOperations()
+    checks: dict[str, Callable[[Path], bool]] = {
+        "status": lambda repo: ops.has_changes(repo, fast=False),
+        "fast": lambda repo: ops.has_changes(repo, fast=True),
+        "fast -uno": lambda repo: ops.has_changes(repo, fast=True, untracked=False),
+        "fast +ucache": lambda repo: ops.has_changes(repo, fast=True, untracked_cache=True),
+    }
+
+    with tempfile.TemporaryDirectory(prefix="dirty-bench-") as tmp:
+        repo = Path(tmp) / "repo"
+        start = time.perf_counter()
+        _build_tree(repo, args.files, args.dirs, args.build_files)
+        print(f"fixture: {args.files} tracked files in {args.dirs} directories, ", end="")
+        print(f"{args.build_files} ignored build files (built in {time.perf_counter() - start:.1f}s)\n")
+        # Populate the untracked cache once, as a git status with it enabled would
+        _git(repo, "-c", "core.untrackedCache=true", "status", "--porcelain")
+
+        print(f"{'scenario':<18}" + "".join(f"  {name + ' ms':>16}" for name in checks))
+        for scenario, (apply, revert) in _scenarios(repo).items():
+            row = f"{scenario:<18}"
+            for check in checks.values():
+                times: list[float] = []
+                answers: set[bool] = set()
+                for _ in range(args.repeat):
+                    apply()
+                    start = time.perf_counter()
+                    answers.add(check(repo))
+                    times.append(time.perf_counter() - start)
+                    revert()
+                answer = "dirty" if answers == {True} else "clean" if answers == {False} else "mixed"
+                row += f"  {statistics.median(times) * 1000:>9.1f} {answer:>6}"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
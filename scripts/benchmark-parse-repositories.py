@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for parsing repository listing pages.
+
+Compares the previous approach (decode the page with json.loads, then
+build each Repository inside a try/except) with the shared bulk parser
+used by the GitHub clients (one pydantic-core pass over the raw bytes).
+
+Usage:
+    uv run python scripts/benchmark-parse-repositories.py [--records 10000 100000]
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+
+from pydantic import ValidationError
+
+from setup_repo.core.github import PER_PAGE, parse_repository_page
+from setup_repo.models.repository import Repository
+
+
+def _rest_item(i: int) -> dict[str, object]:
+    """Build a repository item roughly the size of a REST API record."""
+    name = f"repo-{i}"
+    item: dict[str, object] = {
+        "id": i,
+        "node_id": f"R_{i:012d}",
+        "name": name,
+        "full_name": f"org/{name}",
+        "private": False,
+        "owner": {"login": "org", "id": 1, "type": "Organization", "site_admin": False},
+        "html_url": f"https://github.com/org/{name}",
+        "description": "Benchmark repository " * 3,
+        "fork": i % 7 == 0,
+        "clone_url": f"https://github.com/org/{name}.git",
+        "ssh_url": f"git@github.com:org/{name}.git",
+        "default_branch": "main",
+        "archived": i % 11 == 0,
+        "pushed_at": "2024-05-01T12:34:56Z",
+        "created_at": "2020-01-01T00:00:00Z",
+        "updated_at": "2024-05-01T12:34:56Z",
+        "topics": ["python", "cli", "benchmark"],
+        "permissions": {"admin": False, "maintain": False, "push": True, "triage": True, "pull": True},
+    }
+    # Remaining REST fields are mostly API URLs
+    for key in ("forks", "keys", "hooks", "issues", "pulls", "commits", "tags", "releases", "events", "labels"):
+        item[f"{key}_url"] = f"https://api.github.com/repos/org/{name}/{key}"
+    return item
+
+
+def _legacy_parse(content: bytes) -> list[Repository]:
+    """Per-item parsing as done before the bulk parser."""
+    repos: list[Repository] = []
+    for item in json.loads(content):
+        try:
+            repos.append(
+                Repository(
+                    name=item["name"],
+                    full_name=item["full_name"],
+                    clone_url=item["clone_url"],
+                    ssh_url=item["ssh_url"],
+                    default_branch=item.get("default_branch", "main"),
+                    private=item.get("private", False),
+                    archived=item.get("archived", False),
+                    fork=item.get("fork", False),
+                    pushed_at=item.get("pushed_at"),
+                )
+            )
+        except (ValidationError, KeyError):
+            continue
+    return repos
+
+
+def _bulk_parse(content: bytes) -> list[Repository]:
+    return parse_repository_page(content)[0]
+
+
+def _measure(pages: list[bytes], parse: Callable[[bytes], list[Repository]], repeat: int) -> float:
+    """Get the best wall time in seconds of parsing all pages."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            parse(page)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, nargs="+", default=[10_000, 100_000], help="Repository counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{'records':>8}  {'parser':<8}  {'seconds':>8}  {'records/s':>11}")
+    for records in args.records:
+        items = [_rest_item(i) for i in range(records)]
+        pages = [json.dumps(items[i : i + PER_PAGE]).encode() for i in range(0, records, PER_PAGE)]
+        for label, parse in (("legacy", _legacy_parse), ("bulk", _bulk_parse)):
+            seconds = _measure(pages, parse, args.repeat)
+            print(f"{records:>8}  {label:<8}  {seconds:>8.3f}  {records / seconds:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
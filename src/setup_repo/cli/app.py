@@ -6,7 +6,10 @@ from typing import Annotated
 import typer
 
 from setup_repo.cli.commands.cleanup import cleanup
+from setup_repo.cli.commands.deepen import deepen
 from setup_repo.cli.commands.init import init
+from setup_repo.cli.commands.maintain import maintain
+from setup_repo.cli.commands.mirror import mirror_app
 from setup_repo.cli.commands.sync import sync
 from setup_repo.models.config import get_settings
 from setup_repo.utils.logging import configure_logging, get_logger
@@ -22,6 +25,9 @@ app = typer.Typer(
 app.command()(init)
 app.command()(sync)
 app.command()(cleanup)
+app.command()(deepen)
+app.command()(maintain)
+app.add_typer(mirror_app, name="mirror")
 
 log = get_logger(__name__)
 
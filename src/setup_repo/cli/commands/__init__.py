@@ -1,7 +1,10 @@
 """CLI commands."""
 
 from setup_repo.cli.commands.cleanup import cleanup
+from setup_repo.cli.commands.deepen import deepen
 from setup_repo.cli.commands.init import init
+from setup_repo.cli.commands.maintain import maintain
+from setup_repo.cli.commands.mirror import mirror_app
 from setup_repo.cli.commands.sync import sync
 
-__all__ = ["cleanup", "init", "sync"]
+__all__ = ["cleanup", "deepen", "init", "maintain", "mirror_app", "sync"]
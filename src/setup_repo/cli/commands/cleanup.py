@@ -9,6 +9,7 @@ from rich.table import Table
 from setup_repo.cli.output import show_error, show_success, show_warning
 from setup_repo.core.branch_cleanup import get_squash_merged_branches
 from setup_repo.core.git import GitOperations
+from setup_repo.core.merged_prs import MergedPRStore
 from setup_repo.models.config import get_settings
 from setup_repo.utils.console import console
 
@@ -48,8 +49,9 @@ def cleanup(
     # First fetch --prune
     git.fetch_and_prune(repo_path)
 
-    # Get merged branches (these can be safely deleted with -d)
-    merged_branches = git.get_merged_branches(repo_path, base_branch)
+    # Read all branches once; merged ones can be safely deleted with -d
+    snapshot = git.get_branch_snapshot(repo_path, base_branch)
+    merged_branches = snapshot.merged_branches()
 
     # Track which branches need force delete
     squash_merged_branches: list[str] = []
@@ -64,6 +66,8 @@ def cleanup(
             github_token=settings.github_token,
             git_ssl_no_verify=settings.git_ssl_no_verify,
             warn=show_warning,
+            pr_store=MergedPRStore(settings.cache_dir / "merged_prs"),
+            snapshot=snapshot,
         )
         for branch in squash_branches:
             if branch not in merged_set:
@@ -108,14 +112,11 @@ def cleanup(
         if not confirm:
             raise typer.Abort()
 
-    # Delete branches
+    # Delete branches; each group is checked against the snapshot and deleted in one go
     deleted = 0
-    for branch in merged_branches:
-        if git.delete_branch(repo_path, branch, force=False):
-            deleted += 1
-
-    for branch in squash_merged_branches:
-        if git.delete_branch(repo_path, branch, force=True):
-            deleted += 1
+    for branches, force_delete in ((merged_branches, False), (squash_merged_branches, True)):
+        if branches:
+            results = git.delete_branches(repo_path, {b: snapshot.sha(b) for b in branches}, force=force_delete)
+            deleted += sum(results.values())
 
     show_success(f"{deleted}/{len(all_branches)} branch(es) deleted")
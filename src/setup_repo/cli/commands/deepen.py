@@ -0,0 +1,55 @@
+"""Deepen command for CLI."""
+
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from setup_repo.cli.commands.workspace import select_repositories
+from setup_repo.cli.output import show_info, show_summary
+from setup_repo.core.git import GitOperations
+from setup_repo.core.parallel import ParallelProcessor
+from setup_repo.models.config import get_settings
+from setup_repo.utils.logging import get_logger
+
+log = get_logger(__name__)
+
+
+def deepen(
+    repos: Annotated[
+        list[str] | None,
+        typer.Argument(help="Repository names in the workspace (default: all)"),
+    ] = None,
+    dest: Annotated[
+        Path | None,
+        typer.Option("--dest", "-d", help="Workspace directory"),
+    ] = None,
+    depth: Annotated[
+        int | None,
+        typer.Option("--depth", min=1, help="Commits to add to the history (default: fetch the full history)"),
+    ] = None,
+    jobs: Annotated[
+        int,
+        typer.Option("--jobs", "-j", help="Number of parallel jobs"),
+    ] = 10,
+) -> None:
+    """Fetch more history into shallow clones."""
+    settings = get_settings()
+    workspace = dest or settings.workspace_dir
+
+    paths = select_repositories(workspace, repos)
+    if not paths:
+        show_info(f"No repositories found in [dim]{workspace}[/]")
+        raise typer.Exit(0)
+
+    log.debug("deepen_started", workspace=str(workspace), repos=len(paths), depth=depth)
+    git = GitOperations(ssl_no_verify=settings.git_ssl_no_verify)
+    summary = ParallelProcessor(max_workers=jobs).process(
+        paths,
+        lambda path: git.deepen(path, depth),
+        desc="Deepening",
+    )
+    show_summary(summary)
+
+    if summary.failed > 0:
+        raise typer.Exit(1)
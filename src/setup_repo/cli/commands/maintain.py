@@ -0,0 +1,77 @@
+"""Maintain command for CLI."""
+
+import time
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from setup_repo.cli.commands.workspace import select_repositories
+from setup_repo.cli.output import show_error, show_info, show_summary
+from setup_repo.core.git import GitOperations
+from setup_repo.core.git_operations import MaintenanceTask
+from setup_repo.core.parallel import ParallelProcessor
+from setup_repo.models.config import get_settings
+from setup_repo.utils.logging import get_logger
+
+log = get_logger(__name__)
+
+
+def maintain(
+    repos: Annotated[
+        list[str] | None,
+        typer.Argument(help="Repository names in the workspace (default: all)"),
+    ] = None,
+    dest: Annotated[
+        Path | None,
+        typer.Option("--dest", "-d", help="Workspace directory"),
+    ] = None,
+    task: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--task",
+            "-t",
+            help="Task to run, repeatable: prefetch, loose-objects, incremental-repack, commit-graph (default: all)",
+        ),
+    ] = None,
+    time_budget: Annotated[
+        int | None,
+        typer.Option(
+            "--time-budget",
+            min=1,
+            help="Seconds after which no further task is started (default: from config, or no limit)",
+        ),
+    ] = None,
+    jobs: Annotated[
+        int,
+        typer.Option("--jobs", "-j", help="Number of parallel jobs"),
+    ] = 10,
+) -> None:
+    """Run git maintenance tasks across the workspace."""
+    settings = get_settings()
+    workspace = dest or settings.workspace_dir
+
+    known = [t.value for t in MaintenanceTask]
+    if unknown := [name for name in task or [] if name not in known]:
+        show_error(f"Unknown maintenance task: {', '.join(unknown)} (expected one of {', '.join(known)})")
+        raise typer.Exit(1)
+    tasks = [MaintenanceTask(name) for name in task] if task else list(MaintenanceTask)
+
+    paths = select_repositories(workspace, repos)
+    if not paths:
+        show_info(f"No repositories found in [dim]{workspace}[/]")
+        raise typer.Exit(0)
+
+    budget = time_budget or settings.maintenance_time_budget
+    deadline = time.monotonic() + budget if budget else None
+    log.debug("maintain_started", workspace=str(workspace), repos=len(paths), tasks=[t.value for t in tasks])
+    git = GitOperations(ssl_no_verify=settings.git_ssl_no_verify)
+    summary = ParallelProcessor(max_workers=jobs).process(
+        paths,
+        lambda path: git.maintain(path, tasks, deadline),
+        desc="Maintaining",
+    )
+    show_summary(summary)
+
+    if summary.failed > 0:
+        raise typer.Exit(1)
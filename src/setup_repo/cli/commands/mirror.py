@@ -0,0 +1,95 @@
+"""Mirror commands for CLI."""
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated
+
+import typer
+
+from setup_repo.cli.commands.sync import (
+    _create_github_client,
+    _create_mirror_cache,
+    _create_response_cache,
+    _RepositorySource,
+)
+from setup_repo.cli.output import show_error, show_info, show_summary
+from setup_repo.core.inventory import RepositoryInventory
+from setup_repo.core.parallel import ParallelProcessor
+from setup_repo.core.rate_limit import RateLimitScheduler
+from setup_repo.models.config import get_settings
+from setup_repo.models.result import ProcessResult
+from setup_repo.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from setup_repo.models.repository import Repository
+
+log = get_logger(__name__)
+
+mirror_app = typer.Typer(help="Manage the shared bare-mirror cache", no_args_is_help=True)
+
+
+@mirror_app.command("update")
+def update(
+    owner: Annotated[
+        str | None,
+        typer.Option("--owner", "-o", help="GitHub owner name"),
+    ] = None,
+    jobs: Annotated[
+        int,
+        typer.Option("--jobs", "-j", help="Number of parallel jobs"),
+    ] = 10,
+    offline: Annotated[
+        bool,
+        typer.Option("--offline", help="Use the saved repository inventory instead of the GitHub API"),
+    ] = False,
+) -> None:
+    """Create or refresh the bare mirror of every repository."""
+    settings = get_settings()
+
+    owner = owner or settings.github_owner
+    if not owner:
+        show_error("GitHub owner is not specified")
+        raise typer.Exit(1)
+    mirrors = _create_mirror_cache(settings)
+    if mirrors is None:
+        show_error("Mirror cache is not configured. Set [mirror] dir in the config file or SETUP_REPO_MIRROR_DIR.")
+        raise typer.Exit(1)
+
+    show_info(f"Updating mirrors for [cyan]{owner}[/] in [dim]{mirrors.mirror_dir}[/]")
+    inventory = RepositoryInventory(settings.cache_dir / "inventory")
+    client = (
+        None
+        if offline
+        else _create_github_client(
+            settings,
+            rate_limit=RateLimitScheduler(),
+            cache=_create_response_cache(settings),
+            use_graphql=settings.inventory_backend == "graphql",
+        )
+    )
+    source = _RepositorySource(client, inventory, owner)
+    repo_by_path: dict[Path, Repository] = {}
+
+    def stream_paths() -> Iterator[Path]:
+        for page in source.pages():
+            for repo in page:
+                path = mirrors.path(repo.full_name)
+                repo_by_path[path] = repo
+                yield path
+
+    def update_mirror(path: Path) -> ProcessResult:
+        repo = repo_by_path[path]
+        return mirrors.update(repo.full_name, repo.get_clone_url(settings.use_https))
+
+    try:
+        summary = ParallelProcessor(max_workers=jobs).process(stream_paths(), update_mirror, desc="Updating mirrors")
+        if source.complete:
+            inventory.save(owner, list(repo_by_path.values()))
+    finally:
+        source.close()
+
+    log.info("mirror_update_completed", owner=owner, total=summary.total, failed=summary.failed)
+    show_summary(summary)
+
+    if summary.failed > 0:
+        raise typer.Exit(1)
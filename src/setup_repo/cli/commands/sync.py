@@ -1,25 +1,56 @@
 """Sync command for CLI."""
 
+import os
 import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Any, NamedTuple
 
+import anyio
+import anyio.to_thread
+import httpx
 import typer
 from rich.table import Table
 
 from setup_repo.cli.output import show_error, show_info, show_success, show_summary, show_warning
-from setup_repo.core.branch_cleanup import get_squash_merged_branches
+from setup_repo.core.async_git import AsyncGitOperations
+from setup_repo.core.branch_cleanup import build_merged_pr_query, get_squash_merged_branches
 from setup_repo.core.git import GitOperations
-from setup_repo.core.github import GitHubClient
-from setup_repo.core.parallel import ParallelProcessor
-from setup_repo.models.config import get_settings
+from setup_repo.core.git_branch import BranchSnapshot
+from setup_repo.core.git_operations import (
+    BasicGitOperations,
+    FetchProfile,
+    FetchScope,
+    MaintenanceTask,
+    PruneMode,
+)
+from setup_repo.core.github import AsyncGitHubClient, GitHubClient
+from setup_repo.core.github_graphql import MergedPRQuery
+from setup_repo.core.http_cache import ResponseCache
+from setup_repo.core.inventory import RepositoryInventory
+from setup_repo.core.merged_prs import MergedPRStore
+from setup_repo.core.mirror import MirrorCache
+from setup_repo.core.parallel import AsyncParallelProcessor, ParallelProcessor
+from setup_repo.core.rate_limit import RateLimitScheduler
+from setup_repo.core.ssh_mux import SshMultiplexer
+from setup_repo.core.sync_state import SyncState
+from setup_repo.models.config import AppSettings, get_settings
 from setup_repo.models.repository import Repository
-from setup_repo.models.result import ProcessResult, ResultStatus
+from setup_repo.models.result import ProcessResult, ResultStatus, SyncSummary
 from setup_repo.utils.console import console
 from setup_repo.utils.logging import get_logger
 
 log = get_logger(__name__)
 
+_ENGINES = ("thread", "async")
+# Parallel jobs of the thread engine unless --jobs is given
+_DEFAULT_JOBS = 10
+# Maintenance after sync; the sync itself just fetched, so prefetch is left out
+_POST_SYNC_TASKS = (MaintenanceTask.LOOSE_OBJECTS, MaintenanceTask.INCREMENTAL_REPACK, MaintenanceTask.COMMIT_GRAPH)
+
 
 def sync(
     owner: Annotated[
@@ -31,9 +62,13 @@ def sync(
         typer.Option("--dest", "-d", help="Destination directory for cloning"),
     ] = None,
     jobs: Annotated[
-        int,
-        typer.Option("--jobs", "-j", help="Number of parallel jobs"),
-    ] = 10,
+        int | None,
+        typer.Option(
+            "--jobs",
+            "-j",
+            help="Number of parallel jobs (default: 10, or max_concurrency with the async engine)",
+        ),
+    ] = None,
     no_prune: Annotated[
         bool,
         typer.Option("--no-prune", help="Skip fetch --prune"),
@@ -42,6 +77,18 @@ def sync(
         bool,
         typer.Option("--dry-run", "-n", help="Preview without executing"),
     ] = False,
+    offline: Annotated[
+        bool,
+        typer.Option("--offline", help="Use the saved repository inventory instead of the GitHub API"),
+    ] = False,
+    full: Annotated[
+        bool,
+        typer.Option("--full", help="Fetch and pull every repository, even if unchanged upstream"),
+    ] = False,
+    engine: Annotated[
+        str | None,
+        typer.Option("--engine", help="Execution engine: thread or async (default: from config)"),
+    ] = None,
 ) -> None:
     """Sync repositories from GitHub."""
     settings = get_settings()
@@ -50,67 +97,151 @@ def sync(
     if not owner:
         show_error("GitHub owner is not specified")
         raise typer.Exit(1)
+    if engine is not None and engine not in _ENGINES:
+        show_error(f"Unknown engine: {engine} (expected 'thread' or 'async')")
+        raise typer.Exit(1)
+    use_async = (engine or settings.sync_engine) == "async"
 
     dest_dir = dest or settings.workspace_dir
     dest_dir.mkdir(parents=True, exist_ok=True)
 
-    log.debug("sync_started", owner=owner, dest=str(dest_dir), jobs=jobs)
+    log.debug("sync_started", owner=owner, dest=str(dest_dir), jobs=jobs, engine="async" if use_async else "thread")
     show_info(f"Syncing repositories for [cyan]{owner}[/] to [dim]{dest_dir}[/]")
 
     # Get repository list
-    log.debug("fetching_repositories", owner=owner)
-    client = GitHubClient(
-        token=settings.github_token,
-        verify_ssl=not settings.git_ssl_no_verify,
+    log.debug("fetching_repositories", owner=owner, offline=offline)
+    inventory = RepositoryInventory(settings.cache_dir / "inventory")
+    # Shared by the listing and squash detection so they draw from one budget
+    rate_limit = RateLimitScheduler()
+
+    if use_async and not dry_run:
+        sync_state = SyncState(settings.cache_dir / "sync_state.json")
+        if not full:
+            sync_state.load()
+        job = _AsyncSync(
+            settings,
+            owner,
+            dest_dir,
+            concurrency=jobs or settings.max_concurrency,
+            auto_prune=not no_prune,
+            offline=offline,
+            full=full,
+            inventory=inventory,
+            sync_state=sync_state,
+            rate_limit=rate_limit,
+        )
+        try:
+            summary = anyio.run(job.run)
+            if job.auto_cleanup is not None:
+                job.auto_cleanup.finish(settings.max_workers)
+        finally:
+            sync_state.save()
+            if job.auto_cleanup is not None:
+                job.auto_cleanup.close()
+        if settings.maintenance_after_sync:
+            _run_post_sync_maintenance(settings, summary, dest_dir, settings.max_workers)
+        _finish_sync(summary, job.auto_cleanup)
+        return
+    client = (
+        None
+        if offline
+        else _create_github_client(
+            settings,
+            rate_limit=rate_limit,
+            cache=_create_response_cache(settings),
+            use_graphql=settings.inventory_backend == "graphql",
+        )
     )
+    source = _RepositorySource(client, inventory, owner)
 
+    repo_pages = source.pages()
+    sync_state = SyncState(settings.cache_dir / "sync_state.json")
+    if not full:
+        sync_state.load()
     try:
-        repos = client.get_repositories(owner)
-        log.info("repositories_fetched", owner=owner, count=len(repos))
-    finally:
-        client.close()
-
-    if not repos:
+        # Only the first page is awaited; later pages stream in while workers run
+        first_page = next(repo_pages, [])
+        if dry_run:
+            first_page.extend(repo for page in repo_pages for repo in page)
+    except Exception:
+        source.close()
+        raise
+
+    if not first_page:
+        source.close()
         show_warning("No repositories found")
         raise typer.Exit(0)
 
-    show_info(f"Found [cyan]{len(repos)}[/] repositories")
-
     # Dry-run mode
     if dry_run:
-        _show_dry_run(repos, dest_dir)
+        source.close()
+        if source.complete:
+            inventory.save(owner, first_page)
+        show_info(f"Found [cyan]{len(first_page)}[/] repositories")
+        _show_dry_run(first_page, dest_dir, None if full or source.from_inventory else sync_state)
         raise typer.Exit(0)
 
     # Sync processing
+    ssh = _create_ssh_multiplexer(settings)
     git = GitOperations(
         auto_prune=not no_prune,
+        auto_stash=settings.auto_stash,
         ssl_no_verify=settings.git_ssl_no_verify,
+        clone_strategy=settings.clone_strategy,
+        auto_gc=False,
+        ssh=ssh,
+        fetch_profile=_create_fetch_profile(settings),
     )
+    mirrors = _create_mirror_cache(settings)
+    jobs = jobs or _DEFAULT_JOBS
     processor = ParallelProcessor(max_workers=jobs)
 
     log.debug("sync_config", auto_prune=not no_prune, ssl_no_verify=settings.git_ssl_no_verify)
 
-    repo_by_name = {repo.name: repo for repo in repos}
-    cleanup_stats = {"total_deleted": 0, "total_repos": 0}
-    cleanup_lock = threading.Lock()
-    include_squash = settings.auto_cleanup_include_squash
-    if include_squash and not settings.github_token:
-        show_warning("Auto cleanup with squash detection requires a GitHub token. Skipping squash detection.")
-        include_squash = False
+    repo_by_name: dict[str, Repository] = {}
+    # Repositories listed by the API; pushed_at from the saved inventory may be stale
+    fresh_names: set[str] = set()
+
+    def stream_paths() -> Iterator[Path]:
+        for page in chain([first_page], repo_pages):
+            for repo in page:
+                repo_by_name[repo.name] = repo
+                if not source.from_inventory:
+                    fresh_names.add(repo.name)
+                yield dest_dir / repo.name
+
+    auto_cleanup = _AutoCleanup.create(
+        settings,
+        git,
+        rate_limit=rate_limit,
+        from_inventory=source.from_inventory,
+    )
 
     def process_repo(repo_path: Path) -> ProcessResult:
         repo = repo_by_name.get(repo_path.name)
+        pushed_at = repo.pushed_at if repo is not None and repo.name in fresh_names else None
         if repo_path.exists():
+            if not full and sync_state.is_up_to_date(repo_path, pushed_at):
+                log.debug("up_to_date", repo=repo_path.name)
+                return ProcessResult(
+                    repo_name=repo_path.name,
+                    status=ResultStatus.SKIPPED,
+                    message="up to date",
+                )
             log.debug("pulling", repo=repo_path.name)
-            result = git.pull(repo_path)
+            # Without fresh API data, ask the remote whether anything moved
+            result = git.pull(repo_path, check_remote_head=not full and pushed_at is None)
         else:
             # Find corresponding repository
             if repo:
-                log.debug("cloning", repo=repo_path.name, url=repo.get_clone_url(settings.use_https))
+                url = repo.get_clone_url(settings.use_https)
+                reference = mirrors.get(repo.full_name) if mirrors is not None else None
+                log.debug("cloning", repo=repo_path.name, url=url, mirror=reference is not None)
                 result = git.clone(
-                    repo.get_clone_url(settings.use_https),
+                    url,
                     repo_path,
                     repo.default_branch,
+                    reference=reference,
                 )
             else:
                 result = ProcessResult(
@@ -119,26 +250,42 @@ def sync(
                     message="Repository not found",
                 )
 
-        if settings.auto_cleanup and result.status == ResultStatus.SUCCESS:
-            base_branch = repo.default_branch if repo else "main"
-            deleted = _run_auto_cleanup(
-                git,
-                repo_path,
-                base_branch,
-                include_squash=include_squash,
-                github_token=settings.github_token,
-                git_ssl_no_verify=settings.git_ssl_no_verify,
-            )
-            if deleted > 0:
-                with cleanup_lock:
-                    cleanup_stats["total_deleted"] += deleted
-                    cleanup_stats["total_repos"] += 1
+        if result.status == ResultStatus.SUCCESS:
+            sync_state.record(repo_path, pushed_at)
+            if auto_cleanup is not None:
+                auto_cleanup.run(repo_path, repo.default_branch if repo else "main")
 
         return result
 
-    paths = [dest_dir / repo.name for repo in repos]
-    summary = processor.process(paths, process_repo, desc="Syncing")
+    try:
+        if ssh is not None:
+            ssh.start()
+        summary = processor.process(stream_paths(), process_repo, desc="Syncing")
+        log.info("repositories_fetched", owner=owner, count=len(repo_by_name), from_inventory=source.from_inventory)
+        if source.complete:
+            inventory.save(owner, list(repo_by_name.values()))
+        if auto_cleanup is not None:
+            auto_cleanup.finish(jobs)
+    finally:
+        sync_state.save()
+        source.close()
+        if auto_cleanup is not None:
+            auto_cleanup.close()
+        if ssh is not None:
+            ssh.stop()
+
+    if settings.maintenance_after_sync:
+        _run_post_sync_maintenance(settings, summary, dest_dir, jobs)
+    _finish_sync(summary, auto_cleanup)
+
+
+def _finish_sync(summary: SyncSummary, auto_cleanup: "_AutoCleanup | None") -> None:
+    """Report the outcome of a sync and exit non-zero if any repository failed.
 
+    Args:
+        summary: Results of all repositories
+        auto_cleanup: Auto cleanup that ran after each repository, if enabled
+    """
     log.info(
         "sync_completed",
         total=summary.total,
@@ -151,18 +298,485 @@ def sync(
     show_summary(summary)
 
     # Show auto-cleanup results if enabled
-    if settings.auto_cleanup and cleanup_stats["total_deleted"] > 0:
+    if auto_cleanup is not None and auto_cleanup.deleted > 0:
         show_success(
-            f"Auto-cleanup: {cleanup_stats['total_deleted']} merged branch(es) deleted "
-            f"across {cleanup_stats['total_repos']} repository(ies)"
+            f"Auto-cleanup: {auto_cleanup.deleted} merged branch(es) deleted "
+            f"across {auto_cleanup.repos} repository(ies)"
         )
 
     if summary.failed > 0:
         raise typer.Exit(1)
 
 
-def _show_dry_run(repos: list[Repository], dest_dir: Path) -> None:
-    """Show dry-run preview."""
+def _run_post_sync_maintenance(settings: AppSettings, summary: SyncSummary, dest_dir: Path, jobs: int) -> None:
+    """Run git maintenance on the synced repositories.
+
+    Sync runs git with auto gc disabled so no worker stalls on a repack;
+    this stage does that work in one place, within the configured time
+    budget.
+
+    Args:
+        settings: Application settings
+        summary: Results of the sync
+        dest_dir: Workspace directory
+        jobs: Number of parallel jobs
+    """
+    paths = [
+        dest_dir / result.repo_name
+        for result in summary.results
+        if result.status != ResultStatus.FAILED and (dest_dir / result.repo_name / ".git").exists()
+    ]
+    if not paths:
+        return
+    budget = settings.maintenance_time_budget
+    deadline = time.monotonic() + budget if budget else None
+    git = GitOperations(ssl_no_verify=settings.git_ssl_no_verify)
+    maintenance = ParallelProcessor(max_workers=jobs).process(
+        paths,
+        lambda path: git.maintain(path, _POST_SYNC_TASKS, deadline),
+        desc="Maintaining",
+    )
+    log.info(
+        "post_sync_maintenance_completed",
+        total=maintenance.total,
+        failed=maintenance.failed,
+        skipped=maintenance.skipped,
+        duration=f"{maintenance.duration:.1f}s",
+    )
+    if maintenance.failed > 0:
+        show_warning(f"Maintenance failed in {maintenance.failed} repository(ies)")
+    if maintenance.skipped > 0:
+        show_info(f"Maintenance time budget ran out; {maintenance.skipped} repository(ies) were not maintained")
+
+
+class _PendingCleanup(NamedTuple):
+    """A repository waiting for batched squash detection."""
+
+    repo_path: Path
+    base_branch: str
+    query: MergedPRQuery | None
+    snapshot: BranchSnapshot
+
+
+class _AutoCleanup:
+    """Delete merged branches of each repository right after it is synced.
+
+    run() may be called from several worker threads. With batched squash
+    detection, repositories are only queued by run() and cleaned up by
+    finish() once all of them are synced.
+    """
+
+    def __init__(
+        self,
+        settings: AppSettings,
+        git: GitOperations,
+        *,
+        include_squash: bool,
+        client: GitHubClient | None,
+    ) -> None:
+        self.git = git
+        self.include_squash = include_squash
+        self.github_token = settings.github_token
+        self.git_ssl_no_verify = settings.git_ssl_no_verify
+        self.client = client
+        self.batch = client is not None and settings.auto_cleanup_squash_batch
+        # Branches deleted and repositories they were deleted in
+        self.deleted = 0
+        self.repos = 0
+        self._pending: list[_PendingCleanup] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(
+        cls,
+        settings: AppSettings,
+        git: GitOperations,
+        *,
+        rate_limit: RateLimitScheduler,
+        from_inventory: bool,
+    ) -> "_AutoCleanup | None":
+        """Create the auto cleanup configured in settings, or None if disabled."""
+        include_squash = settings.auto_cleanup_include_squash
+        if include_squash and not settings.github_token:
+            show_warning("Auto cleanup with squash detection requires a GitHub token. Skipping squash detection.")
+            include_squash = False
+        if include_squash and from_inventory:
+            show_info("Squash detection needs the GitHub API. Skipping it while offline.")
+            include_squash = False
+        if not settings.auto_cleanup:
+            return None
+        # One pooled client for squash detection across all worker threads
+        client = (
+            _create_github_client(
+                settings,
+                rate_limit=rate_limit,
+                pr_store=MergedPRStore(settings.cache_dir / "merged_prs"),
+            )
+            if include_squash
+            else None
+        )
+        return cls(settings, git, include_squash=include_squash, client=client)
+
+    def run(self, repo_path: Path, base_branch: str) -> None:
+        """Clean up a synced repository, or queue it for batched squash detection."""
+        if self.batch and (repo_path / ".git").exists():
+            snapshot = self.git.get_branch_snapshot(repo_path, base_branch)
+            query = build_merged_pr_query(self.git, repo_path, base_branch, snapshot)
+            with self._lock:
+                self._pending.append(_PendingCleanup(repo_path, base_branch, query, snapshot))
+            return
+        self._record(
+            _run_auto_cleanup(
+                self.git,
+                repo_path,
+                base_branch,
+                include_squash=self.include_squash,
+                github_token=self.github_token,
+                git_ssl_no_verify=self.git_ssl_no_verify,
+                client=self.client,
+            )
+        )
+
+    def finish(self, jobs: int) -> None:
+        """Clean up the repositories queued for batched squash detection."""
+        if not self._pending or self.client is None:
+            return
+        for deleted in _run_batched_auto_cleanup(
+            self.git,
+            self._pending,
+            client=self.client,
+            jobs=jobs,
+            github_token=self.github_token,
+            git_ssl_no_verify=self.git_ssl_no_verify,
+        ):
+            self._record(deleted)
+
+    def close(self) -> None:
+        """Close the squash detection client, if any."""
+        if self.client is not None:
+            self.client.close()
+
+    def _record(self, deleted: int) -> None:
+        if deleted > 0:
+            with self._lock:
+                self.deleted += deleted
+                self.repos += 1
+
+
+class _AsyncSync:
+    """Sync on one event loop (``--engine async``).
+
+    The repository listing (AsyncGitHubClient) and every clone, fetch and
+    merge run as coroutines, with at most ``concurrency`` repositories in
+    flight. Auto cleanup is short local git work and runs on worker
+    threads, at most ``max_workers`` at a time.
+    """
+
+    def __init__(
+        self,
+        settings: AppSettings,
+        owner: str,
+        dest_dir: Path,
+        *,
+        concurrency: int,
+        auto_prune: bool,
+        offline: bool,
+        full: bool,
+        inventory: RepositoryInventory,
+        sync_state: SyncState,
+        rate_limit: RateLimitScheduler,
+    ) -> None:
+        self.settings = settings
+        self.owner = owner
+        self.dest_dir = dest_dir
+        self.concurrency = concurrency
+        self.offline = offline
+        self.full = full
+        self.inventory = inventory
+        self.sync_state = sync_state
+        self.rate_limit = rate_limit
+        self.ssh = _create_ssh_multiplexer(settings)
+        self.git = AsyncGitOperations(
+            auto_prune=auto_prune,
+            auto_stash=settings.auto_stash,
+            ssl_no_verify=settings.git_ssl_no_verify,
+            clone_strategy=settings.clone_strategy,
+            auto_gc=False,
+            ssh=self.ssh,
+            fetch_profile=_create_fetch_profile(settings),
+        )
+        self.mirrors = _create_mirror_cache(settings)
+        self.cleanup_git = GitOperations(
+            auto_prune=auto_prune,
+            auto_stash=settings.auto_stash,
+            ssl_no_verify=settings.git_ssl_no_verify,
+            auto_gc=False,
+        )
+        # Set once the listing tells whether squash detection can run
+        self.auto_cleanup: _AutoCleanup | None = None
+
+    async def run(self) -> SyncSummary:
+        """List the repositories and sync them."""
+        repos, from_inventory = await self._list_repositories()
+        if not repos:
+            show_warning("No repositories found")
+            raise typer.Exit(0)
+
+        self.auto_cleanup = _AutoCleanup.create(
+            self.settings,
+            self.cleanup_git,
+            rate_limit=self.rate_limit,
+            from_inventory=from_inventory,
+        )
+        cleanup_limiter = anyio.CapacityLimiter(self.settings.max_workers)
+        repo_by_name = {repo.name: repo for repo in repos}
+
+        async def process_repo(repo_path: Path) -> ProcessResult:
+            repo = repo_by_name[repo_path.name]
+            # pushed_at from the saved inventory may be stale
+            pushed_at = None if from_inventory else repo.pushed_at
+            if repo_path.exists():
+                if not self.full and self.sync_state.is_up_to_date(repo_path, pushed_at):
+                    log.debug("up_to_date", repo=repo_path.name)
+                    return ProcessResult(repo_name=repo_path.name, status=ResultStatus.SKIPPED, message="up to date")
+                log.debug("pulling", repo=repo_path.name)
+                result = await self.git.pull(repo_path, check_remote_head=not self.full and pushed_at is None)
+            else:
+                url = repo.get_clone_url(self.settings.use_https)
+                reference = self.mirrors.get(repo.full_name) if self.mirrors is not None else None
+                log.debug("cloning", repo=repo_path.name, url=url, mirror=reference is not None)
+                result = await self.git.clone(url, repo_path, repo.default_branch, reference=reference)
+
+            if result.status == ResultStatus.SUCCESS:
+                self.sync_state.record(repo_path, pushed_at)
+                if self.auto_cleanup is not None:
+                    await anyio.to_thread.run_sync(
+                        self.auto_cleanup.run,
+                        repo_path,
+                        repo.default_branch,
+                        limiter=cleanup_limiter,
+                    )
+            return result
+
+        processor = AsyncParallelProcessor(max_concurrency=self.concurrency)
+        log.debug("sync_config", engine="async", concurrency=self.concurrency)
+        if self.ssh is not None:
+            await anyio.to_thread.run_sync(self.ssh.start)
+        try:
+            return await processor.process((self.dest_dir / repo.name for repo in repos), process_repo, desc="Syncing")
+        finally:
+            if self.ssh is not None:
+                # Closing the masters takes a moment and must also run when the sync is cancelled
+                self.ssh.stop()
+
+    async def _list_repositories(self) -> tuple[list[Repository], bool]:
+        """List repositories from the API, falling back to the saved inventory.
+
+        Returns:
+            Repositories and whether they came from the saved inventory
+        """
+        if not self.offline:
+            repos: list[Repository] = []
+            error: Exception | None = None
+            async with AsyncGitHubClient(
+                token=self.settings.github_token,
+                verify_ssl=not self.settings.git_ssl_no_verify,
+                cache=_create_response_cache(self.settings),
+                use_graphql=self.settings.inventory_backend == "graphql",
+                rate_limit=self.rate_limit,
+            ) as client:
+                try:
+                    repos = await client.get_repositories(self.owner)
+                except* httpx.HTTPError as group:
+                    # Concurrent page fetches fail as a group
+                    error = group.exceptions[0]
+            if error is None:
+                self.inventory.save(self.owner, repos)
+                log.info("repositories_fetched", owner=self.owner, count=len(repos), from_inventory=False)
+                return repos, False
+            log.warning("repository_listing_failed", owner=self.owner, error=str(error))
+            show_warning(f"GitHub API is unavailable ({error}). Falling back to the saved repository inventory.")
+
+        repos = _load_saved_inventory(self.inventory, self.owner)
+        log.info("repositories_fetched", owner=self.owner, count=len(repos), from_inventory=True)
+        return repos, True
+
+
+class _RepositorySource:
+    """Repository pages from the GitHub API, falling back to the saved inventory.
+
+    Without a client (offline mode), or when the API fails with an HTTP
+    error, the remaining repositories come from the inventory saved by the
+    last complete listing.
+    """
+
+    def __init__(self, client: GitHubClient | None, inventory: RepositoryInventory, owner: str) -> None:
+        self.client = client
+        self.inventory = inventory
+        self.owner = owner
+        # The whole listing came from the API (worth saving)
+        self.complete = False
+        # At least part of the listing came from the saved inventory
+        self.from_inventory = False
+
+    def pages(self) -> Iterator[list[Repository]]:
+        """Yield repository pages."""
+        yielded: set[str] = set()
+        if self.client is not None:
+            try:
+                for page in self.client.iter_repository_pages(self.owner):
+                    yielded.update(repo.full_name for repo in page)
+                    yield page
+                self.complete = True
+                return
+            except httpx.HTTPError as e:
+                log.warning("repository_listing_failed", owner=self.owner, error=str(e))
+                show_warning(f"GitHub API is unavailable ({e}). Falling back to the saved repository inventory.")
+
+        saved = _load_saved_inventory(self.inventory, self.owner)
+        self.from_inventory = True
+        if remaining := [repo for repo in saved if repo.full_name not in yielded]:
+            yield remaining
+
+    def close(self) -> None:
+        """Close the API client, if any."""
+        if self.client is not None:
+            self.client.close()
+
+
+def _load_saved_inventory(inventory: RepositoryInventory, owner: str) -> list[Repository]:
+    """Load the saved repository inventory, exiting if there is none.
+
+    Args:
+        inventory: Inventory store
+        owner: GitHub username or organization
+
+    Returns:
+        Saved repositories
+    """
+    saved = inventory.load(owner)
+    if saved is None:
+        show_error(f"No saved repository inventory for {owner}. Run sync once while online.")
+        raise typer.Exit(1)
+
+    saved_at = saved.saved_at.astimezone().strftime("%Y-%m-%d %H:%M") if saved.saved_at else "unknown time"
+    log.info("using_saved_inventory", owner=owner, count=len(saved.repositories), saved_at=str(saved.saved_at))
+    show_info(f"Using the repository inventory saved at [dim]{saved_at}[/]")
+    return saved.repositories
+
+
+def _run_batched_auto_cleanup(
+    git: GitOperations,
+    pending: list[_PendingCleanup],
+    *,
+    client: GitHubClient,
+    jobs: int,
+    github_token: str | None,
+    git_ssl_no_verify: bool,
+) -> list[int]:
+    """Run auto cleanup with merged PRs resolved for all repositories at once.
+
+    Merged PRs are looked up with batched GraphQL queries; repositories the
+    batch could not resolve fall back to the per-repository REST walk.
+
+    Args:
+        git: GitOperations instance
+        pending: Repositories with their merged PR query and branch snapshot
+        client: Shared GitHub client
+        jobs: Number of parallel cleanup workers
+
+    Returns:
+        Number of branches deleted per repository
+    """
+    queries = [item.query for item in pending if item.query is not None]
+    merged_by_query = client.get_merged_pull_requests_batch(queries)
+
+    def cleanup_repo(item: _PendingCleanup) -> int:
+        query = item.query
+        merged_prs = None
+        if query is not None:
+            # No candidate branches means nothing to look up
+            merged_prs = merged_by_query.get(query, None if query.branches else {})
+        return _run_auto_cleanup(
+            git,
+            item.repo_path,
+            item.base_branch,
+            include_squash=True,
+            github_token=github_token,
+            git_ssl_no_verify=git_ssl_no_verify,
+            client=client,
+            merged_prs=merged_prs,
+            snapshot=item.snapshot,
+        )
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(cleanup_repo, pending))
+
+
+def _create_github_client(
+    settings: AppSettings,
+    *,
+    rate_limit: RateLimitScheduler,
+    **kwargs: Any,
+) -> GitHubClient:
+    """Create a pooled GitHub client configured from settings."""
+    return GitHubClient(
+        token=settings.github_token,
+        verify_ssl=not settings.git_ssl_no_verify,
+        rate_limit=rate_limit,
+        limits=httpx.Limits(
+            max_connections=settings.github_max_connections,
+            max_keepalive_connections=settings.github_max_connections,
+        ),
+        http2=settings.github_http2,
+        **kwargs,
+    )
+
+
+def _create_response_cache(settings: AppSettings) -> ResponseCache | None:
+    """Create the GitHub API response cache if enabled."""
+    if not settings.http_cache:
+        return None
+    return ResponseCache(
+        settings.cache_dir / "http",
+        ttl=settings.http_cache_ttl,
+        max_bytes=settings.http_cache_max_mb * 1024 * 1024,
+    )
+
+
+def _create_mirror_cache(settings: AppSettings) -> MirrorCache | None:
+    """Create the shared bare-mirror cache if configured."""
+    if settings.mirror_dir is None:
+        return None
+    return MirrorCache(settings.mirror_dir, BasicGitOperations(ssl_no_verify=settings.git_ssl_no_verify))
+
+
+def _create_fetch_profile(settings: AppSettings) -> FetchProfile:
+    """Create the fetch profile pull uses from the [fetch] settings."""
+    return FetchProfile(
+        scope=FetchScope(settings.fetch_scope),
+        tags=settings.fetch_tags,
+        protocol_v2=settings.fetch_protocol_v2,
+        prune=PruneMode(settings.fetch_prune),
+    )
+
+
+def _create_ssh_multiplexer(settings: AppSettings) -> SshMultiplexer | None:
+    """Create the shared SSH connections if configured and sync uses SSH URLs."""
+    # Windows' OpenSSH has no ControlMaster support
+    if settings.use_https or not settings.ssh_connections or os.name == "nt":
+        return None
+    return SshMultiplexer(connections=settings.ssh_connections)
+
+
+def _show_dry_run(repos: list[Repository], dest_dir: Path, sync_state: SyncState | None = None) -> None:
+    """Show dry-run preview.
+
+    Args:
+        repos: Repositories to sync
+        dest_dir: Destination directory
+        sync_state: Sync state to mark unchanged repositories with, if any
+    """
     table = Table(title="Repositories to sync")
     table.add_column("Repository", style="cyan")
     table.add_column("Action", style="green")
@@ -170,7 +784,12 @@ def _show_dry_run(repos: list[Repository], dest_dir: Path) -> None:
 
     for repo in repos:
         repo_path = dest_dir / repo.name
-        action = "Pull" if repo_path.exists() else "Clone"
+        if not repo_path.exists():
+            action = "Clone"
+        elif sync_state is not None and sync_state.is_up_to_date(repo_path, repo.pushed_at):
+            action = "Up to date"
+        else:
+            action = "Pull"
         table.add_row(repo.name, action, str(repo_path))
 
     console.print(table)
@@ -185,6 +804,9 @@ def _run_auto_cleanup(
     include_squash: bool,
     github_token: str | None,
     git_ssl_no_verify: bool,
+    client: GitHubClient | None = None,
+    merged_prs: dict[str, str] | None = None,
+    snapshot: BranchSnapshot | None = None,
 ) -> int:
     """Auto cleanup merged branches after sync.
 
@@ -192,6 +814,9 @@ def _run_auto_cleanup(
         git: GitOperations instance
         repo_path: Repository path
         base_branch: Base branch name for merge check
+        client: Shared GitHub client used for squash detection
+        merged_prs: Pre-fetched merged PRs (branch -> head SHA) for squash detection
+        snapshot: Branch snapshot to reuse; taken if not given
 
     Returns:
         Number of branches deleted
@@ -200,7 +825,9 @@ def _run_auto_cleanup(
         log.debug("auto_cleanup_skipped_not_git", repo=repo_path.name)
         return 0
 
-    merged_branches = git.get_merged_branches(repo_path, base_branch)
+    if snapshot is None:
+        snapshot = git.get_branch_snapshot(repo_path, base_branch)
+    merged_branches = snapshot.merged_branches()
     squash_branches: list[str] = []
     if include_squash:
         merged_set = set(merged_branches)
@@ -211,6 +838,9 @@ def _run_auto_cleanup(
             github_token=github_token,
             git_ssl_no_verify=git_ssl_no_verify,
             warn=show_warning,
+            client=client,
+            merged_prs=merged_prs,
+            snapshot=snapshot,
         )
         squash_branches = [branch for branch in squash_branches if branch not in merged_set]
 
@@ -219,17 +849,15 @@ def _run_auto_cleanup(
         return 0
 
     deleted = 0
-    for branch in merged_branches:
-        if git.delete_branch(repo_path, branch, force=False):
-            deleted += 1
-        else:
-            log.warning("delete_branch_failed", repo=repo_path.name, branch=branch)
-
-    for branch in squash_branches:
-        if git.delete_branch(repo_path, branch, force=True):
-            deleted += 1
-        else:
-            log.warning("delete_branch_failed", repo=repo_path.name, branch=branch)
+    for branches, force in ((merged_branches, False), (squash_branches, True)):
+        if not branches:
+            continue
+        results = git.delete_branches(repo_path, {b: snapshot.sha(b) for b in branches}, force=force)
+        for branch, ok in results.items():
+            if ok:
+                deleted += 1
+            else:
+                log.warning("delete_branch_failed", repo=repo_path.name, branch=branch)
 
     total = len(merged_branches) + len(squash_branches)
     log.info(
@@ -0,0 +1,31 @@
+"""Workspace helpers shared by CLI commands."""
+
+from pathlib import Path
+
+import typer
+
+from setup_repo.cli.output import show_error
+
+
+def select_repositories(workspace: Path, names: list[str] | None) -> list[Path]:
+    """Select Git repositories in a workspace.
+
+    Args:
+        workspace: Workspace directory
+        names: Repository names; None or empty selects every repository
+
+    Returns:
+        Repository paths (empty if the workspace has none)
+
+    Raises:
+        typer.Exit: If a named directory is not a Git repository
+    """
+    if names:
+        paths = [workspace / name for name in names]
+        if missing := [path.name for path in paths if not (path / ".git").exists()]:
+            show_error(f"Not a Git repository in {workspace}: {', '.join(missing)}")
+            raise typer.Exit(1)
+        return paths
+    if not workspace.is_dir():
+        return []
+    return sorted(path for path in workspace.iterdir() if (path / ".git").exists())
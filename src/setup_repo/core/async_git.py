@@ -0,0 +1,251 @@
+"""Git clone and pull as coroutines for the async sync engine."""
+
+import subprocess
+import time
+from pathlib import Path
+
+import anyio
+import anyio.to_thread
+
+from setup_repo.core.git_operations import BasicGitOperations, CloneStrategy, FetchProfile
+from setup_repo.core.ssh_mux import SshMultiplexer
+from setup_repo.models.result import ProcessResult, ResultStatus
+from setup_repo.utils.logging import get_logger, log_context
+
+log = get_logger(__name__)
+
+
+class AsyncGitOperations:
+    """Clone and pull repositories without a thread per git command.
+
+    Git runs in asyncio subprocesses, so one event loop can keep hundreds
+    of network-bound clones and fetches in flight. Commands, results and
+    logging match BasicGitOperations, whose argument builders are reused.
+    """
+
+    def __init__(
+        self,
+        auto_prune: bool = True,
+        auto_stash: bool = False,
+        ssl_no_verify: bool = False,
+        clone_strategy: str = CloneStrategy.SHALLOW,
+        auto_gc: bool = True,
+        ssh: SshMultiplexer | None = None,
+        fetch_profile: FetchProfile | None = None,
+        timeout: float = 300,
+    ) -> None:
+        """Initialize async Git operations.
+
+        Args:
+            auto_prune: Run fetch --prune automatically
+            auto_stash: Stash changes before pull and pop after
+            ssl_no_verify: Skip SSL verification
+            clone_strategy: CloneStrategy (or its value) used by clone()
+            auto_gc: Let git run auto gc and auto maintenance after fetches
+            ssh: Shared SSH connections to run git over SSH through, once started
+            fetch_profile: Refs, tags and protocol of the fetch done by pull()
+            timeout: Timeout of each git command in seconds
+        """
+        self._basic = BasicGitOperations(
+            auto_prune=auto_prune,
+            auto_stash=auto_stash,
+            ssl_no_verify=ssl_no_verify,
+            clone_strategy=clone_strategy,
+            auto_gc=auto_gc,
+            ssh=ssh,
+            fetch_profile=fetch_profile,
+        )
+        self.timeout = timeout
+
+    async def run(
+        self,
+        args: list[str],
+        cwd: Path | None = None,
+        check: bool = True,
+    ) -> subprocess.CompletedProcess[str]:
+        """Run a git command.
+
+        Args:
+            args: Git command arguments
+            cwd: Working directory
+            check: Raise on non-zero exit
+
+        Returns:
+            CompletedProcess result
+
+        Raises:
+            subprocess.CalledProcessError: If check is set and git fails
+            subprocess.TimeoutExpired: If git runs longer than the timeout
+                (the process is killed)
+        """
+        cmd = ["git", *args]
+        log.debug("git_command", cmd=" ".join(cmd), cwd=str(cwd) if cwd else None)
+
+        try:
+            with anyio.fail_after(self.timeout):
+                raw = await anyio.run_process(cmd, cwd=cwd, check=False, env=self._basic.get_env())
+        except TimeoutError as e:
+            raise subprocess.TimeoutExpired(cmd, self.timeout) from e
+
+        result = subprocess.CompletedProcess(
+            cmd,
+            raw.returncode,
+            stdout=raw.stdout.decode("utf-8", errors="replace"),
+            stderr=raw.stderr.decode("utf-8", errors="replace"),
+        )
+        if check:
+            result.check_returncode()
+        return result
+
+    async def clone(
+        self,
+        url: str,
+        dest: Path,
+        branch: str | None = None,
+        reference: Path | None = None,
+    ) -> ProcessResult:
+        """Clone a repository.
+
+        Args:
+            url: Repository URL
+            dest: Destination directory
+            branch: Branch to clone
+            reference: Local mirror to copy objects from instead of
+                downloading them
+
+        Returns:
+            ProcessResult
+        """
+        try:
+            await self.run(self._basic.clone_args(url, dest, branch, reference))
+            log.info("cloned", url=url, dest=str(dest))
+            return ProcessResult(
+                repo_name=dest.name,
+                status=ResultStatus.SUCCESS,
+                message="Cloned successfully",
+            )
+        except subprocess.CalledProcessError as e:
+            log.error("clone_failed", url=url, error=e.stderr)
+            return ProcessResult(
+                repo_name=dest.name,
+                status=ResultStatus.FAILED,
+                error=e.stderr,
+            )
+        except subprocess.TimeoutExpired:
+            log.error("clone_timeout", url=url)
+            return ProcessResult(
+                repo_name=dest.name,
+                status=ResultStatus.FAILED,
+                error="Clone timed out",
+            )
+
+    async def remote_head_unchanged(self, repo_path: Path) -> bool:
+        """Check whether the upstream of the current branch has not moved.
+
+        See BasicGitOperations.remote_head_unchanged().
+
+        Args:
+            repo_path: Repository path
+
+        Returns:
+            True if HEAD, the remote-tracking ref and the remote all agree
+        """
+        # Usually answered from the .git directory; may fall back to a short local git call
+        local = await anyio.to_thread.run_sync(self._basic.read_upstream_state, repo_path)
+        if local is None:
+            return False
+        head_sha, remote, remote_ref, tracking_sha = local
+        if tracking_sha != head_sha:
+            return False
+
+        try:
+            result = await self.run(["ls-remote", remote, remote_ref], cwd=repo_path)
+        except subprocess.CalledProcessError as e:
+            log.debug("ls_remote_failed", repo=repo_path.name, error=e.stderr)
+            return False
+        except subprocess.TimeoutExpired:
+            log.debug("ls_remote_timeout", repo=repo_path.name)
+            return False
+
+        return self._basic.ls_remote_matches(result.stdout, remote_ref, head_sha)
+
+    async def pull(self, repo_path: Path, *, check_remote_head: bool = False) -> ProcessResult:
+        """Pull a repository.
+
+        Fetches once and fast-forwards locally, like BasicGitOperations.pull().
+
+        Args:
+            repo_path: Repository path
+            check_remote_head: Skip fetch and pull if the upstream branch has
+                not moved
+
+        Returns:
+            ProcessResult
+        """
+        timings: dict[str, float] = {}
+        with log_context(repo=repo_path.name):
+            if check_remote_head:
+                start = time.perf_counter()
+                unchanged = await self.remote_head_unchanged(repo_path)
+                timings["remote_check"] = time.perf_counter() - start
+                if unchanged:
+                    log.debug("remote_head_unchanged")
+                    return ProcessResult(
+                        repo_name=repo_path.name,
+                        status=ResultStatus.SKIPPED,
+                        message="up to date",
+                        timings=timings,
+                    )
+
+            profile = self._basic.fetch_profile
+            before = (
+                await anyio.to_thread.run_sync(self._basic.read_upstream_state, repo_path)
+                if profile.needs_upstream
+                else None
+            )
+            phase = "fetch"
+            try:
+                start = time.perf_counter()
+                await self.run(self._basic.fetch_args(before[1:3] if before else None), cwd=repo_path)
+                timings["fetch"] = time.perf_counter() - start
+                log.debug("fetched", prune=self._basic.auto_prune, scope=profile.scope.value)
+
+                if before is not None:
+                    after = await anyio.to_thread.run_sync(self._basic.read_upstream_state, repo_path)
+                    prune = self._basic.prune_args(before[1], after is None or after[3] != before[3])
+                    if prune is not None:
+                        phase = "prune"
+                        start = time.perf_counter()
+                        await self.run(prune, cwd=repo_path)
+                        timings["prune"] = time.perf_counter() - start
+
+                phase = "merge"
+                start = time.perf_counter()
+                await self.run(self._basic.merge_args(), cwd=repo_path)
+                timings["merge"] = time.perf_counter() - start
+                log.info("pulled", **{f"{name}_s": round(value, 3) for name, value in timings.items()})
+
+                return ProcessResult(
+                    repo_name=repo_path.name,
+                    status=ResultStatus.SUCCESS,
+                    message="Pulled successfully",
+                    timings=timings,
+                )
+            except subprocess.CalledProcessError as e:
+                timings[phase] = time.perf_counter() - start
+                log.error("pull_failed", phase=phase, error=e.stderr)
+                return ProcessResult(
+                    repo_name=repo_path.name,
+                    status=ResultStatus.FAILED,
+                    error=e.stderr,
+                    timings=timings,
+                )
+            except subprocess.TimeoutExpired:
+                timings[phase] = time.perf_counter() - start
+                log.error("pull_timeout", phase=phase)
+                return ProcessResult(
+                    repo_name=repo_path.name,
+                    status=ResultStatus.FAILED,
+                    error="Pull timed out",
+                    timings=timings,
+                )
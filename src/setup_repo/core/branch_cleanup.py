@@ -4,35 +4,46 @@ from collections.abc import Callable
 from pathlib import Path
 
 from setup_repo.core.git import GitOperations
+from setup_repo.core.git_branch import Ancestry, BranchSnapshot
 from setup_repo.core.github import GitHubClient
+from setup_repo.core.github_graphql import MergedPRQuery
+from setup_repo.core.merged_prs import MergedPRStore
+from setup_repo.core.rate_limit import RateLimitScheduler
 from setup_repo.utils.logging import get_logger
 
 log = get_logger(__name__)
 
 
-def get_squash_merged_branches(
+def _fetch_merged_prs(
     git: GitOperations,
     repo_path: Path,
     base_branch: str,
     *,
     github_token: str | None,
     git_ssl_no_verify: bool,
-    warn: Callable[[str], None] | None = None,
-) -> list[str]:
-    """Get branches that were squash-merged via GitHub."""
+    warn: Callable[[str], None] | None,
+    rate_limit: RateLimitScheduler | None,
+    pr_store: MergedPRStore | None,
+    client: GitHubClient | None,
+) -> dict[str, str] | None:
+    """Fetch merged PRs of a repository via the REST API.
+
+    Returns:
+        Mapping of branch name to PR head SHA, or None if it could not be fetched
+    """
     remote_url = git.get_remote_url(repo_path)
     if not remote_url:
         log.warning("no_remote_url", repo=repo_path.name)
         if warn:
             warn("Could not detect GitHub repository from remote URL")
-        return []
+        return None
 
     repo_info = git.parse_github_repo(remote_url)
     if not repo_info:
         log.warning("not_github_repo", remote_url=remote_url)
         if warn:
             warn("Remote URL is not a GitHub repository")
-        return []
+        return None
 
     owner, repo = repo_info
 
@@ -40,22 +51,82 @@ def get_squash_merged_branches(
         log.warning("no_github_token")
         if warn:
             warn("GitHub token not found. Set SETUP_REPO_GITHUB_TOKEN or run 'setup-repo init'")
-        return []
+        return None
+
+    if rate_limit is None and client is not None:
+        rate_limit = client.rate_limit
+    if rate_limit is not None and not rate_limit.has_budget():
+        log.warning("squash_detection_skipped_rate_limit", repo=repo_path.name, remaining=rate_limit.remaining)
+        if warn:
+            warn("GitHub API rate limit is nearly exhausted. Skipping squash detection.")
+        return None
 
     try:
-        with GitHubClient(token=github_token, verify_ssl=not git_ssl_no_verify) as client:
+        if client is not None:
             merged_prs = client.get_merged_pull_requests(owner, repo, base_branch)
+        else:
+            with GitHubClient(
+                token=github_token,
+                verify_ssl=not git_ssl_no_verify,
+                rate_limit=rate_limit,
+                pr_store=pr_store,
+            ) as own_client:
+                merged_prs = own_client.get_merged_pull_requests(owner, repo, base_branch)
     except Exception as e:
         log.error("failed_to_fetch_merged_prs", error=str(e))
         if warn:
             warn(f"Failed to fetch merged PRs from GitHub: {e}")
-        return []
+        return None
 
-    local_branches = git.get_local_branches(repo_path)
-    current_branch = git.get_current_branch(repo_path)
+    return merged_prs
 
-    squash_merged: list[str] = []
-    for branch in local_branches:
+
+def get_squash_merged_branches(
+    git: GitOperations,
+    repo_path: Path,
+    base_branch: str,
+    *,
+    github_token: str | None,
+    git_ssl_no_verify: bool,
+    warn: Callable[[str], None] | None = None,
+    rate_limit: RateLimitScheduler | None = None,
+    pr_store: MergedPRStore | None = None,
+    client: GitHubClient | None = None,
+    merged_prs: dict[str, str] | None = None,
+    snapshot: BranchSnapshot | None = None,
+) -> list[str]:
+    """Get branches that were squash-merged via GitHub.
+
+    Squash detection is optional API work, so it is skipped when a shared
+    rate_limit scheduler reports the budget is nearly exhausted. With a
+    pr_store, merged PRs are fetched incrementally from the last watermark.
+    Pass a shared client to reuse its connection pool across repositories;
+    it is left open for the caller to close. Pass merged_prs (e.g. from
+    GitHubClient.get_merged_pull_requests_batch) to skip the API call, and
+    a snapshot (from GitOperations.get_branch_snapshot) to reuse one the
+    caller already took.
+    """
+    if merged_prs is None:
+        merged_prs = _fetch_merged_prs(
+            git,
+            repo_path,
+            base_branch,
+            github_token=github_token,
+            git_ssl_no_verify=git_ssl_no_verify,
+            warn=warn,
+            rate_limit=rate_limit,
+            pr_store=pr_store,
+            client=client,
+        )
+        if merged_prs is None:
+            return []
+
+    if snapshot is None:
+        snapshot = git.get_branch_snapshot(repo_path, base_branch)
+    current_branch = snapshot.current_branch
+
+    candidates: dict[str, tuple[str, str]] = {}
+    for branch in snapshot.local_branches:
         if branch in (base_branch, current_branch):
             continue
 
@@ -67,21 +138,59 @@ def get_squash_merged_branches(
             log.warning("no_pr_head_sha", branch=branch)
             continue
 
-        local_branch_sha = git.get_branch_sha(repo_path, branch)
+        local_branch_sha = snapshot.sha(branch)
         if not local_branch_sha:
             log.warning("no_local_branch_sha", branch=branch)
             continue
 
-        if local_branch_sha == pr_head_sha:
+        candidates[branch] = (local_branch_sha, pr_head_sha)
+
+    # Candidates that differ from their PR head are classified with one git call
+    unequal = {branch: pair for branch, pair in candidates.items() if pair[0] != pair[1]}
+    ancestry = git.classify_ancestry(repo_path, unequal, base_branch) if unequal else {}
+
+    squash_merged: list[str] = []
+    for branch, (local_branch_sha, pr_head_sha) in candidates.items():
+        relation = Ancestry.EQUAL if branch not in unequal else ancestry.get(branch, Ancestry.DIVERGED)
+        if relation == Ancestry.EQUAL:
             squash_merged.append(branch)
             log.debug("branch_matches_pr", branch=branch, sha=local_branch_sha)
-        elif git.is_ancestor(repo_path, local_branch_sha, pr_head_sha):
+        elif relation == Ancestry.OLDER:
             squash_merged.append(branch)
             log.debug("branch_is_older", branch=branch, local_sha=local_branch_sha, pr_sha=pr_head_sha)
-        elif git.is_ancestor(repo_path, pr_head_sha, local_branch_sha):
+        elif relation == Ancestry.NEWER:
             log.info("branch_has_new_commits", branch=branch, pr_sha=pr_head_sha, local_sha=local_branch_sha)
         else:
             log.info("branch_diverged", branch=branch, pr_sha=pr_head_sha, local_sha=local_branch_sha)
 
     log.info("found_squash_merged_branches", count=len(squash_merged))
     return squash_merged
+
+
+def build_merged_pr_query(
+    git: GitOperations,
+    repo_path: Path,
+    base_branch: str,
+    snapshot: BranchSnapshot | None = None,
+) -> MergedPRQuery | None:
+    """Collect the local branches of a repository for a batched merged-PR lookup.
+
+    Args:
+        git: GitOperations instance
+        repo_path: Repository path
+        base_branch: Base branch the PRs were merged into
+        snapshot: Branch snapshot to reuse; taken if not given
+
+    Returns:
+        MergedPRQuery, or None if the remote is not a GitHub repository
+    """
+    remote_url = git.get_remote_url(repo_path)
+    repo_info = git.parse_github_repo(remote_url) if remote_url else None
+    if not repo_info:
+        return None
+    owner, repo = repo_info
+    if snapshot is None:
+        snapshot = git.get_branch_snapshot(repo_path, base_branch)
+    current_branch = snapshot.current_branch
+    branches = tuple(branch for branch in snapshot.local_branches if branch not in (base_branch, current_branch))
+    return MergedPRQuery(owner=owner, repo=repo, base_branch=base_branch, branches=branches)
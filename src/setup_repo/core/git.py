@@ -1,11 +1,13 @@
 """Git operations wrapper - main interface."""
 
 import subprocess
+from collections.abc import Mapping, Sequence
 from pathlib import Path
 
-from setup_repo.core.git_branch import GitBranchOperations
-from setup_repo.core.git_operations import BasicGitOperations
+from setup_repo.core.git_branch import Ancestry, BranchSnapshot, GitBranchOperations, RefResolver
+from setup_repo.core.git_operations import BasicGitOperations, CloneStrategy, FetchProfile, MaintenanceTask
 from setup_repo.core.git_remote import GitRemoteOperations
+from setup_repo.core.ssh_mux import SshMultiplexer
 from setup_repo.models.result import ProcessResult
 from setup_repo.utils.logging import get_logger
 
@@ -24,6 +26,10 @@ class GitOperations:
         auto_prune: bool = True,
         auto_stash: bool = False,
         ssl_no_verify: bool = False,
+        clone_strategy: str = CloneStrategy.SHALLOW,
+        auto_gc: bool = True,
+        ssh: SshMultiplexer | None = None,
+        fetch_profile: FetchProfile | None = None,
     ) -> None:
         """Initialize Git operations.
 
@@ -31,12 +37,21 @@ class GitOperations:
             auto_prune: Run fetch --prune automatically
             auto_stash: Stash changes before pull and pop after
             ssl_no_verify: Skip SSL verification
+            clone_strategy: CloneStrategy (or its value) used by clone()
+            auto_gc: Let git run auto gc and auto maintenance after fetches
+            ssh: Shared SSH connections to run git over SSH through, once started
+            fetch_profile: Refs, tags and protocol of the fetches done by pull()
+                and fetch_and_prune()
         """
         # Initialize basic operations
         self._basic_ops = BasicGitOperations(
             auto_prune=auto_prune,
             auto_stash=auto_stash,
             ssl_no_verify=ssl_no_verify,
+            clone_strategy=clone_strategy,
+            auto_gc=auto_gc,
+            ssh=ssh,
+            fetch_profile=fetch_profile,
         )
 
         # Initialize specialized operations
@@ -75,6 +90,7 @@ class GitOperations:
         url: str,
         dest: Path,
         branch: str | None = None,
+        reference: Path | None = None,
     ) -> ProcessResult:
         """Clone a repository.
 
@@ -82,11 +98,54 @@ class GitOperations:
             url: Repository URL
             dest: Destination directory
             branch: Branch to clone
+            reference: Local mirror to copy objects from instead of
+                downloading them
 
         Returns:
             ProcessResult
         """
-        return self._basic_ops.clone(url, dest, branch)
+        return self._basic_ops.clone(url, dest, branch, reference)
+
+    def is_shallow(self, repo_path: Path) -> bool:
+        """Check whether a repository is a shallow clone.
+
+        Args:
+            repo_path: Repository path
+
+        Returns:
+            True if history is cut off
+        """
+        return self._basic_ops.is_shallow(repo_path)
+
+    def deepen(self, repo_path: Path, depth: int | None = None) -> ProcessResult:
+        """Fetch more history into a shallow clone.
+
+        Args:
+            repo_path: Repository path
+            depth: Number of commits to add; None fetches the complete history
+
+        Returns:
+            ProcessResult (SKIPPED if the repository is not shallow)
+        """
+        return self._basic_ops.deepen(repo_path, depth)
+
+    def maintain(
+        self,
+        repo_path: Path,
+        tasks: Sequence[MaintenanceTask] = tuple(MaintenanceTask),
+        deadline: float | None = None,
+    ) -> ProcessResult:
+        """Run ``git maintenance`` tasks one after another.
+
+        Args:
+            repo_path: Repository path
+            tasks: Tasks to run, in order
+            deadline: time.monotonic() value after which no further task is started
+
+        Returns:
+            ProcessResult (SKIPPED if the deadline passed before the first task)
+        """
+        return self._basic_ops.maintain(repo_path, tasks, deadline)
 
     def fetch_and_prune(self, repo_path: Path) -> bool:
         """Run fetch --prune.
@@ -99,27 +158,30 @@ class GitOperations:
         """
         return self._basic_ops.fetch_and_prune(repo_path)
 
-    def pull(self, repo_path: Path) -> ProcessResult:
+    def pull(self, repo_path: Path, *, check_remote_head: bool = False) -> ProcessResult:
         """Pull a repository.
 
         Args:
             repo_path: Repository path
+            check_remote_head: Skip fetch and pull if the upstream branch has not moved
 
         Returns:
             ProcessResult
         """
-        return self._basic_ops.pull(repo_path)
+        return self._basic_ops.pull(repo_path, check_remote_head=check_remote_head)
 
-    def _has_changes(self, repo_path: Path) -> bool:
+    def _has_changes(self, repo_path: Path, *, fast: bool = False, untracked: bool = True) -> bool:
         """Check if repository has uncommitted changes.
 
         Args:
             repo_path: Repository path
+            fast: Stop at the first change instead of running git status
+            untracked: Count untracked files as changes
 
         Returns:
             True if there are changes
         """
-        return self._basic_ops.has_changes(repo_path)
+        return self._basic_ops.has_changes(repo_path, fast=fast, untracked=untracked)
 
     def get_merged_branches(self, repo_path: Path, base_branch: str = "main") -> list[str]:
         """Get merged branches.
@@ -146,6 +208,25 @@ class GitOperations:
         """
         return self._branch_ops.delete_branch(repo_path, branch, force)
 
+    def delete_branches(
+        self,
+        repo_path: Path,
+        branches: Mapping[str, str | None],
+        force: bool = False,
+    ) -> dict[str, bool]:
+        """Delete many local branches with a fixed number of git calls.
+
+        Args:
+            repo_path: Repository path
+            branches: Mapping of branch name to the SHA it is expected at
+                (None skips the check for that branch)
+            force: Use -D (force delete) instead of -d
+
+        Returns:
+            Mapping of branch name to whether it was deleted
+        """
+        return self._branch_ops.delete_branches(repo_path, branches, force)
+
     def get_remote_url(self, repo_path: Path) -> str | None:
         """Get the remote origin URL.
 
@@ -190,6 +271,29 @@ class GitOperations:
         """
         return self._branch_ops.get_current_branch(repo_path)
 
+    def get_branch_snapshot(self, repo_path: Path, base_branch: str = "main") -> BranchSnapshot:
+        """Read all local branches with their SHA, upstream and merge status.
+
+        Args:
+            repo_path: Repository path
+            base_branch: Base branch to check merge status against
+
+        Returns:
+            BranchSnapshot built from a fixed number of git calls
+        """
+        return self._branch_ops.get_branch_snapshot(repo_path, base_branch)
+
+    def ref_resolver(self, repo_path: Path) -> RefResolver:
+        """Create a resolver for many ref lookups in one repository.
+
+        Args:
+            repo_path: Repository path
+
+        Returns:
+            RefResolver backed by one long-lived git process; close it when done
+        """
+        return self._branch_ops.ref_resolver(repo_path)
+
     def get_branch_sha(self, repo_path: Path, branch: str) -> str | None:
         """Get the commit SHA for a branch.
 
@@ -202,6 +306,24 @@ class GitOperations:
         """
         return self._branch_ops.get_branch_sha(repo_path, branch)
 
+    def classify_ancestry(
+        self,
+        repo_path: Path,
+        pairs: Mapping[str, tuple[str, str]],
+        base_branch: str = "main",
+    ) -> dict[str, Ancestry]:
+        """Classify many (local SHA, other SHA) pairs with one git call.
+
+        Args:
+            repo_path: Repository path
+            pairs: Mapping of key (e.g. branch name) to (local SHA, other SHA)
+            base_branch: Branch whose history bounds the walk
+
+        Returns:
+            Mapping of key to Ancestry
+        """
+        return self._branch_ops.classify_ancestry(repo_path, pairs, base_branch)
+
     def is_ancestor(self, repo_path: Path, ancestor_sha: str, descendant_ref: str) -> bool:
         """Check if a commit is an ancestor of another ref.
 
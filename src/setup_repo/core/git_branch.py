@@ -1,9 +1,16 @@
 """Git branch operations."""
 
+import contextlib
+import os
 import subprocess
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from enum import StrEnum
 from pathlib import Path
-from typing import TYPE_CHECKING
+from types import TracebackType
+from typing import TYPE_CHECKING, Self
 
+from setup_repo.core.git_refs import GitRefReader, UnsupportedRepositoryError
 from setup_repo.utils.logging import get_logger
 
 if TYPE_CHECKING:
@@ -11,6 +18,169 @@ if TYPE_CHECKING:
 
 log = get_logger(__name__)
 
+_HEADS_PREFIX = b"refs/heads/"
+_SNAPSHOT_FORMAT = "--format=%(HEAD)%00%(refname)%00%(objectname)%00%(upstream)"
+
+
+class Ancestry(StrEnum):
+    """How a local branch relates to another commit (e.g. its merged PR head)."""
+
+    EQUAL = "equal"  # Same commit
+    OLDER = "older"  # Local branch is an ancestor of the other commit
+    NEWER = "newer"  # Other commit is an ancestor of the local branch
+    DIVERGED = "diverged"  # Neither contains the other
+
+
+@dataclass(frozen=True)
+class BranchInfo:
+    """A local branch as seen by a BranchSnapshot.
+
+    Attributes:
+        name: Branch name
+        sha: Commit SHA the branch points to
+        upstream: Full upstream ref (e.g. ``refs/remotes/origin/main``), if any
+        is_head: Whether the branch is checked out
+        merged: Whether the branch is merged into the snapshot's base branch
+    """
+
+    name: str
+    sha: str
+    upstream: str | None = None
+    is_head: bool = False
+    merged: bool = False
+
+
+@dataclass(frozen=True)
+class BranchSnapshot:
+    """All local branches of a repository, read at once.
+
+    Built from ``git for-each-ref`` so cleanup and sync can answer branch
+    questions in memory instead of running git once per question.
+    """
+
+    base_branch: str
+    branches: dict[str, BranchInfo] = field(default_factory=dict)
+
+    @property
+    def local_branches(self) -> list[str]:
+        """Names of all local branches."""
+        return list(self.branches)
+
+    @property
+    def current_branch(self) -> str | None:
+        """Name of the checked-out branch, or None if HEAD is detached."""
+        return next((info.name for info in self.branches.values() if info.is_head), None)
+
+    def sha(self, branch: str) -> str | None:
+        """Get the commit SHA of a branch.
+
+        Args:
+            branch: Branch name
+
+        Returns:
+            Commit SHA or None if the branch doesn't exist
+        """
+        info = self.branches.get(branch)
+        return info.sha if info else None
+
+    def merged_branches(self) -> list[str]:
+        """Get the branches merged into the base branch, excluding the base itself."""
+        return [info.name for info in self.branches.values() if info.merged and info.name != self.base_branch]
+
+
+class RefResolver:
+    """Resolve many refs of one repository over a single git process.
+
+    A ``git cat-file --batch-check`` process is started on the first lookup
+    and answers every further lookup over its pipes, instead of one
+    ``git rev-parse`` process per ref. Close the resolver (or use it as a
+    context manager) once the repository's work is done.
+    """
+
+    def __init__(self, runner: "BasicGitOperations", repo_path: Path) -> None:
+        """Initialize the resolver.
+
+        Args:
+            runner: Git command runner providing the environment
+            repo_path: Repository path
+        """
+        self.runner = runner
+        self.repo_path = repo_path
+        self._process: subprocess.Popen[str] | None = None
+
+    def __enter__(self) -> Self:
+        """Enter context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Exit context manager."""
+        self.close()
+
+    def _start(self) -> subprocess.Popen[str]:
+        cmd = ["git", "cat-file", "--batch-check=%(objectname) %(objecttype)"]
+        log.debug("git_command", cmd=" ".join(cmd), cwd=str(self.repo_path))
+        return subprocess.Popen(
+            cmd,
+            cwd=self.repo_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            env=self.runner.get_env(),
+        )
+
+    def resolve(self, ref: str) -> str | None:
+        """Get the object SHA a ref points to.
+
+        Args:
+            ref: Ref name or revision (e.g. ``refs/heads/main``)
+
+        Returns:
+            Object SHA or None if the ref doesn't exist
+        """
+        if not ref or "\n" in ref:
+            return None
+        try:
+            if self._process is None:
+                self._process = self._start()
+            stdin, stdout = self._process.stdin, self._process.stdout
+            if stdin is None or stdout is None:
+                raise OSError("git cat-file pipes are not available")
+            stdin.write(f"{ref}\n")
+            stdin.flush()
+            line = stdout.readline()
+        except (OSError, ValueError) as e:
+            log.warning("ref_resolver_failed", repo=self.repo_path.name, error=str(e))
+            self.close()
+            return None
+
+        # "<sha> <type>", or "<ref> missing" / "<ref> ambiguous"
+        sha, _, object_type = line.strip().rpartition(" ")
+        if not sha or object_type in ("missing", "ambiguous"):
+            return None
+        return sha
+
+    def close(self) -> None:
+        """Stop the git process, if started."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if process.stdin is not None:
+            with contextlib.suppress(OSError):
+                process.stdin.close()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        if process.stdout is not None:
+            process.stdout.close()
+
 
 class GitBranchOperations:
     """Git branch management operations."""
@@ -70,6 +240,74 @@ class GitBranchOperations:
             log.warning("branch_delete_timeout", branch=branch)
             return False
 
+    def delete_branches(
+        self,
+        repo_path: Path,
+        branches: Mapping[str, str | None],
+        force: bool = False,
+    ) -> dict[str, bool]:
+        """Delete many local branches with a fixed number of git calls.
+
+        The expected SHAs are first checked in one ``git update-ref --stdin``
+        transaction, so nothing is deleted if any branch moved since it was
+        selected. All branches are then deleted by a single ``git branch``
+        call, which keeps the ``-d`` merge check (unless forced) and removes
+        their config sections and reflogs. Which branches are gone is read
+        back from the refs rather than from git's localized messages.
+
+        Args:
+            repo_path: Repository path
+            branches: Mapping of branch name to the SHA it is expected at
+                (None skips the check for that branch)
+            force: Use -D (force delete) instead of -d
+
+        Returns:
+            Mapping of branch name to whether it was deleted
+        """
+        if not branches:
+            return {}
+
+        expected = [f"verify refs/heads/{name} {sha}" for name, sha in branches.items() if sha]
+        if expected:
+            try:
+                self.runner.run(
+                    ["update-ref", "--stdin"],
+                    cwd=repo_path,
+                    stdin="\n".join(["start", *expected, "commit", ""]),
+                )
+            except subprocess.CalledProcessError as e:
+                log.warning("branches_changed_before_delete", error=e.stderr)
+                return dict.fromkeys(branches, False)
+            except subprocess.TimeoutExpired:
+                log.warning("branch_verify_timeout")
+                return dict.fromkeys(branches, False)
+
+        flag = "-D" if force else "-d"
+        try:
+            # Verified branches are known to exist; list the others first
+            before = self._list_branch_refs(repo_path) if len(expected) < len(branches) else None
+            # Exits non-zero if any branch could not be deleted; the rest still are
+            self.runner.run(["branch", flag, "--", *branches], cwd=repo_path, check=False)
+            after = self._list_branch_refs(repo_path)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+            log.warning("branch_delete_failed", error=getattr(e, "stderr", None))
+            return dict.fromkeys(branches, False)
+
+        result = {
+            name: f"refs/heads/{name}" not in after and (before is None or f"refs/heads/{name}" in before)
+            for name in branches
+        }
+        for name, deleted in result.items():
+            if deleted:
+                log.info("branch_deleted", branch=name, force=force)
+            else:
+                log.warning("branch_delete_failed", branch=name)
+        return result
+
+    def _list_branch_refs(self, repo_path: Path) -> set[str]:
+        result = self.runner.run(["for-each-ref", "--format=%(refname)", "refs/heads"], cwd=repo_path)
+        return set(result.stdout.splitlines())
+
     def get_local_branches(self, repo_path: Path) -> list[str]:
         """Get all local branches.
 
@@ -99,6 +337,13 @@ class GitBranchOperations:
         Returns:
             Current branch name or None if not on a branch
         """
+        reader = GitRefReader.open(repo_path)
+        if reader is not None:
+            try:
+                return reader.current_branch()
+            except UnsupportedRepositoryError as e:
+                log.debug("git_ref_reader_fallback", repo=repo_path.name, reason=str(e))
+
         try:
             result = self.runner.run(["branch", "--show-current"], cwd=repo_path, check=False)
             if result.returncode == 0:
@@ -107,6 +352,64 @@ class GitBranchOperations:
         except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
             return None
 
+    def get_branch_snapshot(self, repo_path: Path, base_branch: str = "main") -> BranchSnapshot:
+        """Read all local branches with their SHA, upstream and merge status.
+
+        Branch details come from one ``git for-each-ref`` call and the merge
+        status from a second one filtered with ``--merged``, so the number of
+        git processes does not grow with the number of branches. Output is
+        parsed as bytes and only the fields kept are decoded.
+
+        Args:
+            repo_path: Repository path
+            base_branch: Base branch to check merge status against
+
+        Returns:
+            BranchSnapshot (empty if the branches could not be read)
+        """
+        try:
+            result = self.runner.run_bytes(["for-each-ref", _SNAPSHOT_FORMAT, "refs/heads"], cwd=repo_path)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+            return BranchSnapshot(base_branch=base_branch)
+
+        try:
+            merged_result = self.runner.run_bytes(
+                ["for-each-ref", "--format=%(refname)", f"--merged=refs/heads/{base_branch}", "refs/heads"],
+                cwd=repo_path,
+            )
+            merged = set(merged_result.stdout.splitlines())
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+            # Base branch does not exist locally
+            merged = set()
+
+        branches: dict[str, BranchInfo] = {}
+        for line in result.stdout.splitlines():
+            fields = line.split(b"\0")
+            if len(fields) != 4 or not fields[1].startswith(_HEADS_PREFIX):
+                continue
+            head, refname, sha, upstream = fields
+            # fsdecode matches how Python decodes argv, so names round-trip into git commands
+            name = os.fsdecode(refname[len(_HEADS_PREFIX) :])
+            branches[name] = BranchInfo(
+                name=name,
+                sha=sha.decode("ascii"),
+                upstream=os.fsdecode(upstream) if upstream else None,
+                is_head=head == b"*",
+                merged=refname in merged,
+            )
+        return BranchSnapshot(base_branch=base_branch, branches=branches)
+
+    def ref_resolver(self, repo_path: Path) -> RefResolver:
+        """Create a resolver for many ref lookups in one repository.
+
+        Args:
+            repo_path: Repository path
+
+        Returns:
+            RefResolver; close it when done
+        """
+        return RefResolver(self.runner, repo_path)
+
     def get_branch_sha(self, repo_path: Path, branch: str) -> str | None:
         """Get the commit SHA for a branch.
 
@@ -117,6 +420,13 @@ class GitBranchOperations:
         Returns:
             Commit SHA or None if branch doesn't exist
         """
+        reader = GitRefReader.open(repo_path)
+        if reader is not None:
+            try:
+                return reader.rev_parse(branch)
+            except UnsupportedRepositoryError as e:
+                log.debug("git_ref_reader_fallback", repo=repo_path.name, reason=str(e))
+
         try:
             result = self.runner.run(["rev-parse", branch], cwd=repo_path, check=False)
             if result.returncode == 0:
@@ -125,6 +435,76 @@ class GitBranchOperations:
         except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
             return None
 
+    def classify_ancestry(
+        self,
+        repo_path: Path,
+        pairs: Mapping[str, tuple[str, str]],
+        base_branch: str = "main",
+    ) -> dict[str, Ancestry]:
+        """Classify many (local SHA, other SHA) pairs with one git call.
+
+        ``git rev-list --parents`` walks every commit reachable from the
+        given SHAs but not from the base branch, and the pairs are then
+        answered from that graph in memory. Every commit between two
+        commits outside the base branch's history is outside it too, so a
+        pair whose SHAs both appear in the graph is decided exactly. Other
+        pairs (a SHA already in the base branch, or missing locally) fall
+        back to ``merge-base --is-ancestor``; squash-merged branches are not
+        in the base branch, so that fallback is rare.
+
+        Args:
+            repo_path: Repository path
+            pairs: Mapping of key (e.g. branch name) to (local SHA, other SHA)
+            base_branch: Branch whose history bounds the walk
+
+        Returns:
+            Mapping of key to Ancestry
+        """
+        result: dict[str, Ancestry] = {}
+        pending = {key: pair for key, pair in pairs.items() if pair[0] != pair[1]}
+        result.update({key: Ancestry.EQUAL for key in pairs if key not in pending})
+        if not pending:
+            return result
+
+        tips = sorted({sha for pair in pending.values() for sha in pair})
+        graph: dict[str, list[str]] = {}
+        try:
+            output = self.runner.run(
+                ["rev-list", "--parents", "--ignore-missing", "--stdin"],
+                cwd=repo_path,
+                stdin="\n".join([*tips, f"^refs/heads/{base_branch}", ""]),
+            ).stdout
+            for line in output.splitlines():
+                commit, *parents = line.split()
+                graph[commit] = parents
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+            log.debug("rev_list_failed", repo=repo_path.name, error=getattr(e, "stderr", None))
+            graph = {}
+
+        reachable_cache: dict[str, set[str]] = {}
+
+        def reachable(sha: str) -> set[str]:
+            if sha not in reachable_cache:
+                seen = {sha}
+                stack = [sha]
+                while stack:
+                    for parent in graph.get(stack.pop(), ()):
+                        if parent in graph and parent not in seen:
+                            seen.add(parent)
+                            stack.append(parent)
+                reachable_cache[sha] = seen
+            return reachable_cache[sha]
+
+        for key, (local_sha, other_sha) in pending.items():
+            if local_sha in graph and other_sha in graph:
+                older = local_sha in reachable(other_sha)
+                newer = not older and other_sha in reachable(local_sha)
+            else:
+                older = self.is_ancestor(repo_path, local_sha, other_sha)
+                newer = not older and self.is_ancestor(repo_path, other_sha, local_sha)
+            result[key] = Ancestry.OLDER if older else Ancestry.NEWER if newer else Ancestry.DIVERGED
+        return result
+
     def is_ancestor(self, repo_path: Path, ancestor_sha: str, descendant_ref: str) -> bool:
         """Check if a commit is an ancestor of another ref.
 
@@ -1,14 +1,102 @@
 """Basic Git operations (clone, pull, fetch)."""
 
+import os
 import subprocess
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from enum import StrEnum
 from pathlib import Path
 
+from setup_repo.core.git_refs import GitRefReader, UnsupportedRepositoryError
+from setup_repo.core.ssh_mux import SshMultiplexer
 from setup_repo.models.result import ProcessResult, ResultStatus
 from setup_repo.utils.logging import get_logger, log_context
 
 log = get_logger(__name__)
 
 
+class CloneStrategy(StrEnum):
+    """How much of a repository clone() downloads."""
+
+    # Latest commit of one branch (--depth 1); deepen() fetches more history later
+    SHALLOW = "shallow"
+    # All commits and trees; file contents are fetched when first needed
+    BLOBLESS = "blobless"
+    # All commits; trees and file contents are fetched when first needed
+    TREELESS = "treeless"
+    # Full history of one branch
+    SINGLE_BRANCH = "single-branch"
+    # Everything
+    FULL = "full"
+
+
+_CLONE_STRATEGY_ARGS: dict[CloneStrategy, list[str]] = {
+    CloneStrategy.SHALLOW: ["--depth", "1"],
+    CloneStrategy.BLOBLESS: ["--filter=blob:none"],
+    CloneStrategy.TREELESS: ["--filter=tree:0"],
+    CloneStrategy.SINGLE_BRANCH: ["--single-branch"],
+    CloneStrategy.FULL: [],
+}
+
+
+class MaintenanceTask(StrEnum):
+    """Tasks of ``git maintenance run`` that maintain() can run."""
+
+    # Fetch all remotes into refs/prefetch/ so the next pull has little to download
+    PREFETCH = "prefetch"
+    # Pack loose objects
+    LOOSE_OBJECTS = "loose-objects"
+    # Combine small packs under a multi-pack-index without a full repack
+    INCREMENTAL_REPACK = "incremental-repack"
+    # Write the commit-graph that speeds up merge-base and --merged checks
+    COMMIT_GRAPH = "commit-graph"
+
+
+class FetchScope(StrEnum):
+    """Which branches the fetch done by pull() downloads."""
+
+    # Every branch the remote's fetch refspec maps
+    ALL = "all"
+    # Only the upstream of the checked-out branch (the default branch of a fresh clone)
+    BRANCH = "branch"
+
+
+class PruneMode(StrEnum):
+    """When pull() removes remote-tracking refs of deleted branches."""
+
+    # fetch --prune on every pull
+    ALWAYS = "always"
+    # A separate ``git remote prune`` only when the fetch moved the upstream,
+    # as a merged pull request does when it deletes its branch
+    ON_CHANGE = "on-change"
+
+
+@dataclass(frozen=True)
+class FetchProfile:
+    """How much the fetch done by pull() transfers."""
+
+    scope: FetchScope = FetchScope.ALL
+    # Fetch tags; without them the server need not advertise every tag
+    tags: bool = True
+    # Force protocol v2, whose ref-prefix filtering makes the server advertise only the fetched refs
+    protocol_v2: bool = False
+    prune: PruneMode = PruneMode.ALWAYS
+
+    def config_args(self) -> list[str]:
+        """Build the ``-c`` options that go before the git subcommand."""
+        return ["-c", "protocol.version=2"] if self.protocol_v2 else []
+
+    @property
+    def needs_upstream(self) -> bool:
+        """Whether pull() must read the upstream of the checked-out branch first."""
+        return self.scope == FetchScope.BRANCH or self.prune == PruneMode.ON_CHANGE
+
+
+# Config that keeps fetch from starting auto gc or auto maintenance
+_NO_AUTO_GC_CONFIG = {"gc.auto": "0", "maintenance.auto": "false"}
+
+
 class BasicGitOperations:
     """Basic Git command operations."""
 
@@ -17,6 +105,10 @@ class BasicGitOperations:
         auto_prune: bool = True,
         auto_stash: bool = False,
         ssl_no_verify: bool = False,
+        clone_strategy: str = CloneStrategy.SHALLOW,
+        auto_gc: bool = True,
+        ssh: SshMultiplexer | None = None,
+        fetch_profile: FetchProfile | None = None,
     ) -> None:
         """Initialize basic Git operations.
 
@@ -24,26 +116,46 @@ class BasicGitOperations:
             auto_prune: Run fetch --prune automatically
             auto_stash: Stash changes before pull and pop after
             ssl_no_verify: Skip SSL verification
+            clone_strategy: CloneStrategy (or its value) used by clone()
+            auto_gc: Let git run auto gc and auto maintenance after fetches;
+                disable to keep a command from stalling on a repack
+            ssh: Shared SSH connections to run git over SSH through, once started
+            fetch_profile: Refs, tags and protocol of the fetches done by pull()
+                and fetch_and_prune()
         """
         self.auto_prune = auto_prune
         self.auto_stash = auto_stash
         self.ssl_no_verify = ssl_no_verify
+        self.clone_strategy = CloneStrategy(clone_strategy)
+        self.auto_gc = auto_gc
+        self.ssh = ssh
+        self.fetch_profile = fetch_profile or FetchProfile()
 
     def get_env(self) -> dict[str, str] | None:
         """Get environment variables for git commands."""
+        ssh_command = self.ssh.command() if self.ssh is not None else None
+        if not self.ssl_no_verify and self.auto_gc and ssh_command is None:
+            return None
+        env = os.environ.copy()
+        if ssh_command is not None:
+            env["GIT_SSH_COMMAND"] = ssh_command
         if self.ssl_no_verify:
-            import os
-
-            env = os.environ.copy()
             env["GIT_SSL_NO_VERIFY"] = "1"
-            return env
-        return None
+        if not self.auto_gc:
+            # GIT_CONFIG_COUNT entries act like -c and are inherited by the auto gc git spawns
+            count = int(env.get("GIT_CONFIG_COUNT") or 0)
+            for index, (key, value) in enumerate(_NO_AUTO_GC_CONFIG.items(), start=count):
+                env[f"GIT_CONFIG_KEY_{index}"] = key
+                env[f"GIT_CONFIG_VALUE_{index}"] = value
+            env["GIT_CONFIG_COUNT"] = str(count + len(_NO_AUTO_GC_CONFIG))
+        return env
 
     def run(
         self,
         args: list[str],
         cwd: Path | None = None,
         check: bool = True,
+        stdin: str | None = None,
     ) -> subprocess.CompletedProcess[str]:
         """Run a git command.
 
@@ -51,6 +163,7 @@ class BasicGitOperations:
             args: Git command arguments
             cwd: Working directory
             check: Raise on non-zero exit
+            stdin: Text to send to the command's stdin
 
         Returns:
             CompletedProcess result
@@ -61,6 +174,7 @@ class BasicGitOperations:
         return subprocess.run(
             cmd,
             cwd=cwd,
+            input=stdin,
             capture_output=True,
             text=True,
             check=check,
@@ -68,11 +182,40 @@ class BasicGitOperations:
             timeout=300,  # 5 minutes timeout
         )
 
+    def run_bytes(
+        self,
+        args: list[str],
+        cwd: Path | None = None,
+        check: bool = True,
+    ) -> subprocess.CompletedProcess[bytes]:
+        """Run a git command and keep its output as raw bytes.
+
+        Args:
+            args: Git command arguments
+            cwd: Working directory
+            check: Raise on non-zero exit
+
+        Returns:
+            CompletedProcess result with bytes output
+        """
+        cmd = ["git", *args]
+        log.debug("git_command", cmd=" ".join(cmd), cwd=str(cwd) if cwd else None)
+
+        return subprocess.run(
+            cmd,
+            cwd=cwd,
+            capture_output=True,
+            check=check,
+            env=self.get_env(),
+            timeout=300,
+        )
+
     def clone(
         self,
         url: str,
         dest: Path,
         branch: str | None = None,
+        reference: Path | None = None,
     ) -> ProcessResult:
         """Clone a repository.
 
@@ -80,17 +223,14 @@ class BasicGitOperations:
             url: Repository URL
             dest: Destination directory
             branch: Branch to clone
+            reference: Local mirror to copy objects from instead of
+                downloading them
 
         Returns:
             ProcessResult
         """
-        args = ["clone", "--depth", "1"]
-        if branch:
-            args.extend(["--branch", branch])
-        args.extend([url, str(dest)])
-
         try:
-            self.run(args)
+            self.run(self.clone_args(url, dest, branch, reference))
             log.info("cloned", url=url, dest=str(dest))
             return ProcessResult(
                 repo_name=dest.name,
@@ -112,6 +252,202 @@ class BasicGitOperations:
                 error="Clone timed out",
             )
 
+    def clone_args(
+        self,
+        url: str,
+        dest: Path,
+        branch: str | None = None,
+        reference: Path | None = None,
+    ) -> list[str]:
+        """Build the arguments of a clone with the configured strategy.
+
+        Args:
+            url: Repository URL
+            dest: Destination directory
+            branch: Branch to clone
+            reference: Local mirror to copy objects from instead of
+                downloading them
+
+        Returns:
+            Git command arguments
+        """
+        args = ["clone", *_CLONE_STRATEGY_ARGS[self.clone_strategy]]
+        if branch:
+            args.extend(["--branch", branch])
+        if reference is not None:
+            # --dissociate copies the borrowed objects, so the clone keeps working without the mirror
+            args.extend(["--reference", str(reference), "--dissociate"])
+        args.extend([url, str(dest)])
+        return args
+
+    def is_shallow(self, repo_path: Path) -> bool:
+        """Check whether a repository is a shallow clone.
+
+        Args:
+            repo_path: Repository path
+
+        Returns:
+            True if history is cut off (e.g. cloned with ``--depth``)
+        """
+        try:
+            result = self.run(["rev-parse", "--is-shallow-repository"], cwd=repo_path)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+            return False
+        return result.stdout.strip() == "true"
+
+    def deepen(self, repo_path: Path, depth: int | None = None) -> ProcessResult:
+        """Fetch more history into a shallow clone.
+
+        Args:
+            repo_path: Repository path
+            depth: Number of commits to add to the history of each branch;
+                None fetches the complete history (``--unshallow``)
+
+        Returns:
+            ProcessResult (SKIPPED if the repository is not shallow)
+        """
+        if not self.is_shallow(repo_path):
+            return ProcessResult(
+                repo_name=repo_path.name,
+                status=ResultStatus.SKIPPED,
+                message="not shallow",
+            )
+
+        args = ["fetch", f"--deepen={depth}"] if depth is not None else ["fetch", "--unshallow"]
+        try:
+            self.run(args, cwd=repo_path)
+            log.info("deepened", repo=repo_path.name, depth=depth)
+            return ProcessResult(
+                repo_name=repo_path.name,
+                status=ResultStatus.SUCCESS,
+                message=f"Deepened by {depth} commit(s)" if depth is not None else "Fetched full history",
+            )
+        except subprocess.CalledProcessError as e:
+            log.error("deepen_failed", repo=repo_path.name, error=e.stderr)
+            return ProcessResult(
+                repo_name=repo_path.name,
+                status=ResultStatus.FAILED,
+                error=e.stderr,
+            )
+        except subprocess.TimeoutExpired:
+            log.error("deepen_timeout", repo=repo_path.name)
+            return ProcessResult(
+                repo_name=repo_path.name,
+                status=ResultStatus.FAILED,
+                error="Deepen timed out",
+            )
+
+    def maintain(
+        self,
+        repo_path: Path,
+        tasks: Sequence[MaintenanceTask] = tuple(MaintenanceTask),
+        deadline: float | None = None,
+    ) -> ProcessResult:
+        """Run ``git maintenance`` tasks one after another.
+
+        Args:
+            repo_path: Repository path
+            tasks: Tasks to run, in order
+            deadline: time.monotonic() value after which no further task is
+                started (a running task is not interrupted)
+
+        Returns:
+            ProcessResult with the duration of each task in timings
+            (SKIPPED if the deadline passed before the first task)
+        """
+        timings: dict[str, float] = {}
+        with log_context(repo=repo_path.name):
+            for task in tasks:
+                if deadline is not None and time.monotonic() >= deadline:
+                    log.info("maintenance_budget_exhausted", done=len(timings), total=len(tasks))
+                    break
+                start = time.perf_counter()
+                try:
+                    self.run(["maintenance", "run", f"--task={task}"], cwd=repo_path)
+                except subprocess.CalledProcessError as e:
+                    timings[task] = time.perf_counter() - start
+                    log.error("maintenance_failed", task=str(task), error=e.stderr)
+                    return ProcessResult(
+                        repo_name=repo_path.name,
+                        status=ResultStatus.FAILED,
+                        error=e.stderr,
+                        timings=timings,
+                    )
+                except subprocess.TimeoutExpired:
+                    timings[task] = time.perf_counter() - start
+                    log.error("maintenance_timeout", task=str(task))
+                    return ProcessResult(
+                        repo_name=repo_path.name,
+                        status=ResultStatus.FAILED,
+                        error=f"Maintenance task {task} timed out",
+                        timings=timings,
+                    )
+                timings[task] = time.perf_counter() - start
+
+        if not timings and tasks:
+            return ProcessResult(
+                repo_name=repo_path.name,
+                status=ResultStatus.SKIPPED,
+                message="time budget exhausted",
+            )
+        log.info("maintained", repo=repo_path.name, **{f"{name}_s": round(value, 3) for name, value in timings.items()})
+        return ProcessResult(
+            repo_name=repo_path.name,
+            status=ResultStatus.SUCCESS,
+            message=f"Ran {len(timings)} of {len(tasks)} task(s)",
+            timings=timings,
+        )
+
+    def fetch_args(self, upstream: tuple[str, str] | None = None) -> list[str]:
+        """Build the arguments of the fetch done by pull().
+
+        Args:
+            upstream: Remote and remote ref of the checked-out branch, read
+                when the fetch profile needs it; without it (detached HEAD,
+                no upstream) the fetch covers every branch and prunes
+
+        Returns:
+            Git arguments
+        """
+        profile = self.fetch_profile
+        args = [*profile.config_args(), "fetch"]
+        if not profile.tags:
+            args.append("--no-tags")
+        if upstream is None or profile.scope == FetchScope.ALL:
+            if self.auto_prune and (upstream is None or profile.prune == PruneMode.ALWAYS):
+                args.append("--prune")
+            return args
+        # Updates the remote-tracking ref through the remote's configured fetch refspec
+        return [*args, *upstream]
+
+    def prune_args(self, remote: str, upstream_moved: bool) -> list[str] | None:
+        """Build the prune that follows a fetch made with a known upstream.
+
+        Args:
+            remote: Remote of the checked-out branch
+            upstream_moved: Whether the fetch moved the remote-tracking ref
+
+        Returns:
+            Git arguments, or None if the fetch pruned already or no prune
+            is due
+        """
+        profile = self.fetch_profile
+        if not self.auto_prune:
+            return None
+        if profile.prune == PruneMode.ON_CHANGE:
+            if not upstream_moved:
+                return None
+        elif profile.scope == FetchScope.ALL:
+            return None
+        return [*profile.config_args(), "remote", "prune", remote]
+
+    def merge_args(self) -> list[str]:
+        """Build the arguments of the fast-forward done by pull()."""
+        args = ["merge", "--ff-only"]
+        if self.auto_stash:
+            args.append("--autostash")
+        return [*args, "@{upstream}"]
+
     def fetch_and_prune(self, repo_path: Path) -> bool:
         """Run fetch --prune.
 
@@ -124,8 +460,12 @@ class BasicGitOperations:
         if not self.auto_prune:
             return True
 
+        profile = self.fetch_profile
+        args = [*profile.config_args(), "fetch", "--prune"]
+        if not profile.tags:
+            args.append("--no-tags")
         try:
-            self.run(["fetch", "--prune"], cwd=repo_path)
+            self.run(args, cwd=repo_path)
             log.debug("fetched_and_pruned", repo=repo_path.name)
             return True
         except subprocess.CalledProcessError as e:
@@ -135,68 +475,264 @@ class BasicGitOperations:
             log.warning("fetch_prune_timeout", repo=repo_path.name)
             return False
 
-    def pull(self, repo_path: Path) -> ProcessResult:
+    def remote_head_unchanged(self, repo_path: Path) -> bool:
+        """Check whether the upstream of the current branch has not moved.
+
+        Asks the remote for the upstream branch only (``ls-remote``) and
+        compares it with the local remote-tracking ref and HEAD. For a
+        fresh clone the upstream is the default branch.
+
+        Args:
+            repo_path: Repository path
+
+        Returns:
+            True if HEAD, the remote-tracking ref and the remote all agree;
+            False if they differ or it cannot be told (detached HEAD, no
+            upstream, unreachable remote)
+        """
+        local = self.read_upstream_state(repo_path)
+        if local is None:
+            return False
+        head_sha, remote, remote_ref, tracking_sha = local
+        if tracking_sha != head_sha:
+            return False
+
+        try:
+            result = self.run(["ls-remote", remote, remote_ref], cwd=repo_path)
+        except subprocess.CalledProcessError as e:
+            log.debug("ls_remote_failed", repo=repo_path.name, error=e.stderr)
+            return False
+        except subprocess.TimeoutExpired:
+            log.debug("ls_remote_timeout", repo=repo_path.name)
+            return False
+
+        return self.ls_remote_matches(result.stdout, remote_ref, head_sha)
+
+    @staticmethod
+    def ls_remote_matches(output: str, remote_ref: str, head_sha: str) -> bool:
+        """Check whether ``git ls-remote`` output lists a ref at a SHA.
+
+        Args:
+            output: ls-remote output
+            remote_ref: Ref on the remote (e.g. ``refs/heads/main``)
+            head_sha: Expected SHA
+
+        Returns:
+            True if the ref is listed at head_sha
+        """
+        for line in output.splitlines():
+            sha, _, ref = line.partition("\t")
+            if ref == remote_ref:
+                return sha == head_sha
+        return False
+
+    def read_upstream_state(self, repo_path: Path) -> tuple[str, str, str, str | None] | None:
+        """Read HEAD's SHA and its upstream.
+
+        Read from the .git directory when possible, otherwise with one
+        ``git for-each-ref`` call.
+
+        Args:
+            repo_path: Repository path
+
+        Returns:
+            (HEAD SHA, remote, remote ref, tracking SHA), or None if HEAD is
+            detached or has no upstream
+        """
+        reader = GitRefReader.open(repo_path)
+        if reader is not None:
+            try:
+                branch = reader.current_branch()
+                upstream = reader.upstream(branch) if branch is not None else None
+                if branch is None or upstream is None:
+                    return None
+                head_sha = reader.resolve(f"refs/heads/{branch}")
+                if head_sha is None:
+                    return None
+                return head_sha, upstream.remote, upstream.merge_ref, reader.resolve(upstream.tracking_ref)
+            except UnsupportedRepositoryError as e:
+                log.debug("git_ref_reader_fallback", repo=repo_path.name, reason=str(e))
+
+        try:
+            result = self.run(
+                [
+                    "for-each-ref",
+                    "--format=%(HEAD)%00%(refname)%00%(objectname)%00%(upstream:remotename)%00%(upstream:remoteref)%00%(upstream)",
+                    "refs/heads",
+                    "refs/remotes",
+                ],
+                cwd=repo_path,
+            )
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+            return None
+
+        refs: dict[str, str] = {}
+        head: list[str] | None = None
+        for line in result.stdout.splitlines():
+            fields = line.split("\0")
+            if len(fields) != 6:
+                continue
+            refs[fields[1]] = fields[2]
+            if fields[0] == "*":
+                head = fields
+        if head is None:
+            return None
+        _, _, head_sha, remote, remote_ref, tracking_ref = head
+        if not remote or not remote_ref:
+            return None
+        return head_sha, remote, remote_ref, refs.get(tracking_ref)
+
+    def pull(self, repo_path: Path, *, check_remote_head: bool = False) -> ProcessResult:
         """Pull a repository.
 
+        Fetches once and then fast-forwards the checked-out branch to its
+        fetched upstream locally (``merge --ff-only @{u}``), rather than
+        ``pull`` fetching a second time. With auto_stash, git's own
+        ``--autostash`` stashes and restores local changes around the merge.
+        The fetch profile decides which refs the fetch covers and when
+        stale remote-tracking refs are pruned. The time spent in each phase
+        is recorded in ProcessResult.timings.
+
         Args:
             repo_path: Repository path
+            check_remote_head: Skip fetch and pull if the upstream branch has
+                not moved (see remote_head_unchanged())
 
         Returns:
             ProcessResult
         """
+        timings: dict[str, float] = {}
         with log_context(repo=repo_path.name):
-            # First fetch --prune
-            self.fetch_and_prune(repo_path)
-
-            # Stash if needed
-            stashed = False
-            if self.auto_stash and self.has_changes(repo_path):
-                try:
-                    self.run(["stash"], cwd=repo_path)
-                    stashed = True
-                    log.debug("stashed")
-                except subprocess.CalledProcessError as e:
-                    log.debug("stash_failed", error=e.stderr)
+            if check_remote_head:
+                start = time.perf_counter()
+                unchanged = self.remote_head_unchanged(repo_path)
+                timings["remote_check"] = time.perf_counter() - start
+                if unchanged:
+                    log.debug("remote_head_unchanged")
+                    return ProcessResult(
+                        repo_name=repo_path.name,
+                        status=ResultStatus.SKIPPED,
+                        message="up to date",
+                        timings=timings,
+                    )
 
+            before = self.read_upstream_state(repo_path) if self.fetch_profile.needs_upstream else None
+            phase = "fetch"
             try:
-                self.run(["pull", "--ff-only"], cwd=repo_path)
-                log.info("pulled")
+                start = time.perf_counter()
+                self.run(self.fetch_args(before[1:3] if before else None), cwd=repo_path)
+                timings["fetch"] = time.perf_counter() - start
+                log.debug("fetched", prune=self.auto_prune, scope=self.fetch_profile.scope.value)
+
+                if before is not None:
+                    after = self.read_upstream_state(repo_path)
+                    prune = self.prune_args(before[1], after is None or after[3] != before[3])
+                    if prune is not None:
+                        phase = "prune"
+                        start = time.perf_counter()
+                        self.run(prune, cwd=repo_path)
+                        timings["prune"] = time.perf_counter() - start
 
-                if stashed:
-                    self.run(["stash", "pop"], cwd=repo_path, check=False)
-                    log.debug("stash_popped")
+                phase = "merge"
+                start = time.perf_counter()
+                self.run(self.merge_args(), cwd=repo_path)
+                timings["merge"] = time.perf_counter() - start
+                log.info("pulled", **{f"{name}_s": round(value, 3) for name, value in timings.items()})
 
                 return ProcessResult(
                     repo_name=repo_path.name,
                     status=ResultStatus.SUCCESS,
                     message="Pulled successfully",
+                    timings=timings,
                 )
             except subprocess.CalledProcessError as e:
-                log.error("pull_failed", error=e.stderr)
+                timings[phase] = time.perf_counter() - start
+                log.error("pull_failed", phase=phase, error=e.stderr)
                 return ProcessResult(
                     repo_name=repo_path.name,
                     status=ResultStatus.FAILED,
                     error=e.stderr,
+                    timings=timings,
                 )
             except subprocess.TimeoutExpired:
-                log.error("pull_timeout")
+                timings[phase] = time.perf_counter() - start
+                log.error("pull_timeout", phase=phase)
                 return ProcessResult(
                     repo_name=repo_path.name,
                     status=ResultStatus.FAILED,
                     error="Pull timed out",
+                    timings=timings,
                 )
 
-    def has_changes(self, repo_path: Path) -> bool:
+    def has_changes(
+        self,
+        repo_path: Path,
+        *,
+        fast: bool = False,
+        untracked: bool = True,
+        untracked_cache: bool = False,
+        fsmonitor: bool = False,
+    ) -> bool:
         """Check if repository has uncommitted changes.
 
+        The fast check answers yes at the first change it finds: staged
+        changes from the index's cache-tree, then modified tracked files
+        (without preloading the index, so the scan stops at the first one),
+        then a single untracked file or directory. Untracked directories
+        are reported as a whole without listing their contents, like
+        ``git status`` does. The full check lists everything with ``git
+        status --porcelain``, which is as fast or faster on a clean tree
+        because one git process does all the work.
+
         Args:
             repo_path: Repository path
+            fast: Stop at the first change instead of running git status
+            untracked: Count untracked files as changes
+            untracked_cache: Use git's untracked cache for the untracked scan
+                (core.untrackedCache)
+            fsmonitor: Use git's builtin file system monitor where supported
+                (core.fsmonitor)
 
         Returns:
             True if there are changes
         """
+        config: list[str] = []
+        if untracked_cache:
+            config.extend(["-c", "core.untrackedCache=true"])
+        if fsmonitor:
+            config.extend(["-c", "core.fsmonitor=true"])
+
         try:
-            result = self.run(["status", "--porcelain"], cwd=repo_path, check=False)
+            if fast:
+                staged = self.run(
+                    [*config, "diff-index", "--cached", "--quiet", "HEAD", "--"],
+                    cwd=repo_path,
+                    check=False,
+                )
+                # Exit codes other than 0 and 1 (e.g. no commit yet) are left to git status
+                if staged.returncode in (0, 1):
+                    return staged.returncode == 1 or self._has_worktree_changes(repo_path, config, untracked)
+
+            args = [*config, "status", "--porcelain"]
+            if not untracked:
+                args.append("--untracked-files=no")
+            result = self.run(args, cwd=repo_path, check=False)
             return bool(result.stdout.strip())
         except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
             return False
+
+    def _has_worktree_changes(self, repo_path: Path, config: list[str], untracked: bool) -> bool:
+        # Porcelain diff refreshes stat info in memory, so merely touched files don't count
+        modified = self.run(
+            [*config, "-c", "core.preloadIndex=false", "diff", "--quiet", "--no-ext-diff", "--"],
+            cwd=repo_path,
+            check=False,
+        )
+        if modified.returncode != 0 or not untracked:
+            return modified.returncode != 0
+        others = self.run(
+            [*config, "ls-files", "--others", "--exclude-standard", "--directory", "--no-empty-directory"],
+            cwd=repo_path,
+            check=False,
+        )
+        return bool(others.stdout.strip())
@@ -0,0 +1,299 @@
+"""In-process reader for refs and config of ordinary repositories."""
+
+import mmap
+import os
+import re
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+_MAX_SYMREF_DEPTH = 5
+_HEX = re.compile(r"[0-9a-f]{40}(?:[0-9a-f]{24})?")
+_SECTION = re.compile(r'\[\s*([A-Za-z0-9.-]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]')
+_ENTRY = re.compile(r"([A-Za-z][A-Za-z0-9-]*)\s*(?:=\s*(.*))?")
+# Revisions git resolves in ways this reader does not (ranges, suffixes, reflogs)
+_SPECIAL_REV = re.compile(r"[\^~:@{}\[\]\\*?]|\.\.|^[0-9a-f]{4,}$")
+# Environment that changes how git finds the repository or its config
+_GIT_ENV = (
+    "GIT_DIR",
+    "GIT_COMMON_DIR",
+    "GIT_CONFIG",
+    "GIT_CONFIG_GLOBAL",
+    "GIT_CONFIG_SYSTEM",
+    "GIT_CONFIG_COUNT",
+    "GIT_CONFIG_PARAMETERS",
+)
+
+
+class UnsupportedRepositoryError(Exception):
+    """The question cannot be answered without running git."""
+
+
+@dataclass(frozen=True)
+class Upstream:
+    """Upstream of a local branch.
+
+    Attributes:
+        remote: Remote name (e.g. ``origin``)
+        merge_ref: Branch ref on the remote (e.g. ``refs/heads/main``)
+        tracking_ref: Local remote-tracking ref (e.g. ``refs/remotes/origin/main``)
+    """
+
+    remote: str
+    merge_ref: str
+    tracking_ref: str
+
+
+@cache
+def _user_config_rewrites_urls() -> bool:
+    """Check whether global or system config may rewrite remote URLs."""
+    home = Path.home()
+    xdg = Path(os.environ.get("XDG_CONFIG_HOME") or home / ".config")
+    for path in (Path("/etc/gitconfig"), xdg / "git" / "config", home / ".gitconfig"):
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace").lower()
+        except OSError:
+            continue
+        if "insteadof" in text or "[include" in text:
+            return True
+    return False
+
+
+class GitRefReader:
+    """Answer read-only questions from the ``.git`` directory without git.
+
+    Reads ``HEAD``, loose refs, ``packed-refs`` (memory-mapped) and
+    ``.git/config``. Anything outside the common layout raises
+    UnsupportedRepositoryError so callers can fall back to running git:
+    worktrees and submodules (``.git`` is a file), the reftable backend,
+    worktree-specific config, config includes, URL rewrites and unusual
+    config syntax.
+    """
+
+    def __init__(self, git_dir: Path) -> None:
+        """Initialize the reader.
+
+        Args:
+            git_dir: The repository's ``.git`` directory
+        """
+        self.git_dir = git_dir
+        self._config: dict[tuple[str, str | None], dict[str, list[str]]] | None = None
+
+    @classmethod
+    def open(cls, repo_path: Path) -> "GitRefReader | None":
+        """Create a reader for an ordinary repository.
+
+        Args:
+            repo_path: Repository path (working tree)
+
+        Returns:
+            GitRefReader, or None if the repository needs git itself
+        """
+        if any(name in os.environ for name in _GIT_ENV):
+            return None
+        git_dir = repo_path / ".git"
+        if not git_dir.is_dir() or (git_dir / "reftable").exists():
+            return None
+        return cls(git_dir)
+
+    # Refs
+
+    def current_branch(self) -> str | None:
+        """Get the checked-out branch.
+
+        Returns:
+            Branch name, or None if HEAD is detached
+        """
+        target = self._read_symref("HEAD")
+        if target is None:
+            return None
+        if not target.startswith("refs/heads/"):
+            raise UnsupportedRepositoryError(f"HEAD points outside refs/heads: {target}")
+        return target.removeprefix("refs/heads/")
+
+    def resolve(self, ref: str) -> str | None:
+        """Get the object SHA of a full ref name.
+
+        Args:
+            ref: Full ref name (e.g. ``refs/heads/main``) or ``HEAD``
+
+        Returns:
+            Object SHA, or None if the ref doesn't exist
+        """
+        for _ in range(_MAX_SYMREF_DEPTH):
+            value = self._read_loose(ref)
+            if value is None:
+                return self._read_packed(ref)
+            if not value.startswith("ref: "):
+                if not _HEX.fullmatch(value):
+                    raise UnsupportedRepositoryError(f"unexpected ref content in {ref}")
+                return value
+            ref = value.removeprefix("ref: ").strip()
+        raise UnsupportedRepositoryError("symbolic ref chain too long")
+
+    def rev_parse(self, name: str) -> str | None:
+        """Resolve a short ref name the way ``git rev-parse <name>`` does.
+
+        Args:
+            name: Ref name (e.g. ``main`` or ``origin/main``)
+
+        Returns:
+            Object SHA, or None if no ref of that name exists
+        """
+        if not name or name.startswith("-") or _SPECIAL_REV.search(name):
+            raise UnsupportedRepositoryError(f"revision needs git: {name}")
+        candidates = [f"refs/{name}", f"refs/tags/{name}", f"refs/heads/{name}", f"refs/remotes/{name}"]
+        if name.isupper() and "/" not in name:
+            # HEAD, FETCH_HEAD, ... live directly in the git directory
+            candidates.insert(0, name)
+        candidates.append(f"refs/remotes/{name}/HEAD")
+        for candidate in candidates:
+            if (sha := self.resolve(candidate)) is not None:
+                return sha
+        return None
+
+    def _read_loose(self, ref: str) -> str | None:
+        try:
+            return (self.git_dir / ref).read_text(encoding="utf-8").strip()
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+            return None
+        except (OSError, UnicodeDecodeError) as e:
+            raise UnsupportedRepositoryError(str(e)) from e
+
+    def _read_symref(self, ref: str) -> str | None:
+        value = self._read_loose(ref)
+        if value is None:
+            raise UnsupportedRepositoryError(f"{ref} is missing")
+        if value.startswith("ref: "):
+            return value.removeprefix("ref: ").strip()
+        if _HEX.fullmatch(value):
+            return None
+        raise UnsupportedRepositoryError(f"unexpected content in {ref}")
+
+    def _read_packed(self, ref: str) -> str | None:
+        try:
+            with open(self.git_dir / "packed-refs", "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as packed:
+                    return self._find_packed(packed, ref.encode())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            raise UnsupportedRepositoryError(str(e)) from e
+
+    @staticmethod
+    def _find_packed(packed: mmap.mmap, ref: bytes) -> str | None:
+        needle = b" " + ref + b"\n"
+        pos = packed.find(needle)
+        while pos != -1:
+            line_start = packed.rfind(b"\n", 0, pos) + 1
+            sha = packed[line_start:pos]
+            # Skip matches inside another line (e.g. a longer ref name ending the same way)
+            if len(sha) in (40, 64) and not sha.startswith((b"#", b"^")):
+                return sha.decode("ascii")
+            pos = packed.find(needle, pos + 1)
+        return None
+
+    # Config
+
+    def config_values(self, section: str, subsection: str | None, key: str) -> list[str]:
+        """Get all values of a key from the repository config.
+
+        Args:
+            section: Section name (case-insensitive)
+            subsection: Subsection name (case-sensitive), if any
+            key: Key name (case-insensitive)
+
+        Returns:
+            Values in file order (empty if unset)
+        """
+        return self._load_config().get((section.lower(), subsection), {}).get(key.lower(), [])
+
+    def remote_url(self, remote: str = "origin") -> str | None:
+        """Get a remote's URL the way ``git remote get-url`` does.
+
+        Args:
+            remote: Remote name
+
+        Returns:
+            URL, or None if the remote has none
+        """
+        if _user_config_rewrites_urls():
+            raise UnsupportedRepositoryError("URL rewriting may apply")
+        urls = self.config_values("remote", remote, "url")
+        return urls[0] if urls else None
+
+    def upstream(self, branch: str) -> Upstream | None:
+        """Get the upstream of a local branch.
+
+        Args:
+            branch: Local branch name
+
+        Returns:
+            Upstream, or None if the branch has none
+        """
+        remotes = self.config_values("branch", branch, "remote")
+        merges = self.config_values("branch", branch, "merge")
+        if not remotes or not merges:
+            return None
+        remote, merge_ref = remotes[-1], merges[-1]
+        if remote == "." or not merge_ref.startswith("refs/heads/"):
+            raise UnsupportedRepositoryError("upstream is not a remote branch")
+        fetch = self.config_values("remote", remote, "fetch")
+        if fetch != [f"+refs/heads/*:refs/remotes/{remote}/*"]:
+            raise UnsupportedRepositoryError("non-default fetch refspec")
+        tracking_ref = f"refs/remotes/{remote}/{merge_ref.removeprefix('refs/heads/')}"
+        return Upstream(remote=remote, merge_ref=merge_ref, tracking_ref=tracking_ref)
+
+    def _load_config(self) -> dict[tuple[str, str | None], dict[str, list[str]]]:
+        if self._config is None:
+            try:
+                text = (self.git_dir / "config").read_text(encoding="utf-8")
+            except FileNotFoundError:
+                text = ""
+            except (OSError, UnicodeDecodeError) as e:
+                raise UnsupportedRepositoryError(str(e)) from e
+            self._config = self._parse_config(text)
+        return self._config
+
+    @staticmethod
+    def _parse_config(text: str) -> dict[tuple[str, str | None], dict[str, list[str]]]:
+        """Parse the plain subset of git's config syntax.
+
+        Raises:
+            UnsupportedRepositoryError: On includes, URL rewrites, worktree
+                config, other ref storage, or syntax outside the subset
+        """
+        config: dict[tuple[str, str | None], dict[str, list[str]]] = {}
+        current: dict[str, list[str]] | None = None
+        for raw in text.splitlines():
+            line = raw.strip()
+            if not line or line.startswith(("#", ";")):
+                continue
+            if line.startswith("["):
+                match = _SECTION.fullmatch(line)
+                if not match or "." in match.group(1):
+                    raise UnsupportedRepositoryError(f"unsupported config section: {line}")
+                name = match.group(1).lower()
+                if name in ("include", "includeif"):
+                    raise UnsupportedRepositoryError("config includes other files")
+                subsection = match.group(2)
+                if subsection is not None and "\\" in subsection:
+                    raise UnsupportedRepositoryError("escaped config subsection")
+                current = config.setdefault((name, subsection), {})
+                continue
+            match = _ENTRY.fullmatch(line)
+            if current is None or not match:
+                raise UnsupportedRepositoryError(f"unsupported config line: {line}")
+            value = match.group(2)
+            if value is not None and any(c in value for c in '"\\#;'):
+                raise UnsupportedRepositoryError("quoted, escaped or commented config value")
+            current.setdefault(match.group(1).lower(), []).append("true" if value is None else value.strip())
+
+        if any("insteadof" in keys or "pushinsteadof" in keys for (name, _), keys in config.items() if name == "url"):
+            raise UnsupportedRepositoryError("URL rewriting is configured")
+        extensions = config.get(("extensions", None), {})
+        if "worktreeconfig" in extensions or "refstorage" in extensions:
+            raise UnsupportedRepositoryError("repository uses config or ref storage extensions")
+        return config
@@ -5,9 +5,14 @@ import subprocess
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from setup_repo.core.git_refs import GitRefReader, UnsupportedRepositoryError
+from setup_repo.utils.logging import get_logger
+
 if TYPE_CHECKING:
     from setup_repo.core.git_operations import BasicGitOperations
 
+log = get_logger(__name__)
+
 
 class GitRemoteOperations:
     """Git remote management operations."""
@@ -29,6 +34,13 @@ class GitRemoteOperations:
         Returns:
             Remote URL or None if not found
         """
+        reader = GitRefReader.open(repo_path)
+        if reader is not None:
+            try:
+                return reader.remote_url("origin")
+            except UnsupportedRepositoryError as e:
+                log.debug("git_ref_reader_fallback", repo=repo_path.name, reason=str(e))
+
         try:
             result = self.runner.run(
                 ["remote", "get-url", "origin"],
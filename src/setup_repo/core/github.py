@@ -1,15 +1,156 @@
 """GitHub API client using httpx."""
 
-from typing import Any
-
+import hashlib
+import importlib.util
+import json
+import re
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any, NamedTuple
+
+import anyio
 import httpx
-from pydantic import ValidationError
-
+from pydantic import TypeAdapter, ValidationError
+
+from setup_repo.core.github_graphql import (
+    GitHubGraphQLError,
+    MergedPRQuery,
+    inventory_request,
+    merged_prs_request,
+    parse_inventory_page,
+    parse_merged_prs,
+)
+from setup_repo.core.http_cache import ResponseCache
+from setup_repo.core.merged_prs import MergedPRSnapshot, MergedPRStore
+from setup_repo.core.rate_limit import RateLimitScheduler
 from setup_repo.models.repository import Repository
 from setup_repo.utils.logging import get_logger
 
 log = get_logger(__name__)
 
+PER_PAGE = 100
+# Batched merged-PR lookups: repositories and branch aliases per GraphQL request
+MERGED_PR_BATCH_REPOS = 20
+MERGED_PR_BATCH_BRANCHES = 200
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+_LINK_LAST_PATTERN = re.compile(r'<([^>]+)>;\s*rel="last"')
+
+
+_REPOSITORY_LIST: TypeAdapter[list[Repository]] = TypeAdapter(list[Repository])
+
+
+class _Page(NamedTuple):
+    """A fetched page of list results."""
+
+    content: bytes
+    from_cache: bool
+    last_page: int | None
+
+
+def _parse_last_page(link_header: str | None) -> int | None:
+    """Get the page number of the rel="last" entry of a Link header.
+
+    Args:
+        link_header: Value of the Link response header
+
+    Returns:
+        Last page number, or None if the header has no rel="last" link
+    """
+    if not link_header or not (match := _LINK_LAST_PATTERN.search(link_header)):
+        return None
+    page = httpx.URL(match.group(1)).params.get("page")
+    return int(page) if page and page.isdigit() else None
+
+
+def parse_repositories(items: list[Any]) -> list[Repository]:
+    """Parse repository items in bulk.
+
+    The whole list is validated in one call; only if that fails are items
+    validated one by one so invalid entries can be skipped.
+
+    Args:
+        items: Repository objects in the REST API shape
+
+    Returns:
+        List of Repository objects (invalid items are skipped)
+    """
+    try:
+        return _REPOSITORY_LIST.validate_python(items)
+    except ValidationError:
+        return _parse_repositories_per_item(items)
+
+
+def parse_repository_page(content: bytes) -> tuple[list[Repository], int]:
+    """Parse a raw JSON page of repositories in bulk.
+
+    The page is decoded and validated in one pass by pydantic-core's JSON
+    parser, without building intermediate dicts for the ~100 fields per
+    repository the REST API returns. Pages with invalid items fall back to
+    per-item parsing.
+
+    Args:
+        content: Raw response body (a JSON array)
+
+    Returns:
+        Tuple of (Repository objects, number of items on the page)
+    """
+    try:
+        repos = _REPOSITORY_LIST.validate_json(content)
+        return repos, len(repos)
+    except ValidationError:
+        items = json.loads(content)
+        if not isinstance(items, list):
+            raise ValueError(f"Expected a JSON array of repositories, got {type(items).__name__}") from None
+        return _parse_repositories_per_item(items), len(items)
+
+
+def _parse_repositories_per_item(items: list[Any]) -> list[Repository]:
+    """Parse repository items one by one, skipping invalid ones."""
+    repos: list[Repository] = []
+    for item in items:
+        try:
+            repos.append(Repository.model_validate(item))
+        except ValidationError as e:
+            name = item.get("name") if isinstance(item, dict) else None
+            log.warning("invalid_repo_data", repo=name, error=str(e))
+    return repos
+
+
+def _http2_available(requested: bool) -> bool:
+    """Check whether HTTP/2 can be used (needs the optional h2 package)."""
+    if not requested:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        log.warning("http2_unavailable", hint="install setup-repository[http2]")
+        return False
+    return True
+
+
+def _batch_merged_pr_queries(queries: list[MergedPRQuery]) -> list[list[MergedPRQuery]]:
+    """Split queries into batches bounded by repository and branch alias counts."""
+    batches: list[list[MergedPRQuery]] = []
+    current: list[MergedPRQuery] = []
+    branches = 0
+    for query in queries:
+        if current and (
+            len(current) >= MERGED_PR_BATCH_REPOS or branches + len(query.branches) > MERGED_PR_BATCH_BRANCHES
+        ):
+            batches.append(current)
+            current, branches = [], 0
+        current.append(query)
+        branches += len(query.branches)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _cache_namespace(token: str | None) -> str:
+    """Get a cache namespace so responses are never shared between tokens."""
+    if not token:
+        return "anonymous"
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
 
 class GitHubClient:
     """GitHub API client (synchronous)."""
@@ -20,16 +161,38 @@ class GitHubClient:
         self,
         token: str | None = None,
         verify_ssl: bool = True,
+        cache: ResponseCache | None = None,
+        use_graphql: bool = False,
+        rate_limit: RateLimitScheduler | None = None,
+        pr_store: MergedPRStore | None = None,
+        limits: httpx.Limits | None = None,
+        http2: bool = False,
     ) -> None:
         """Initialize the GitHub client.
 
+        The client is safe to share between threads; its connection pool is
+        created once on first use.
+
         Args:
             token: GitHub personal access token
             verify_ssl: Whether to verify SSL certificates
+            cache: Optional on-disk cache for conditional requests
+            use_graphql: List repositories via GraphQL (requires a token)
+            rate_limit: Scheduler to share the API budget with other clients
+            pr_store: Optional watermark store for incremental merged-PR fetches
+            limits: Connection pool limits (DEFAULT_LIMITS if None)
+            http2: Use HTTP/2 multiplexing when the h2 package is installed
         """
         self.token = token
         self.verify_ssl = verify_ssl
+        self.cache = cache
+        self.use_graphql = use_graphql
+        self.rate_limit = rate_limit or RateLimitScheduler()
+        self.pr_store = pr_store
+        self.limits = limits
+        self.http2 = http2
         self._client: httpx.Client | None = None
+        self._client_lock = threading.Lock()
 
     def _get_headers(self) -> dict[str, str]:
         """Get common request headers."""
@@ -45,14 +208,48 @@ class GitHubClient:
     def client(self) -> httpx.Client:
         """Get or create the HTTP client."""
         if self._client is None:
-            self._client = httpx.Client(
-                base_url=self.BASE_URL,
-                headers=self._get_headers(),
-                timeout=30.0,
-                verify=self.verify_ssl,
-            )
+            with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.Client(
+                        base_url=self.BASE_URL,
+                        headers=self._get_headers(),
+                        timeout=30.0,
+                        verify=self.verify_ssl,
+                        limits=self.limits or DEFAULT_LIMITS,
+                        http2=_http2_available(self.http2),
+                    )
         return self._client
 
+    def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request through the rate-limit scheduler.
+
+        Requests are paced when the budget runs low, and rate-limited
+        responses (403/429 with Retry-After or an exhausted budget) are
+        retried with jittered backoff.
+
+        Args:
+            method: HTTP client method name ("get" or "post")
+            url: API path
+            **kwargs: Arguments for the httpx request
+
+        Returns:
+            The final response
+        """
+        send = getattr(self.client, method)
+        attempt = 0
+        while True:
+            if delay := self.rate_limit.pacing_delay():
+                log.debug("github_rate_limit_pacing", delay=round(delay, 2), remaining=self.rate_limit.remaining)
+                time.sleep(delay)
+            response: httpx.Response = send(url, **kwargs)
+            self.rate_limit.update(response.headers)
+            retry_delay = self.rate_limit.retry_delay(response, attempt)
+            if retry_delay is None:
+                return response
+            log.warning("github_rate_limited", url=url, status=response.status_code, retry_in=round(retry_delay, 1))
+            time.sleep(retry_delay)
+            attempt += 1
+
     def get_repositories(self, owner: str) -> list[Repository]:
         """Get repositories for a user.
 
@@ -62,57 +259,126 @@ class GitHubClient:
         Returns:
             List of Repository objects
         """
-        repos: list[Repository] = []
+        return [repo for page in self.iter_repository_pages(owner) for repo in page]
+
+    def iter_repository_pages(self, owner: str) -> Iterator[list[Repository]]:
+        """Yield repositories for a user page by page as they are fetched.
+
+        Callers can start working on the first page while later pages are
+        still being listed. If the GraphQL backend fails part way, the REST
+        listing continues without repeating repositories already yielded.
+
+        Args:
+            owner: GitHub username or organization
+
+        Yields:
+            Repository objects of one page
+        """
+        yielded: set[str] = set()
+        if self.use_graphql and self.token:
+            try:
+                for repos in self._iter_repositories_graphql(owner):
+                    yielded.update(repo.full_name for repo in repos)
+                    yield repos
+                return
+            except (httpx.HTTPError, GitHubGraphQLError) as e:
+                log.warning("graphql_inventory_failed", owner=owner, error=str(e))
+
+        count = 0
         page = 1
+        cache_hits = 0
 
         while True:
-            response = self.client.get(
+            content, from_cache = self._get_page(
                 f"/users/{owner}/repos",
-                params={"page": page, "per_page": 100},
+                params={"page": page, "per_page": PER_PAGE},
             )
-            response.raise_for_status()
-
-            data = response.json()
-            if not data:
+            cache_hits += from_cache
+            parsed, item_count = parse_repository_page(content)
+            if not item_count:
                 break
 
-            repos.extend(self._parse_repositories(data))
+            repos = [repo for repo in parsed if repo.full_name not in yielded]
+            count += len(repos)
             page += 1
+            if repos:
+                yield repos
 
-        log.info("fetched_repositories", owner=owner, count=len(repos))
-        return repos
+        log.info(
+            "fetched_repositories",
+            owner=owner,
+            count=count,
+            pages=page,
+            cache_hits=cache_hits,
+        )
 
-    def _parse_repositories(self, data: list[dict[str, Any]]) -> list[Repository]:
-        """Parse API response into Repository objects.
+    def _iter_repositories_graphql(self, owner: str) -> Iterator[list[Repository]]:
+        """Yield repositories for a user via the GraphQL API, page by page.
+
+        Requests only the fields Repository needs, 100 nodes per page.
 
         Args:
-            data: List of repository data from API
+            owner: GitHub username or organization
+
+        Yields:
+            Repository objects of one page
+        """
+        count = 0
+        cursor: str | None = None
+        pages = 0
+
+        while True:
+            response = self._request("post", "/graphql", json=inventory_request(owner, cursor))
+            response.raise_for_status()
+            items, cursor = parse_inventory_page(response.json())
+            repos = parse_repositories(items)
+            count += len(repos)
+            pages += 1
+            yield repos
+            if cursor is None:
+                break
+
+        log.info("fetched_repositories", owner=owner, count=count, pages=pages, backend="graphql")
+
+    def _get_page(self, url: str, params: dict[str, Any]) -> tuple[bytes, bool]:
+        """Fetch a JSON page, revalidating against the response cache.
+
+        Args:
+            url: API path
+            params: Query parameters
 
         Returns:
-            List of Repository objects
+            Tuple of (raw page body, whether it was served from the cache)
         """
-        repos: list[Repository] = []
-        for item in data:
-            try:
-                repo = Repository(
-                    name=item["name"],
-                    full_name=item["full_name"],
-                    clone_url=item["clone_url"],
-                    ssh_url=item["ssh_url"],
-                    default_branch=item.get("default_branch", "main"),
-                    private=item.get("private", False),
-                    archived=item.get("archived", False),
-                    fork=item.get("fork", False),
-                    pushed_at=item.get("pushed_at"),
-                )
-                repos.append(repo)
-            except (ValidationError, KeyError) as e:
-                log.warning("invalid_repo_data", repo=item.get("name"), error=str(e))
-        return repos
+        if self.cache is None:
+            response = self._request("get", url, params=params)
+            response.raise_for_status()
+            return response.content, False
+
+        key = self.cache.make_key(_cache_namespace(self.token), url, params)
+        cached = self.cache.get(key)
+        response = self._request(
+            "get",
+            url,
+            params=params,
+            headers=cached.conditional_headers() if cached else None,
+        )
+        if cached is not None and response.status_code == httpx.codes.NOT_MODIFIED:
+            self.cache.touch(key)
+            log.debug("github_cache_hit", url=url, page=params.get("page"))
+            return cached.content, True
+
+        response.raise_for_status()
+        self.cache.put(key, response.content, response.headers)
+        log.debug("github_cache_miss", url=url, page=params.get("page"))
+        return response.content, False
 
     def get_merged_pull_requests(self, owner: str, repo: str, base_branch: str = "main") -> dict[str, str]:
         """Get merged pull requests for a repository.
 
+        With a pr_store, only PRs updated since the stored watermark are
+        fetched and merged into the stored branch map.
+
         Args:
             owner: GitHub username or organization
             repo: Repository name
@@ -121,6 +387,11 @@ class GitHubClient:
         Returns:
             Dictionary mapping branch name to head commit SHA (the PR's head.sha)
         """
+        previous = self.pr_store.load(owner, repo, base_branch) if self.pr_store else None
+        watermark = previous.updated_at if previous else None
+        newest_updated_at: str | None = None
+        complete = True
+
         merged_prs: dict[str, str] = {}
         page = 1
         # Full repo name to check against PR head.repo
@@ -128,7 +399,8 @@ class GitHubClient:
 
         while True:
             try:
-                response = self.client.get(
+                response = self._request(
+                    "get",
                     f"/repos/{owner}/{repo}/pulls",
                     params={
                         "state": "closed",
@@ -145,7 +417,16 @@ class GitHubClient:
                 if not data:
                     break
 
+                reached_watermark = False
                 for pr in data:
+                    updated_at = pr.get("updated_at")
+                    if newest_updated_at is None:
+                        newest_updated_at = updated_at
+                    # PRs are sorted by updated desc: everything from here was seen before
+                    if watermark and updated_at and updated_at < watermark:
+                        reached_watermark = True
+                        break
+
                     # Only include if PR was actually merged (not just closed)
                     if not pr.get("merged_at") or not pr.get("head", {}).get("ref"):
                         continue
@@ -161,24 +442,74 @@ class GitHubClient:
                     # Store head SHA instead of merge commit SHA for verification
                     merged_prs[branch_name] = head_sha
 
-                # Stop if we got less than a full page
-                if len(data) < 100:
+                # Stop at the watermark or if we got less than a full page
+                if reached_watermark or len(data) < 100:
                     break
 
                 page += 1
 
             except (httpx.HTTPError, KeyError) as e:
                 log.warning("failed_to_fetch_merged_prs", owner=owner, repo=repo, error=str(e))
+                complete = False
                 break
 
-        log.info("fetched_merged_prs", owner=owner, repo=repo, count=len(merged_prs))
+        if previous:
+            merged_prs = {**previous.branches, **merged_prs}
+        # Only advance the watermark after a complete walk, or PRs would be skipped
+        if self.pr_store and complete:
+            self.pr_store.save(
+                owner,
+                repo,
+                base_branch,
+                MergedPRSnapshot(updated_at=newest_updated_at or watermark, branches=merged_prs),
+            )
+
+        log.info(
+            "fetched_merged_prs", owner=owner, repo=repo, count=len(merged_prs), pages=page, incremental=bool(watermark)
+        )
         return merged_prs
 
+    def get_merged_pull_requests_batch(self, queries: list[MergedPRQuery]) -> dict[MergedPRQuery, dict[str, str]]:
+        """Resolve merged PRs for local branches of many repositories via GraphQL.
+
+        Repositories are looked up with aliased queries, about
+        MERGED_PR_BATCH_REPOS per request. Repositories missing from the
+        result (failed batch, not found, no token) should fall back to
+        get_merged_pull_requests().
+
+        Args:
+            queries: Repositories and the local branch names to look up
+
+        Returns:
+            Mapping of query to {branch name: merged PR head SHA}
+        """
+        results: dict[MergedPRQuery, dict[str, str]] = {}
+        queries = [query for query in queries if query.branches]
+        if not self.token or not queries:
+            return results
+
+        batches = _batch_merged_pr_queries(queries)
+        for batch in batches:
+            try:
+                response = self._request("post", "/graphql", json=merged_prs_request(batch))
+                response.raise_for_status()
+                parsed = parse_merged_prs(response.json(), batch)
+            except (httpx.HTTPError, GitHubGraphQLError) as e:
+                log.warning("merged_prs_batch_failed", repos=len(batch), error=str(e))
+                continue
+            for query, merged in zip(batch, parsed, strict=True):
+                if merged is not None:
+                    results[query] = merged
+
+        log.info("fetched_merged_prs_batch", repos=len(queries), resolved=len(results), requests=len(batches))
+        return results
+
     def close(self) -> None:
         """Close the HTTP client."""
-        if self._client:
-            self._client.close()
-            self._client = None
+        with self._client_lock:
+            if self._client:
+                self._client.close()
+                self._client = None
 
     def __enter__(self) -> "GitHubClient":
         """Enter context manager."""
@@ -201,15 +532,29 @@ class AsyncGitHubClient:
         self,
         token: str | None = None,
         verify_ssl: bool = True,
+        cache: ResponseCache | None = None,
+        max_concurrency: int = 8,
+        use_graphql: bool = False,
+        rate_limit: RateLimitScheduler | None = None,
     ) -> None:
         """Initialize the async GitHub client.
 
         Args:
             token: GitHub personal access token
             verify_ssl: Whether to verify SSL certificates
+            cache: Optional on-disk cache for conditional requests
+            max_concurrency: Maximum number of pages fetched at the same time
+            use_graphql: List repositories via GraphQL (requires a token)
+            rate_limit: Scheduler to share the API budget with other clients
         """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
         self.token = token
         self.verify_ssl = verify_ssl
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.use_graphql = use_graphql
+        self.rate_limit = rate_limit or RateLimitScheduler()
         self._client: httpx.AsyncClient | None = None
 
     def _get_headers(self) -> dict[str, str]:
@@ -234,62 +579,151 @@ class AsyncGitHubClient:
             )
         return self._client
 
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request through the rate-limit scheduler (async).
+
+        Args:
+            method: HTTP client method name ("get" or "post")
+            url: API path
+            **kwargs: Arguments for the httpx request
+
+        Returns:
+            The final response
+        """
+        send = getattr(self.client, method)
+        attempt = 0
+        while True:
+            if delay := self.rate_limit.pacing_delay():
+                log.debug("github_rate_limit_pacing", delay=round(delay, 2), remaining=self.rate_limit.remaining)
+                await anyio.sleep(delay)
+            response: httpx.Response = await send(url, **kwargs)
+            self.rate_limit.update(response.headers)
+            retry_delay = self.rate_limit.retry_delay(response, attempt)
+            if retry_delay is None:
+                return response
+            log.warning("github_rate_limited", url=url, status=response.status_code, retry_in=round(retry_delay, 1))
+            await anyio.sleep(retry_delay)
+            attempt += 1
+
     async def get_repositories(self, owner: str) -> list[Repository]:
         """Get repositories for a user (async).
 
+        The first page's ``Link: rel="last"`` header tells how many pages
+        there are; the remaining pages are then fetched concurrently,
+        bounded by ``max_concurrency``. Results keep the API page order.
+
         Args:
             owner: GitHub username or organization
 
         Returns:
             List of Repository objects
         """
+        if self.use_graphql and self.token:
+            try:
+                return await self._get_repositories_graphql(owner)
+            except (httpx.HTTPError, GitHubGraphQLError) as e:
+                log.warning("graphql_inventory_failed", owner=owner, error=str(e))
+
+        url = f"/users/{owner}/repos"
+        first = await self._get_page(url, params={"page": 1, "per_page": PER_PAGE})
+        pages = [first]
+        parsed = [parse_repository_page(first.content)]
+
+        if first.last_page is not None and first.last_page > 1:
+            remaining: list[_Page | None] = [None] * (first.last_page - 1)
+            semaphore = anyio.Semaphore(self.max_concurrency)
+
+            async def fetch(index: int) -> None:
+                async with semaphore:
+                    remaining[index] = await self._get_page(url, params={"page": index + 2, "per_page": PER_PAGE})
+
+            # A failing page cancels its siblings before the error propagates
+            async with anyio.create_task_group() as tg:
+                for index in range(len(remaining)):
+                    tg.start_soon(fetch, index)
+            pages.extend(page for page in remaining if page is not None)
+            parsed.extend(parse_repository_page(page.content) for page in pages[1:])
+        elif first.last_page is None:
+            # No Link header: fall back to sequential paging until a short page
+            while parsed[-1][1] >= PER_PAGE:
+                pages.append(await self._get_page(url, params={"page": len(pages) + 1, "per_page": PER_PAGE}))
+                parsed.append(parse_repository_page(pages[-1].content))
+
         repos: list[Repository] = []
-        page = 1
+        seen: set[str] = set()
+        for page_repos, _ in parsed:
+            for repo in page_repos:
+                # Repositories can shift between pages while they are fetched
+                if repo.full_name not in seen:
+                    seen.add(repo.full_name)
+                    repos.append(repo)
+
+        log.info(
+            "fetched_repositories",
+            owner=owner,
+            count=len(repos),
+            pages=len(pages),
+            cache_hits=sum(page.from_cache for page in pages),
+        )
+        return repos
+
+    async def _get_repositories_graphql(self, owner: str) -> list[Repository]:
+        """Get repositories for a user via the GraphQL API (async).
+
+        Args:
+            owner: GitHub username or organization
+
+        Returns:
+            List of Repository objects
+        """
+        repos: list[Repository] = []
+        cursor: str | None = None
+        pages = 0
 
         while True:
-            response = await self.client.get(
-                f"/users/{owner}/repos",
-                params={"page": page, "per_page": 100},
-            )
+            response = await self._request("post", "/graphql", json=inventory_request(owner, cursor))
             response.raise_for_status()
-
-            data = response.json()
-            if not data:
+            items, cursor = parse_inventory_page(response.json())
+            repos.extend(parse_repositories(items))
+            pages += 1
+            if cursor is None:
                 break
 
-            repos.extend(self._parse_repositories(data))
-            page += 1
-
-        log.info("fetched_repositories", owner=owner, count=len(repos))
+        log.info("fetched_repositories", owner=owner, count=len(repos), pages=pages, backend="graphql")
         return repos
 
-    def _parse_repositories(self, data: list[dict[str, Any]]) -> list[Repository]:
-        """Parse API response into Repository objects.
+    async def _get_page(self, url: str, params: dict[str, Any]) -> _Page:
+        """Fetch a JSON page, revalidating against the response cache (async).
 
         Args:
-            data: List of repository data from API
+            url: API path
+            params: Query parameters
 
         Returns:
-            List of Repository objects
+            The raw page with its pagination info
         """
-        repos: list[Repository] = []
-        for item in data:
-            try:
-                repo = Repository(
-                    name=item["name"],
-                    full_name=item["full_name"],
-                    clone_url=item["clone_url"],
-                    ssh_url=item["ssh_url"],
-                    default_branch=item.get("default_branch", "main"),
-                    private=item.get("private", False),
-                    archived=item.get("archived", False),
-                    fork=item.get("fork", False),
-                    pushed_at=item.get("pushed_at"),
-                )
-                repos.append(repo)
-            except (ValidationError, KeyError) as e:
-                log.warning("invalid_repo_data", repo=item.get("name"), error=str(e))
-        return repos
+        if self.cache is None:
+            response = await self._request("get", url, params=params)
+            response.raise_for_status()
+            return _Page(response.content, False, _parse_last_page(response.headers.get("link")))
+
+        key = self.cache.make_key(_cache_namespace(self.token), url, params)
+        cached = self.cache.get(key)
+        response = await self._request(
+            "get",
+            url,
+            params=params,
+            headers=cached.conditional_headers() if cached else None,
+        )
+        if cached is not None and response.status_code == httpx.codes.NOT_MODIFIED:
+            self.cache.touch(key)
+            log.debug("github_cache_hit", url=url, page=params.get("page"))
+            return _Page(cached.content, True, _parse_last_page(cached.link))
+
+        response.raise_for_status()
+        self.cache.put(key, response.content, response.headers)
+        log.debug("github_cache_miss", url=url, page=params.get("page"))
+        return _Page(response.content, False, _parse_last_page(response.headers.get("link")))
 
     async def close(self) -> None:
         """Close the async HTTP client."""
@@ -0,0 +1,215 @@
+"""GraphQL queries and response parsing for the GitHub API.
+
+The inventory query mirrors the REST ``/users/{owner}/repos`` listing:
+only public repositories owned by the account are returned, even when
+the token could see private ones, so both backends sync the same set.
+
+The merged-PR query looks up many repositories and branches in one
+request using aliases (``r0``, ``r0b0`` ...), for batched squash-merge
+detection.
+"""
+
+import json
+from collections.abc import Sequence
+from typing import Any, NamedTuple
+
+REPOSITORY_INVENTORY_QUERY = """
+query($owner: String!, $cursor: String) {
+  repositoryOwner(login: $owner) {
+    repositories(
+      first: 100
+      after: $cursor
+      ownerAffiliations: [OWNER]
+      privacy: PUBLIC
+      orderBy: {field: NAME, direction: ASC}
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        url
+        sshUrl
+        isPrivate
+        isArchived
+        isFork
+        pushedAt
+        defaultBranchRef { name target { oid } }
+      }
+    }
+  }
+}
+"""
+
+
+# PRs per head branch to look at; the first one from the repository itself wins
+_MERGED_PRS_PER_BRANCH = 5
+
+
+class MergedPRQuery(NamedTuple):
+    """Local branches of one repository to resolve merged PRs for."""
+
+    owner: str
+    repo: str
+    base_branch: str
+    branches: tuple[str, ...]
+
+
+class GitHubGraphQLError(Exception):
+    """GraphQL request returned errors or an unexpected payload."""
+
+
+def check_errors(payload: dict[str, Any]) -> dict[str, Any]:
+    """Get the data of a GraphQL response, raising on errors.
+
+    Args:
+        payload: Decoded GraphQL response
+
+    Returns:
+        The ``data`` object
+
+    Raises:
+        GitHubGraphQLError: If the response has errors or no data
+    """
+    if errors := payload.get("errors"):
+        messages = "; ".join(str(e.get("message", e)) for e in errors)
+        raise GitHubGraphQLError(messages)
+    data = payload.get("data")
+    if not isinstance(data, dict):
+        raise GitHubGraphQLError("GraphQL response has no data")
+    return data
+
+
+def inventory_request(owner: str, cursor: str | None) -> dict[str, Any]:
+    """Build the request body for one page of the repository inventory.
+
+    Args:
+        owner: GitHub username or organization
+        cursor: End cursor of the previous page
+
+    Returns:
+        JSON body for POST /graphql
+    """
+    return {"query": REPOSITORY_INVENTORY_QUERY, "variables": {"owner": owner, "cursor": cursor}}
+
+
+def parse_inventory_page(payload: dict[str, Any]) -> tuple[list[dict[str, Any]], str | None]:
+    """Parse one page of the repository inventory.
+
+    Nodes are converted to the REST repository shape so both backends
+    share the same Repository parsing.
+
+    Args:
+        payload: Decoded GraphQL response
+
+    Returns:
+        Tuple of (REST-shaped repository items, cursor of the next page or None)
+
+    Raises:
+        GitHubGraphQLError: If the response has errors or the owner does not exist
+    """
+    owner = check_errors(payload).get("repositoryOwner")
+    if owner is None:
+        raise GitHubGraphQLError("Repository owner not found")
+
+    try:
+        repositories = owner["repositories"]
+        items = [_node_to_item(node) for node in repositories["nodes"] if node]
+        page_info = repositories["pageInfo"]
+        cursor = page_info["endCursor"] if page_info["hasNextPage"] else None
+    except (KeyError, TypeError, AttributeError) as e:
+        raise GitHubGraphQLError(f"Unexpected GraphQL inventory payload: {e!r}") from e
+    return items, cursor
+
+
+def _node_to_item(node: dict[str, Any]) -> dict[str, Any]:
+    """Convert a GraphQL repository node to the REST repository shape."""
+    ref = node.get("defaultBranchRef") or {}
+    item: dict[str, Any] = {
+        "name": node["name"],
+        "full_name": node["nameWithOwner"],
+        "clone_url": f"{node['url']}.git",
+        "ssh_url": node["sshUrl"],
+        "private": node.get("isPrivate", False),
+        "archived": node.get("isArchived", False),
+        "fork": node.get("isFork", False),
+        "pushed_at": node.get("pushedAt"),
+        "default_branch_sha": (ref.get("target") or {}).get("oid"),
+    }
+    # Empty repositories have no default branch ref
+    if ref.get("name"):
+        item["default_branch"] = ref["name"]
+    return item
+
+
+def _literal(value: str) -> str:
+    """Quote a string as a GraphQL literal (JSON escaping is compatible)."""
+    return json.dumps(value)
+
+
+def merged_prs_request(queries: Sequence[MergedPRQuery]) -> dict[str, Any]:
+    """Build one aliased request resolving merged PRs for several repositories.
+
+    Args:
+        queries: Repositories and the branch names to look up
+
+    Returns:
+        JSON body for POST /graphql
+    """
+    repositories: list[str] = []
+    for i, query in enumerate(queries):
+        fields = [
+            f"b{j}: pullRequests(states: MERGED, baseRefName: {_literal(query.base_branch)}, "
+            f"headRefName: {_literal(branch)}, first: {_MERGED_PRS_PER_BRANCH}, "
+            "orderBy: {field: UPDATED_AT, direction: DESC}) "
+            "{ nodes { headRefOid headRepository { nameWithOwner } } }"
+            for j, branch in enumerate(query.branches)
+        ]
+        repositories.append(
+            f"r{i}: repository(owner: {_literal(query.owner)}, name: {_literal(query.repo)}) {{ {' '.join(fields)} }}"
+        )
+    return {"query": "query {\n" + "\n".join(repositories) + "\n}"}
+
+
+def parse_merged_prs(payload: dict[str, Any], queries: Sequence[MergedPRQuery]) -> list[dict[str, str] | None]:
+    """Parse the response of merged_prs_request().
+
+    Repositories that could not be resolved (e.g. not found or not
+    accessible) are returned as None so callers can fall back to REST;
+    errors for individual aliases do not fail the whole batch.
+
+    Args:
+        payload: Decoded GraphQL response
+        queries: The queries the request was built from
+
+    Returns:
+        Per query, a mapping of branch name to merged PR head SHA, or None
+
+    Raises:
+        GitHubGraphQLError: If the response has no data at all
+    """
+    data = payload.get("data")
+    if not isinstance(data, dict):
+        messages = "; ".join(str(e.get("message", e)) for e in payload.get("errors") or [])
+        raise GitHubGraphQLError(messages or "GraphQL response has no data")
+
+    results: list[dict[str, str] | None] = []
+    for i, query in enumerate(queries):
+        repository = data.get(f"r{i}")
+        if not isinstance(repository, dict):
+            results.append(None)
+            continue
+        expected = f"{query.owner}/{query.repo}".lower()
+        merged: dict[str, str] = {}
+        try:
+            for j, branch in enumerate(query.branches):
+                connection = repository.get(f"b{j}") or {}
+                for node in connection.get("nodes") or []:
+                    head_repo = (node or {}).get("headRepository") or {}
+                    # Skip PRs from forks that happen to use the same branch name
+                    if str(head_repo.get("nameWithOwner", "")).lower() == expected and node.get("headRefOid"):
+                        merged[branch] = node["headRefOid"]
+                        break
+        except (TypeError, AttributeError) as e:
+            raise GitHubGraphQLError(f"Unexpected GraphQL merged PR payload: {e!r}") from e
+        results.append(merged)
+    return results
@@ -0,0 +1,219 @@
+"""On-disk cache for conditional GitHub API requests."""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from setup_repo.utils.logging import get_logger
+
+log = get_logger(__name__)
+
+DEFAULT_TTL = 7 * 24 * 60 * 60  # 1 week
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # 50MB
+ENTRY_SUFFIX = ".entry"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A cached response body together with its HTTP validators."""
+
+    content: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+    link: str | None = None
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for revalidation."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Persistent cache of API response bodies keyed by URL and params.
+
+    Entries are revalidated with conditional requests, so a ``304 Not Modified``
+    answer can be served from disk without counting against the rate limit.
+    Entries older than ``ttl`` are discarded, and the least recently used
+    entries are evicted once the cache grows beyond ``max_bytes``.
+
+    Each entry is a single file: one line of JSON metadata holding the
+    validators, followed by the raw response body. The body is stored
+    verbatim so a cache hit decodes the page only once.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        """Initialize the response cache.
+
+        Args:
+            cache_dir: Directory to store cache entries in
+            ttl: Maximum age of an entry in seconds
+            max_bytes: Maximum total size of all entries in bytes
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: int | None = None
+
+    @staticmethod
+    def make_key(namespace: str, url: str, params: Mapping[str, Any] | None = None) -> str:
+        """Build a cache key from a namespace, URL and query parameters.
+
+        Args:
+            namespace: Identity the response belongs to (e.g. a token fingerprint)
+            url: Request URL
+            params: Query parameters
+
+        Returns:
+            Hex digest usable as a file name
+        """
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return hashlib.sha256(f"{namespace}\n{url}?{query}".encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Get a cached response if present and not expired.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            CachedResponse or None on a miss
+        """
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                self._remove(path)
+                return None
+            header, separator, content = path.read_bytes().partition(b"\n")
+            if not separator:
+                raise ValueError("missing entry header")
+            meta = json.loads(header)
+            return CachedResponse(
+                content=content,
+                etag=meta.get("etag"),
+                last_modified=meta.get("last_modified"),
+                link=meta.get("link"),
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, AttributeError) as e:
+            log.debug("http_cache_entry_invalid", key=key, error=str(e))
+            self._remove(path)
+            return None
+
+    def put(self, key: str, content: bytes, headers: Mapping[str, str]) -> None:
+        """Store a response body with its validators.
+
+        Responses without an ETag or Last-Modified header cannot be
+        revalidated and are not stored.
+
+        Args:
+            key: Cache key from make_key()
+            content: Raw response body
+            headers: Response headers
+        """
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+
+        # Compact JSON never contains a raw newline, so it can end the header
+        header = json.dumps(
+            {"etag": etag, "last_modified": last_modified, "link": headers.get("link")},
+            separators=(",", ":"),
+        ).encode()
+        data = header + b"\n" + content
+        path = self._path(key)
+        tmp_name: str | None = None
+        try:
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            old_size = path.stat().st_size if path.exists() else 0
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, path)
+        except OSError as e:
+            log.debug("http_cache_write_failed", key=key, error=str(e))
+            if tmp_name is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_name)
+            return
+
+        with self._lock:
+            if self._size is not None:
+                self._size += len(data) - old_size
+        self._evict()
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as freshly revalidated.
+
+        Args:
+            key: Cache key from make_key()
+        """
+        with contextlib.suppress(OSError):
+            self._path(key).touch()
+
+    def clear(self) -> None:
+        """Remove all cache entries."""
+        for path in self.cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+            self._remove(path)
+        with self._lock:
+            self._size = 0
+
+    def _remove(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        with self._lock:
+            if self._size is not None:
+                self._size -= size
+
+    def _scan(self) -> list[tuple[os.stat_result, Path]]:
+        """List cache entries with their stat results, skipping vanished files."""
+        entries: list[tuple[os.stat_result, Path]] = []
+        for path in self.cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+            try:
+                entries.append((path.stat(), path))
+            except OSError:
+                continue
+        return entries
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until the cache fits max_bytes."""
+        with self._lock:
+            if self._size is None:
+                self._size = sum(stat.st_size for stat, _ in self._scan())
+            if self._size <= self.max_bytes:
+                return
+
+            for stat, path in sorted(self._scan(), key=lambda item: item[0].st_mtime):
+                if self._size <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                self._size -= stat.st_size
+                log.debug("http_cache_evicted", key=path.stem)
@@ -0,0 +1,99 @@
+"""Persisted repository inventory for offline sync."""
+
+import contextlib
+import json
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from setup_repo.core.github import parse_repositories
+from setup_repo.models.repository import Repository
+from setup_repo.utils.logging import get_logger
+
+log = get_logger(__name__)
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+@dataclass(frozen=True)
+class SavedInventory:
+    """A repository listing loaded from disk."""
+
+    repositories: list[Repository]
+    saved_at: datetime | None
+
+
+class RepositoryInventory:
+    """Store the last complete repository listing per owner.
+
+    Every successful listing is saved, so ``sync`` can run its git
+    operations from the saved list when the GitHub API is unreachable or
+    rate-limited, or when it is told to stay offline. Fields at their
+    default values are omitted to keep the files compact.
+    """
+
+    def __init__(self, inventory_dir: Path) -> None:
+        """Initialize the inventory store.
+
+        Args:
+            inventory_dir: Directory to store inventories in
+        """
+        self.inventory_dir = inventory_dir
+
+    def _path(self, owner: str) -> Path:
+        return self.inventory_dir / f"{_UNSAFE_CHARS.sub('_', owner.lower())}.json"
+
+    def save(self, owner: str, repositories: list[Repository]) -> None:
+        """Save a complete repository listing.
+
+        Args:
+            owner: GitHub username or organization
+            repositories: Repositories of the listing
+        """
+        data = json.dumps(
+            {
+                "owner": owner,
+                "saved_at": datetime.now(UTC).isoformat(),
+                "repositories": [repo.model_dump(mode="json", exclude_defaults=True) for repo in repositories],
+            },
+            separators=(",", ":"),
+        )
+        tmp_name: str | None = None
+        try:
+            self.inventory_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.inventory_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_name, self._path(owner))
+        except OSError as e:
+            log.warning("inventory_write_failed", owner=owner, error=str(e))
+            if tmp_name is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_name)
+            return
+        log.debug("inventory_saved", owner=owner, count=len(repositories))
+
+    def load(self, owner: str) -> SavedInventory | None:
+        """Load the saved repository listing of an owner.
+
+        Args:
+            owner: GitHub username or organization
+
+        Returns:
+            SavedInventory or None if nothing usable is saved
+        """
+        try:
+            data = json.loads(self._path(owner).read_text(encoding="utf-8"))
+            items = data["repositories"]
+            if not isinstance(items, list):
+                raise TypeError("repositories must be a list")
+            saved_at = datetime.fromisoformat(data["saved_at"]) if data.get("saved_at") else None
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            log.warning("inventory_invalid", owner=owner, error=str(e))
+            return None
+        return SavedInventory(repositories=parse_repositories(items), saved_at=saved_at)
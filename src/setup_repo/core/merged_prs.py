@@ -0,0 +1,101 @@
+"""On-disk watermark store for incremental merged-PR fetches."""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from setup_repo.utils.logging import get_logger
+
+log = get_logger(__name__)
+
+
+@dataclass
+class MergedPRSnapshot:
+    """Merged PRs collected for a repository up to a watermark.
+
+    Attributes:
+        updated_at: ``updated_at`` of the most recently updated closed PR seen
+        branches: Mapping of head branch name to PR head SHA
+    """
+
+    updated_at: str | None = None
+    branches: dict[str, str] = field(default_factory=dict)
+
+
+class MergedPRStore:
+    """Persist merged-PR snapshots per repository and base branch.
+
+    Closed PRs are listed newest-updated first, so a later fetch only needs
+    to walk PRs updated after the stored watermark and merge them into the
+    stored branch map.
+    """
+
+    def __init__(self, state_dir: Path) -> None:
+        """Initialize the store.
+
+        Args:
+            state_dir: Directory to store snapshots in
+        """
+        self.state_dir = state_dir
+
+    def _path(self, owner: str, repo: str, base_branch: str) -> Path:
+        key = hashlib.sha256(f"{owner}/{repo}\n{base_branch}".lower().encode()).hexdigest()
+        return self.state_dir / f"{key}.json"
+
+    def load(self, owner: str, repo: str, base_branch: str) -> MergedPRSnapshot | None:
+        """Load the stored snapshot for a repository.
+
+        Args:
+            owner: GitHub username or organization
+            repo: Repository name
+            base_branch: Base branch the PRs were merged into
+
+        Returns:
+            MergedPRSnapshot or None if nothing usable is stored
+        """
+        path = self._path(owner, repo, base_branch)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            branches = data["branches"]
+            if not isinstance(branches, dict):
+                raise TypeError("branches must be an object")
+            return MergedPRSnapshot(updated_at=data.get("updated_at"), branches=branches)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            log.debug("merged_pr_snapshot_invalid", owner=owner, repo=repo, error=str(e))
+            return None
+
+    def save(self, owner: str, repo: str, base_branch: str, snapshot: MergedPRSnapshot) -> None:
+        """Store a snapshot for a repository.
+
+        Args:
+            owner: GitHub username or organization
+            repo: Repository name
+            base_branch: Base branch the PRs were merged into
+            snapshot: Snapshot to store
+        """
+        data = json.dumps(
+            {
+                "repo": f"{owner}/{repo}",
+                "base": base_branch,
+                "updated_at": snapshot.updated_at,
+                "branches": snapshot.branches,
+            }
+        )
+        tmp_name: str | None = None
+        try:
+            self.state_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.state_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_name, self._path(owner, repo, base_branch))
+        except OSError as e:
+            log.debug("merged_pr_snapshot_write_failed", owner=owner, repo=repo, error=str(e))
+            if tmp_name is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_name)
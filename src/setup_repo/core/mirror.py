@@ -0,0 +1,115 @@
+"""Shared bare-mirror cache that new clones borrow objects from."""
+
+import contextlib
+import os
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+from setup_repo.core.git_operations import BasicGitOperations
+from setup_repo.models.result import ProcessResult, ResultStatus
+from setup_repo.utils.logging import get_logger, log_context
+
+log = get_logger(__name__)
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+# Branches and tags only; GitHub also advertises refs/pull/*, which would bloat the mirrors
+_MIRROR_REFSPECS = ("+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*")
+
+
+class MirrorCache:
+    """Keep one bare mirror per repository in a shared directory.
+
+    ``mirror update`` downloads each repository into its mirror once, and
+    ``sync`` clones working copies with ``--reference <mirror>
+    --dissociate``, so only objects missing from the mirror come over the
+    network. Mirrors are laid out as ``<owner>/<name>.git``.
+    """
+
+    def __init__(self, mirror_dir: Path, git: BasicGitOperations | None = None) -> None:
+        """Initialize the mirror cache.
+
+        Args:
+            mirror_dir: Directory holding the mirrors
+            git: Git operations used to create and fetch mirrors
+        """
+        self.mirror_dir = mirror_dir
+        self.git = git or BasicGitOperations()
+
+    def path(self, full_name: str) -> Path:
+        """Get the mirror path of a repository.
+
+        Args:
+            full_name: Repository full name (``owner/name``)
+
+        Returns:
+            Path of the bare mirror (which may not exist yet)
+        """
+        owner, _, name = full_name.lower().rpartition("/")
+        return self.mirror_dir / _UNSAFE_CHARS.sub("_", owner or "_") / f"{_UNSAFE_CHARS.sub('_', name)}.git"
+
+    def get(self, full_name: str) -> Path | None:
+        """Get the mirror of a repository if it exists.
+
+        Args:
+            full_name: Repository full name (``owner/name``)
+
+        Returns:
+            Path of the bare mirror, or None if there is none
+        """
+        path = self.path(full_name)
+        return path if (path / "HEAD").is_file() else None
+
+    def update(self, full_name: str, url: str) -> ProcessResult:
+        """Create the mirror of a repository or fetch into it.
+
+        Args:
+            full_name: Repository full name (``owner/name``)
+            url: URL to mirror from
+
+        Returns:
+            ProcessResult
+        """
+        path = self.path(full_name)
+        with log_context(repo=full_name):
+            try:
+                if self.get(full_name) is not None:
+                    self.git.run(["fetch", "--prune", "--quiet", "origin"], cwd=path)
+                    log.info("mirror_fetched", path=str(path))
+                    message = "Mirror updated"
+                else:
+                    self._create(url, path)
+                    log.info("mirror_created", path=str(path))
+                    message = "Mirror created"
+            except subprocess.CalledProcessError as e:
+                log.error("mirror_update_failed", error=e.stderr)
+                return ProcessResult(repo_name=full_name, status=ResultStatus.FAILED, error=e.stderr)
+            except subprocess.TimeoutExpired:
+                log.error("mirror_update_timeout")
+                return ProcessResult(repo_name=full_name, status=ResultStatus.FAILED, error="Mirror update timed out")
+            except OSError as e:
+                log.error("mirror_update_failed", error=str(e))
+                return ProcessResult(repo_name=full_name, status=ResultStatus.FAILED, error=str(e))
+        return ProcessResult(repo_name=full_name, status=ResultStatus.SUCCESS, message=message)
+
+    def _create(self, url: str, path: Path) -> None:
+        """Clone a new mirror next to its final path and move it into place.
+
+        Sync therefore never borrows from a half-cloned mirror.
+        """
+        tmp = path.with_name(f"{path.name}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self.git.run(["clone", "--bare", "--quiet", url, str(tmp)])
+            self.git.run(["config", "remote.origin.fetch", _MIRROR_REFSPECS[0]], cwd=tmp)
+            for refspec in _MIRROR_REFSPECS[1:]:
+                self.git.run(["config", "--add", "remote.origin.fetch", refspec], cwd=tmp)
+            # Leftovers of an interrupted mirror without HEAD
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(tmp, path)
+        except Exception:
+            with contextlib.suppress(OSError):
+                shutil.rmtree(tmp)
+            raise
@@ -1,10 +1,13 @@
 """Parallel processing with Rich progress."""
 
+import queue
+import threading
 import time
-from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Awaitable, Callable, Iterable, Sized
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
+import anyio
 from rich.progress import (
     BarColumn,
     Progress,
@@ -22,6 +25,20 @@ from setup_repo.utils.logging import get_logger, log_context
 log = get_logger(__name__)
 
 
+def _progress() -> Progress:
+    """Create the transient progress display used by the processors."""
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TaskProgressColumn(),
+        TimeElapsedColumn(),
+        TimeRemainingColumn(),
+        console=console,
+        transient=True,
+    )
+
+
 class ParallelProcessor:
     """Parallel processing with progress display."""
 
@@ -35,14 +52,20 @@ class ParallelProcessor:
 
     def process(
         self,
-        items: list[Path],
+        items: Iterable[Path],
         process_func: Callable[[Path], ProcessResult],
         desc: str = "Processing",
     ) -> SyncSummary:
         """Process multiple items in parallel.
 
+        Items may be a lazy iterable (e.g. repositories streamed page by
+        page from the API). They are consumed on a feeder thread, workers
+        start on the first item right away, and the progress total grows
+        as items arrive. If the iterable raises, items already submitted
+        are finished first and the error is then re-raised.
+
         Args:
-            items: List of paths to process
+            items: Paths to process
             process_func: Function to apply to each item
             desc: Description for progress bar
 
@@ -51,24 +74,42 @@ class ParallelProcessor:
         """
         results: list[ProcessResult] = []
         start_time = time.time()
+        done: queue.Queue[tuple[Path, Future[ProcessResult]] | None] = queue.Queue()
+        feed_error: list[Exception] = []
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TaskProgressColumn(),
-            TimeElapsedColumn(),
-            TimeRemainingColumn(),
-            console=console,
-            transient=True,
-        ) as progress:
-            task = progress.add_task(desc, total=len(items))
+        with _progress() as progress:
+            task = progress.add_task(desc, total=len(items) if isinstance(items, Sized) else None)
 
             with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = {executor.submit(self._safe_process, item, process_func): item for item in items}
 
-                for future in as_completed(futures):
-                    item = futures[future]
+                def feed() -> None:
+                    submitted = 0
+                    try:
+                        for item in items:
+                            future = executor.submit(self._safe_process, item, process_func)
+                            future.add_done_callback(lambda f, item=item: done.put((item, f)))
+                            submitted += 1
+                            if not isinstance(items, Sized):
+                                progress.update(task, total=submitted)
+                    except Exception as e:
+                        log.error("item_stream_failed", error=str(e))
+                        feed_error.append(e)
+                    finally:
+                        # Record the final count before waking the loop with the sentinel
+                        feed_count.append(submitted)
+                        done.put(None)
+
+                feed_count: list[int] = []
+                feeder = threading.Thread(target=feed, name="parallel-feeder", daemon=True)
+                feeder.start()
+
+                completed = 0
+                while not feed_count or completed < feed_count[0]:
+                    entry = done.get()
+                    if entry is None:
+                        continue
+                    item, future = entry
+                    completed += 1
                     try:
                         result = future.result()
                         results.append(result)
@@ -87,6 +128,10 @@ class ParallelProcessor:
                             )
                         )
                         progress.update(task, advance=1)
+                feeder.join()
+
+        if feed_error:
+            raise feed_error[0]
 
         duration = time.time() - start_time
         return SyncSummary.from_results(results, duration)
@@ -119,3 +164,88 @@ class ParallelProcessor:
                     duration=time.time() - start,
                     error=str(e),
                 )
+
+
+class AsyncParallelProcessor:
+    """Concurrent processing of coroutines with progress display.
+
+    Every item runs as a task on the current event loop instead of on a
+    worker thread, so the concurrency limit is bounded by open file
+    descriptors rather than by thread stacks.
+    """
+
+    def __init__(self, max_concurrency: int = 64) -> None:
+        """Initialize the processor.
+
+        Args:
+            max_concurrency: Maximum number of items processed at the same time
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+
+    async def process(
+        self,
+        items: Iterable[Path],
+        process_func: Callable[[Path], Awaitable[ProcessResult]],
+        desc: str = "Processing",
+    ) -> SyncSummary:
+        """Process multiple items concurrently.
+
+        Args:
+            items: Paths to process
+            process_func: Coroutine function to apply to each item
+            desc: Description for progress bar
+
+        Returns:
+            SyncSummary with all results
+        """
+        items = list(items)
+        results: list[ProcessResult] = []
+        start_time = time.time()
+        semaphore = anyio.Semaphore(self.max_concurrency)
+
+        with _progress() as progress:
+            task = progress.add_task(desc, total=len(items))
+
+            async def run(item: Path) -> None:
+                async with semaphore:
+                    result = await self._safe_process(item, process_func)
+                results.append(result)
+                progress.update(task, advance=1, description=f"{desc}: {result.repo_name}")
+
+            async with anyio.create_task_group() as tg:
+                for item in items:
+                    tg.start_soon(run, item)
+
+        duration = time.time() - start_time
+        return SyncSummary.from_results(results, duration)
+
+    async def _safe_process(
+        self,
+        item: Path,
+        func: Callable[[Path], Awaitable[ProcessResult]],
+    ) -> ProcessResult:
+        """Safely process an item with exception handling.
+
+        Args:
+            item: Path to process
+            func: Processing coroutine function
+
+        Returns:
+            ProcessResult
+        """
+        with log_context(repo=item.name):
+            start = time.time()
+            try:
+                result = await func(item)
+                result.duration = time.time() - start
+                return result
+            except Exception as e:
+                log.exception("process_failed")
+                return ProcessResult(
+                    repo_name=item.name,
+                    status=ResultStatus.FAILED,
+                    duration=time.time() - start,
+                    error=str(e),
+                )
@@ -0,0 +1,142 @@
+"""Rate-limit aware request scheduling for the GitHub API."""
+
+import random
+import threading
+import time
+from collections.abc import Mapping
+
+import httpx
+
+from setup_repo.utils.logging import get_logger
+
+log = get_logger(__name__)
+
+
+def _parse_int(value: str | None) -> int | None:
+    """Parse an integer header value."""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+class RateLimitScheduler:
+    """Track the GitHub API budget and pace requests accordingly.
+
+    One scheduler can be shared by several clients (and threads) so they
+    draw from the same budget. It reads ``X-RateLimit-Remaining`` and
+    ``X-RateLimit-Reset`` from every response, spreads the remaining
+    requests over the time left until the reset once the budget gets low,
+    and tells callers how long to back off after a rate-limited response.
+    """
+
+    def __init__(
+        self,
+        low_watermark: int = 100,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 120.0,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            low_watermark: Remaining budget below which requests are paced
+            max_retries: Maximum retries of a rate-limited request
+            base_delay: Initial backoff delay in seconds without Retry-After
+            max_delay: Longest wait in seconds before giving up on a request
+        """
+        self.low_watermark = low_watermark
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._remaining: int | None = None
+        self._reset_at: float | None = None
+
+    @property
+    def remaining(self) -> int | None:
+        """Remaining request budget, or None before the first response."""
+        with self._lock:
+            return self._remaining
+
+    @property
+    def reset_at(self) -> float | None:
+        """Epoch time when the budget resets, or None if unknown."""
+        with self._lock:
+            return self._reset_at
+
+    def has_budget(self, cost: int = 1) -> bool:
+        """Check whether optional API work of a given cost fits the budget.
+
+        Args:
+            cost: Number of requests the work is expected to make
+
+        Returns:
+            True if the budget is unknown or covers cost plus the low watermark
+        """
+        remaining = self.remaining
+        return remaining is None or remaining - cost >= self.low_watermark
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Record the budget reported by a response.
+
+        Args:
+            headers: Response headers
+        """
+        remaining = _parse_int(headers.get("x-ratelimit-remaining"))
+        reset = _parse_int(headers.get("x-ratelimit-reset"))
+        if remaining is None:
+            return
+        with self._lock:
+            self._remaining = remaining
+            if reset is not None:
+                self._reset_at = float(reset)
+
+    def pacing_delay(self) -> float:
+        """Get how long to wait before the next request.
+
+        Returns:
+            Delay in seconds (0 while the budget is above the low watermark)
+        """
+        with self._lock:
+            remaining, reset_at = self._remaining, self._reset_at
+        if remaining is None or reset_at is None or remaining > self.low_watermark:
+            return 0.0
+        window = reset_at - time.time()
+        if window <= 0:
+            return 0.0
+        return min(window / max(remaining, 1), self.max_delay)
+
+    def retry_delay(self, response: httpx.Response, attempt: int) -> float | None:
+        """Get the backoff before retrying a rate-limited response.
+
+        Args:
+            response: Response to inspect
+            attempt: Number of retries already made
+
+        Returns:
+            Delay in seconds, or None if the response should not be retried
+        """
+        if response.status_code not in (httpx.codes.FORBIDDEN, httpx.codes.TOO_MANY_REQUESTS):
+            return None
+
+        retry_after = _parse_int(response.headers.get("retry-after"))
+        remaining = _parse_int(response.headers.get("x-ratelimit-remaining"))
+        reset = _parse_int(response.headers.get("x-ratelimit-reset"))
+
+        if retry_after is not None:
+            delay = float(retry_after)
+        elif remaining == 0 and reset is not None:
+            delay = max(reset - time.time(), 0.0)
+        elif "rate limit" in response.text.lower():
+            # Secondary rate limit without Retry-After: exponential backoff
+            delay = self.base_delay * 2**attempt
+        else:
+            # Plain permission error
+            return None
+
+        if attempt >= self.max_retries or delay > self.max_delay:
+            return None
+        return delay + random.uniform(0, max(self.base_delay, delay * 0.1))
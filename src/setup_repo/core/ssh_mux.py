@@ -0,0 +1,176 @@
+"""Shared SSH connections for git over SSH (ControlMaster multiplexing)."""
+
+import contextlib
+import itertools
+import os
+import shlex
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from setup_repo.utils.logging import get_logger
+
+log = get_logger(__name__)
+
+# Seconds an idle master stays up; also the safety net if stop() never runs
+_DEFAULT_PERSIST = 60
+_WARM_TIMEOUT = 30
+
+
+class SshMultiplexer:
+    """Run git's SSH connections through a few long-lived master connections.
+
+    Every fetch over SSH otherwise pays its own handshake and key exchange.
+    start() opens ``connections`` master connections on private control
+    sockets. After that, command() hands out a ``GIT_SSH_COMMAND`` that
+    sends each git process through one of them in turn. stop() closes the
+    masters and removes the sockets.
+    """
+
+    def __init__(
+        self,
+        host: str = "git@github.com",
+        connections: int = 2,
+        persist: int = _DEFAULT_PERSIST,
+        base_command: str | None = None,
+    ) -> None:
+        """Initialize the multiplexer.
+
+        Args:
+            host: SSH destination the masters connect to
+            connections: Number of master connections to share the load
+            persist: Seconds an idle master stays open
+            base_command: SSH command to extend (default: GIT_SSH_COMMAND,
+                core.sshCommand or ``ssh``)
+        """
+        self.host = host
+        self.connections = max(1, connections)
+        self.persist = persist
+        self.base_command = base_command
+        self._base = base_command or "ssh"
+        self._control_dir: Path | None = None
+        self._commands: list[str] = []
+        self._next = itertools.count()
+
+    @property
+    def active(self) -> bool:
+        """Whether git should be sent through the masters."""
+        return bool(self._commands)
+
+    def command(self) -> str | None:
+        """Get the GIT_SSH_COMMAND for the next git process.
+
+        Returns:
+            SSH command using one of the masters, or None if not started
+        """
+        if not self._commands:
+            return None
+        return self._commands[next(self._next) % len(self._commands)]
+
+    def start(self) -> bool:
+        """Open the master connections.
+
+        If no master comes up (no SSH key, host unreachable), git keeps
+        using plain SSH. So does a custom GIT_SSH program, which
+        GIT_SSH_COMMAND would override.
+
+        Returns:
+            True if at least one master is up
+        """
+        if self.base_command is None and os.environ.get("GIT_SSH") and not os.environ.get("GIT_SSH_COMMAND"):
+            log.debug("ssh_multiplex_skipped", reason="GIT_SSH is set")
+            return False
+        base = self._base = self.base_command or _default_ssh_command()
+        self._control_dir = Path(tempfile.mkdtemp(prefix="setup-repo-ssh-"))
+        # %C hashes host, port and user, so a repository on another host never borrows a master
+        paths = [str(self._control_dir / f"{index}-%C") for index in range(self.connections)]
+        # The masters fork into the background and keep stderr open, so it goes to files, not pipes
+        with contextlib.ExitStack() as stack:
+            errors = [stack.enter_context(tempfile.TemporaryFile(mode="w+")) for _ in paths]
+            try:
+                warms = [
+                    subprocess.Popen(
+                        [
+                            *shlex.split(base),
+                            *self._options(path, master="yes"),
+                            "-o",
+                            "BatchMode=yes",
+                            "-fN",
+                            self.host,
+                        ],
+                        stdin=subprocess.DEVNULL,
+                        stdout=subprocess.DEVNULL,
+                        stderr=error,
+                    )
+                    for path, error in zip(paths, errors, strict=True)
+                ]
+            except OSError as e:
+                warms = []
+                log.warning("ssh_master_failed", host=self.host, error=str(e))
+            for path, warm, error in zip(paths, warms, errors, strict=False):
+                try:
+                    returncode = warm.wait(timeout=_WARM_TIMEOUT)
+                except subprocess.TimeoutExpired:
+                    warm.kill()
+                    warm.wait()
+                    log.warning("ssh_master_timeout", host=self.host)
+                    continue
+                if returncode != 0:
+                    error.seek(0)
+                    log.warning("ssh_master_failed", host=self.host, error=error.read().strip())
+                    continue
+                self._commands.append(shlex.join([*shlex.split(base), *self._options(path, master="auto")]))
+
+        log.debug("ssh_masters_started", host=self.host, masters=len(self._commands), requested=self.connections)
+        if not self._commands:
+            self.stop()
+        return self.active
+
+    def stop(self) -> None:
+        """Close the master connections and remove their sockets."""
+        if self._control_dir is None:
+            return
+        for index in range(self.connections):
+            path = str(self._control_dir / f"{index}-%C")
+            # Masters that never came up make this fail harmlessly
+            with contextlib.suppress(OSError, subprocess.TimeoutExpired):
+                subprocess.run(
+                    [*shlex.split(self._base), "-o", f"ControlPath={path}", "-O", "exit", self.host],
+                    stdin=subprocess.DEVNULL,
+                    capture_output=True,
+                    check=False,
+                    timeout=_WARM_TIMEOUT,
+                )
+        shutil.rmtree(self._control_dir, ignore_errors=True)
+        log.debug("ssh_masters_stopped", host=self.host, masters=len(self._commands))
+        self._control_dir = None
+        self._commands = []
+
+    def _options(self, control_path: str, master: str) -> list[str]:
+        """Build the ssh options that attach to (or become) a master."""
+        return [
+            "-o",
+            f"ControlMaster={master}",
+            "-o",
+            f"ControlPath={control_path}",
+            "-o",
+            f"ControlPersist={self.persist}",
+        ]
+
+
+def _default_ssh_command() -> str:
+    """Get the SSH command git would use on its own."""
+    if command := os.environ.get("GIT_SSH_COMMAND"):
+        return command
+    try:
+        result = subprocess.run(
+            ["git", "config", "--get", "core.sshCommand"],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=10,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return "ssh"
+    return result.stdout.strip() or "ssh"
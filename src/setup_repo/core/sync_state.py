@@ -0,0 +1,100 @@
+"""Last-synced ``pushed_at`` per local repository."""
+
+import contextlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from setup_repo.utils.logging import get_logger
+
+log = get_logger(__name__)
+
+
+class SyncState:
+    """Remember the upstream ``pushed_at`` each local clone was synced at.
+
+    ``pushed_at`` moves whenever anything is pushed to a repository, so a
+    clone whose recorded value still matches the API has nothing new to
+    fetch. Entries are keyed by the local path, so syncing the same owner
+    into different destinations does not mix up their state.
+
+    The file is read once on load and written once by save(); record() is
+    thread-safe and only updates memory.
+    """
+
+    def __init__(self, state_path: Path) -> None:
+        """Initialize the sync state.
+
+        Args:
+            state_path: JSON file to keep the state in
+        """
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._pushed_at: dict[str, str] = {}
+        self._dirty = False
+
+    def load(self) -> None:
+        """Read the state file, ignoring a missing or corrupt one."""
+        try:
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+            if not isinstance(data, dict) or not isinstance(data.get("repositories"), dict):
+                raise TypeError("repositories must be an object")
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, TypeError) as e:
+            log.warning("sync_state_invalid", path=str(self.state_path), error=str(e))
+            return
+        with self._lock:
+            self._pushed_at = {str(k): str(v) for k, v in data["repositories"].items()}
+
+    def is_up_to_date(self, repo_path: Path, pushed_at: datetime | None) -> bool:
+        """Check whether a clone was last synced at the given ``pushed_at``.
+
+        Args:
+            repo_path: Local repository path
+            pushed_at: Current ``pushed_at`` reported by the API
+
+        Returns:
+            True if the recorded value matches
+        """
+        if pushed_at is None:
+            return False
+        with self._lock:
+            return self._pushed_at.get(str(repo_path)) == pushed_at.isoformat()
+
+    def record(self, repo_path: Path, pushed_at: datetime | None) -> None:
+        """Record the ``pushed_at`` a clone was just synced at.
+
+        Args:
+            repo_path: Local repository path
+            pushed_at: ``pushed_at`` the sync started from
+        """
+        if pushed_at is None:
+            return
+        with self._lock:
+            self._pushed_at[str(repo_path)] = pushed_at.isoformat()
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write recorded changes to the state file."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({"repositories": self._pushed_at}, separators=(",", ":"))
+            self._dirty = False
+
+        tmp_name: str | None = None
+        try:
+            self.state_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.state_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_name, self.state_path)
+        except OSError as e:
+            log.warning("sync_state_write_failed", path=str(self.state_path), error=str(e))
+            if tmp_name is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_name)
@@ -5,11 +5,17 @@ import subprocess
 import tomllib
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Self
+from typing import Any, Literal, Self, get_args
 
 from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Values of setup_repo.core.git_operations.CloneStrategy
+CloneStrategyName = Literal["shallow", "blobless", "treeless", "single-branch", "full"]
+# Values of setup_repo.core.git_operations.FetchScope and PruneMode
+FetchScopeName = Literal["all", "branch"]
+PruneModeName = Literal["always", "on-change"]
+
 
 def get_config_path() -> Path:
     """Get the configuration file path.
@@ -125,6 +131,16 @@ class AppSettings(BaseSettings):
     github_owner: str = Field(default="", description="GitHub owner name")
     github_token: str | None = Field(default=None, description="GitHub Token")
     use_https: bool = Field(default=False, description="Use HTTPS for cloning")
+    inventory_backend: Literal["rest", "graphql"] = Field(
+        default="rest",
+        description="API used to list repositories (graphql requires a token)",
+    )
+    github_max_connections: int = Field(
+        default=20,
+        ge=1,
+        description="Maximum pooled connections to the GitHub API",
+    )
+    github_http2: bool = Field(default=False, description="Use HTTP/2 for the GitHub API (requires the http2 extra)")
 
     # Directory settings
     workspace_dir: Path = Field(
@@ -134,6 +150,16 @@ class AppSettings(BaseSettings):
 
     # Parallel processing settings
     max_workers: int = Field(default=10, ge=1, le=32, description="Number of parallel workers")
+    sync_engine: Literal["thread", "async"] = Field(
+        default="thread",
+        description="Sync execution engine: worker threads or asyncio subprocesses",
+    )
+    clone_strategy: CloneStrategyName = Field(
+        default="shallow",
+        description="How new repositories are cloned: shallow, blobless, treeless, single-branch or full",
+    )
+    # Each in-flight git process holds about three file descriptors in this process
+    max_concurrency: int = Field(default=64, ge=1, le=256, description="Concurrent repositories for the async engine")
 
     # Git settings
     auto_prune: bool = Field(default=True, description="Auto fetch --prune")
@@ -144,6 +170,49 @@ class AppSettings(BaseSettings):
         default=False,
         description="Include squash-merged branches in auto cleanup",
     )
+    auto_cleanup_squash_batch: bool = Field(
+        default=True,
+        description="Resolve merged PRs for all synced repositories with batched GraphQL queries",
+    )
+    ssh_connections: int = Field(
+        default=0,
+        ge=0,
+        le=16,
+        description="Shared SSH master connections that sync runs git through (0: one connection per git command)",
+    )
+
+    # Fetch settings
+    fetch_scope: FetchScopeName = Field(
+        default="all",
+        description="Branches pull fetches: all, or branch (the upstream of the checked-out branch only)",
+    )
+    fetch_tags: bool = Field(default=True, description="Fetch tags on pull")
+    fetch_protocol_v2: bool = Field(default=False, description="Force git protocol v2 for fetches")
+    fetch_prune: PruneModeName = Field(
+        default="always",
+        description="When pull prunes deleted branches: always, or on-change (only when the upstream moved)",
+    )
+
+    # Maintenance settings
+    maintenance_after_sync: bool = Field(default=False, description="Run git maintenance on the workspace after sync")
+    maintenance_time_budget: int = Field(
+        default=0,
+        ge=0,
+        description="Seconds after which no further maintenance task is started (0: no limit)",
+    )
+
+    # Cache settings
+    cache_dir: Path = Field(
+        default=Path.home() / ".cache" / "setup-repo",
+        description="Directory for local caches and state",
+    )
+    http_cache: bool = Field(default=True, description="Cache GitHub API responses using conditional requests")
+    http_cache_ttl: int = Field(default=7 * 24 * 60 * 60, ge=0, description="Maximum age of cached responses (seconds)")
+    http_cache_max_mb: int = Field(default=50, ge=1, description="Maximum size of the response cache (MB)")
+    mirror_dir: Path | None = Field(
+        default=None,
+        description="Shared bare-mirror cache that new clones borrow objects from (disabled if unset)",
+    )
 
     # Logging settings
     log_level: str = Field(default="INFO", description="Log level")
@@ -212,6 +281,14 @@ class AppSettings(BaseSettings):
                 self.github_owner = owner
             if (token := github.get("token")) and _env_not_set("GITHUB_TOKEN"):
                 self.github_token = token
+            if (backend := github.get("inventory")) and _env_not_set("INVENTORY_BACKEND"):
+                if backend not in ("rest", "graphql"):
+                    raise ValueError(f"Invalid [github] inventory: {backend!r} (expected 'rest' or 'graphql')")
+                self.inventory_backend = backend
+            if (max_connections := github.get("max_connections")) and _env_not_set("GITHUB_MAX_CONNECTIONS"):
+                self.github_max_connections = max_connections
+            if "http2" in github and _env_not_set("GITHUB_HTTP2"):
+                self.github_http2 = github["http2"]
 
         # Workspace settings
         if workspace := config.get("workspace"):
@@ -219,6 +296,17 @@ class AppSettings(BaseSettings):
                 self.workspace_dir = Path(dir_str).expanduser()
             if (workers := workspace.get("max_workers")) and _env_not_set("MAX_WORKERS"):
                 self.max_workers = workers
+            if (engine := workspace.get("engine")) and _env_not_set("SYNC_ENGINE"):
+                if engine not in ("thread", "async"):
+                    raise ValueError(f"Invalid [workspace] engine: {engine!r} (expected 'thread' or 'async')")
+                self.sync_engine = engine
+            if (concurrency := workspace.get("max_concurrency")) and _env_not_set("MAX_CONCURRENCY"):
+                self.max_concurrency = concurrency
+            if (strategy := workspace.get("clone_strategy")) and _env_not_set("CLONE_STRATEGY"):
+                if strategy not in get_args(CloneStrategyName):
+                    expected = ", ".join(get_args(CloneStrategyName))
+                    raise ValueError(f"Invalid [workspace] clone_strategy: {strategy!r} (expected one of {expected})")
+                self.clone_strategy = strategy
 
         # Git settings
         if git := config.get("git"):
@@ -234,6 +322,49 @@ class AppSettings(BaseSettings):
                 self.auto_cleanup = git["auto_cleanup"]
             if "auto_cleanup_include_squash" in git and _env_not_set("AUTO_CLEANUP_INCLUDE_SQUASH"):
                 self.auto_cleanup_include_squash = git["auto_cleanup_include_squash"]
+            if "auto_cleanup_squash_batch" in git and _env_not_set("AUTO_CLEANUP_SQUASH_BATCH"):
+                self.auto_cleanup_squash_batch = git["auto_cleanup_squash_batch"]
+            if "ssh_connections" in git and _env_not_set("SSH_CONNECTIONS"):
+                self.ssh_connections = git["ssh_connections"]
+
+        # Fetch settings
+        if fetch := config.get("fetch"):
+            if (scope := fetch.get("scope")) and _env_not_set("FETCH_SCOPE"):
+                if scope not in get_args(FetchScopeName):
+                    expected = ", ".join(get_args(FetchScopeName))
+                    raise ValueError(f"Invalid [fetch] scope: {scope!r} (expected one of {expected})")
+                self.fetch_scope = scope
+            if "tags" in fetch and _env_not_set("FETCH_TAGS"):
+                self.fetch_tags = fetch["tags"]
+            if "protocol_v2" in fetch and _env_not_set("FETCH_PROTOCOL_V2"):
+                self.fetch_protocol_v2 = fetch["protocol_v2"]
+            if (prune := fetch.get("prune")) and _env_not_set("FETCH_PRUNE"):
+                if prune not in get_args(PruneModeName):
+                    expected = ", ".join(get_args(PruneModeName))
+                    raise ValueError(f"Invalid [fetch] prune: {prune!r} (expected one of {expected})")
+                self.fetch_prune = prune
+
+        # Maintenance settings
+        if maintenance := config.get("maintenance"):
+            if "after_sync" in maintenance and _env_not_set("MAINTENANCE_AFTER_SYNC"):
+                self.maintenance_after_sync = maintenance["after_sync"]
+            if "time_budget" in maintenance and _env_not_set("MAINTENANCE_TIME_BUDGET"):
+                self.maintenance_time_budget = maintenance["time_budget"]
+
+        # Cache settings
+        if cache := config.get("cache"):
+            if (cache_dir_str := cache.get("dir")) and _env_not_set("CACHE_DIR"):
+                self.cache_dir = Path(cache_dir_str).expanduser()
+            if "http" in cache and _env_not_set("HTTP_CACHE"):
+                self.http_cache = cache["http"]
+            if "http_ttl" in cache and _env_not_set("HTTP_CACHE_TTL"):
+                self.http_cache_ttl = cache["http_ttl"]
+            if "http_max_mb" in cache and _env_not_set("HTTP_CACHE_MAX_MB"):
+                self.http_cache_max_mb = cache["http_max_mb"]
+
+        # Mirror settings
+        if (mirror := config.get("mirror")) and (mirror_dir_str := mirror.get("dir")) and _env_not_set("MIRROR_DIR"):
+            self.mirror_dir = Path(mirror_dir_str).expanduser()
 
         # Logging settings
         if logging := config.get("logging"):
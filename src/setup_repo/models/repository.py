@@ -17,6 +17,7 @@ class Repository(BaseModel):
     archived: bool = False
     fork: bool = False
     pushed_at: datetime | None = None
+    default_branch_sha: str | None = None
 
     def get_clone_url(self, use_https: bool = False) -> str:
         """Get the clone URL based on preference.
@@ -24,6 +24,7 @@ class ProcessResult(BaseModel):
     message: str = ""
     error: str | None = None
     timestamp: datetime = Field(default_factory=datetime.now)
+    timings: dict[str, float] = Field(default_factory=dict, description="Seconds spent per phase (e.g. fetch)")
 
     @property
     def is_success(self) -> bool:
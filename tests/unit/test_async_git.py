@@ -0,0 +1,137 @@
+"""Tests for async Git operations."""
+
+import os
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import anyio
+import pytest
+
+from setup_repo.core.async_git import AsyncGitOperations
+from setup_repo.core.git_operations import FetchProfile, FetchScope, PruneMode
+from setup_repo.models.result import ResultStatus
+
+GIT_ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+def git(path: Path, *args: str) -> str:
+    """Run git in a test repository and return its output."""
+    result = subprocess.run(["git", *args], cwd=path, check=True, env=GIT_ENV, capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    """Run on asyncio, which the sync command's async engine uses."""
+    return "asyncio"
+
+
+@pytest.fixture
+def origin(tmp_path: Path) -> Path:
+    """Create an origin repository with one commit on main."""
+    path = tmp_path / "origin"
+    path.mkdir()
+    git(path, "init", "-q", "-b", "main")
+    git(path, "commit", "-q", "--allow-empty", "-m", "init")
+    return path
+
+
+class TestAsyncGitOperations:
+    """Tests for AsyncGitOperations."""
+
+    @pytest.mark.anyio
+    async def test_run(self, origin: Path) -> None:
+        """Test output is decoded and failures raise like subprocess.run."""
+        ops = AsyncGitOperations()
+
+        result = await ops.run(["rev-parse", "--abbrev-ref", "HEAD"], cwd=origin)
+        assert result.stdout.strip() == "main"
+
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            await ops.run(["rev-parse", "missing"], cwd=origin)
+        assert "missing" in exc_info.value.stderr
+
+        result = await ops.run(["rev-parse", "missing"], cwd=origin, check=False)
+        assert result.returncode != 0
+
+    @pytest.mark.anyio
+    async def test_run_timeout(self, origin: Path) -> None:
+        """Test a command running past the timeout raises TimeoutExpired."""
+
+        async def hang(*args: object, **kwargs: object) -> None:
+            await anyio.sleep(10)
+
+        ops = AsyncGitOperations(timeout=0.01)
+        with patch("setup_repo.core.async_git.anyio.run_process", hang), pytest.raises(subprocess.TimeoutExpired):
+            await ops.run(["status"], cwd=origin)
+
+    @pytest.mark.anyio
+    async def test_clone_and_pull(self, origin: Path, tmp_path: Path) -> None:
+        """Test cloning and fast-forwarding a clone."""
+        ops = AsyncGitOperations()
+        clone = tmp_path / "clone"
+
+        result = await ops.clone(f"file://{origin}", clone, "main")
+        assert result.status == ResultStatus.SUCCESS
+
+        git(origin, "commit", "-q", "--allow-empty", "-m", "second")
+        assert not await ops.remote_head_unchanged(clone)
+
+        result = await ops.pull(clone, check_remote_head=True)
+        assert result.status == ResultStatus.SUCCESS
+        assert set(result.timings) == {"remote_check", "fetch", "merge"}
+        assert git(clone, "rev-parse", "HEAD") == git(origin, "rev-parse", "HEAD")
+
+        result = await ops.pull(clone, check_remote_head=True)
+        assert result.status == ResultStatus.SKIPPED
+        assert result.message == "up to date"
+
+    @pytest.mark.anyio
+    async def test_clone_failure(self, tmp_path: Path) -> None:
+        """Test a failed clone is reported as FAILED."""
+        result = await AsyncGitOperations().clone(f"file://{tmp_path / 'missing'}", tmp_path / "clone")
+
+        assert result.status == ResultStatus.FAILED
+        assert result.error
+
+    @pytest.mark.anyio
+    async def test_pull_not_fast_forward(self, origin: Path, tmp_path: Path) -> None:
+        """Test a diverged branch fails in the merge phase."""
+        ops = AsyncGitOperations(auto_prune=False)
+        clone = tmp_path / "clone"
+        await ops.clone(f"file://{origin}", clone, "main")
+        git(origin, "commit", "-q", "--allow-empty", "-m", "upstream")
+        git(clone, "commit", "-q", "--allow-empty", "-m", "local")
+
+        result = await ops.pull(clone)
+
+        assert result.status == ResultStatus.FAILED
+        assert set(result.timings) == {"fetch", "merge"}
+
+    @pytest.mark.anyio
+    async def test_pull_with_narrow_profile(self, origin: Path, tmp_path: Path) -> None:
+        """Test the upstream alone is fetched and stale branches are pruned once it moves."""
+        git(origin, "branch", "stale")
+        clone = tmp_path / "clone"
+        git(tmp_path, "clone", "-q", f"file://{origin}", str(clone))
+        git(origin, "branch", "-q", "-D", "stale")
+        git(origin, "commit", "-q", "--allow-empty", "-m", "upstream")
+        git(origin, "branch", "other")
+        profile = FetchProfile(scope=FetchScope.BRANCH, tags=False, prune=PruneMode.ON_CHANGE)
+
+        result = await AsyncGitOperations(fetch_profile=profile).pull(clone)
+
+        assert result.status == ResultStatus.SUCCESS
+        assert set(result.timings) == {"fetch", "prune", "merge"}
+        assert git(clone, "rev-parse", "HEAD") == git(origin, "rev-parse", "HEAD")
+        assert git(clone, "for-each-ref", "--format=%(refname)", "refs/remotes/origin/").splitlines() == [
+            "refs/remotes/origin/HEAD",
+            "refs/remotes/origin/main",
+        ]
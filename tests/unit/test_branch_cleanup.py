@@ -3,8 +3,19 @@
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from setup_repo.core.branch_cleanup import get_squash_merged_branches
+from setup_repo.core.branch_cleanup import build_merged_pr_query, get_squash_merged_branches
 from setup_repo.core.git import GitOperations
+from setup_repo.core.git_branch import Ancestry, BranchInfo, BranchSnapshot
+from setup_repo.core.github_graphql import MergedPRQuery
+from setup_repo.core.rate_limit import RateLimitScheduler
+
+
+def make_snapshot(shas: dict[str, str], current: str | None = None, base_branch: str = "main") -> BranchSnapshot:
+    """Build a branch snapshot from branch name to SHA."""
+    return BranchSnapshot(
+        base_branch=base_branch,
+        branches={name: BranchInfo(name=name, sha=sha, is_head=name == current) for name, sha in shas.items()},
+    )
 
 
 def test_get_squash_merged_branches_no_remote_url() -> None:
@@ -94,18 +105,21 @@ def test_get_squash_merged_branches_matching_rules() -> None:
     git = MagicMock(spec=GitOperations)
     git.get_remote_url.return_value = "https://github.com/owner/repo.git"
     git.parse_github_repo.return_value = ("owner", "repo")
-    git.get_local_branches.return_value = [
-        "main",
-        "develop",
-        "feat-eq",
-        "feat-old",
-        "feat-newer",
-        "feat-diverged",
-        "feat-not-in-pr",
-        "feat-missing-sha",
-        "feat-no-pr-sha",
-    ]
-    git.get_current_branch.return_value = "develop"
+    # feat-missing-sha was deleted after the snapshot listing was taken
+    git.get_branch_snapshot.return_value = make_snapshot(
+        {
+            "main": "sha-main",
+            "develop": "sha-dev",
+            "feat-eq": "sha1",
+            "feat-old": "sha-old",
+            "feat-newer": "sha-new",
+            "feat-diverged": "sha-div",
+            "feat-not-in-pr": "sha-x",
+            "feat-missing-sha": "",
+            "feat-no-pr-sha": "sha-y",
+        },
+        current="develop",
+    )
 
     merged_prs = {
         "feat-eq": "sha1",
@@ -116,23 +130,14 @@ def test_get_squash_merged_branches_matching_rules() -> None:
         "feat-missing-sha": "sha5",
     }
 
-    def branch_sha(repo_path: Path, branch: str) -> str | None:
-        return {
-            "feat-eq": "sha1",
-            "feat-old": "sha-old",
-            "feat-newer": "sha-new",
-            "feat-diverged": "sha-div",
-            "feat-missing-sha": None,
-        }.get(branch)
+    def classify_ancestry(repo_path: Path, pairs: dict[str, tuple[str, str]], base_branch: str) -> dict[str, Ancestry]:
+        relations = {
+            ("sha-old", "sha2"): Ancestry.OLDER,
+            ("sha-new", "sha3"): Ancestry.NEWER,
+        }
+        return {branch: relations.get(pair, Ancestry.DIVERGED) for branch, pair in pairs.items()}
 
-    def is_ancestor(repo_path: Path, ancestor_sha: str, descendant_ref: str) -> bool:
-        return (ancestor_sha, descendant_ref) == ("sha-old", "sha2") or (
-            ancestor_sha,
-            descendant_ref,
-        ) == ("sha3", "sha-new")
-
-    git.get_branch_sha.side_effect = branch_sha
-    git.is_ancestor.side_effect = is_ancestor
+    git.classify_ancestry.side_effect = classify_ancestry
 
     mock_client = MagicMock()
     mock_client.get_merged_pull_requests.return_value = merged_prs
@@ -151,4 +156,109 @@ def test_get_squash_merged_branches_matching_rules() -> None:
         )
 
     assert result == ["feat-eq", "feat-old"]
-    mock_client_cls.assert_called_once_with(token="token", verify_ssl=False)
+    git.get_branch_snapshot.assert_called_once_with(Path("repo"), "main")
+    git.get_branch_sha.assert_not_called()
+    # Equal SHAs need no git call; the rest are classified together
+    git.classify_ancestry.assert_called_once_with(
+        Path("repo"),
+        {"feat-old": ("sha-old", "sha2"), "feat-newer": ("sha-new", "sha3"), "feat-diverged": ("sha-div", "sha4")},
+        "main",
+    )
+    git.is_ancestor.assert_not_called()
+    mock_client_cls.assert_called_once_with(token="token", verify_ssl=False, rate_limit=None, pr_store=None)
+
+
+def test_get_squash_merged_branches_low_rate_limit() -> None:
+    """Test squash detection is skipped when the API budget is nearly exhausted."""
+    git = MagicMock()
+    git.get_remote_url.return_value = "https://github.com/owner/repo.git"
+    git.parse_github_repo.return_value = ("owner", "repo")
+    rate_limit = RateLimitScheduler(low_watermark=100)
+    rate_limit.update({"x-ratelimit-remaining": "50", "x-ratelimit-reset": "0"})
+    warn = MagicMock()
+
+    with patch("setup_repo.core.branch_cleanup.GitHubClient") as mock_client_cls:
+        result = get_squash_merged_branches(
+            git,
+            Path("repo"),
+            "main",
+            github_token="token",
+            git_ssl_no_verify=False,
+            warn=warn,
+            rate_limit=rate_limit,
+        )
+
+    assert result == []
+    mock_client_cls.assert_not_called()
+    warn.assert_called_once()
+
+
+def test_get_squash_merged_branches_shared_client() -> None:
+    """Test a shared client is used as-is and left open."""
+    git = MagicMock()
+    git.get_remote_url.return_value = "https://github.com/owner/repo.git"
+    git.parse_github_repo.return_value = ("owner", "repo")
+    git.get_branch_snapshot.return_value = make_snapshot({"main": "sha0", "feature": "sha1"}, current="main")
+    client = MagicMock()
+    client.rate_limit = RateLimitScheduler()
+    client.get_merged_pull_requests.return_value = {"feature": "sha1"}
+
+    with patch("setup_repo.core.branch_cleanup.GitHubClient") as mock_client_cls:
+        result = get_squash_merged_branches(
+            git,
+            Path("repo"),
+            "main",
+            github_token="token",
+            git_ssl_no_verify=False,
+            client=client,
+        )
+
+    assert result == ["feature"]
+    mock_client_cls.assert_not_called()
+    client.close.assert_not_called()
+    client.__exit__.assert_not_called()
+
+
+def test_get_squash_merged_branches_prefetched() -> None:
+    """Test pre-fetched merged PRs skip the GitHub API entirely."""
+    git = MagicMock()
+    snapshot = make_snapshot({"main": "sha0", "feature": "sha1", "other": "sha2"}, current="main")
+
+    with patch("setup_repo.core.branch_cleanup.GitHubClient") as mock_client_cls:
+        result = get_squash_merged_branches(
+            git,
+            Path("repo"),
+            "main",
+            github_token=None,
+            git_ssl_no_verify=False,
+            merged_prs={"feature": "sha1"},
+            snapshot=snapshot,
+        )
+
+    assert result == ["feature"]
+    mock_client_cls.assert_not_called()
+    git.get_remote_url.assert_not_called()
+    git.get_branch_snapshot.assert_not_called()
+
+
+def test_build_merged_pr_query() -> None:
+    """Test the query lists local branches except the base and current ones."""
+    git = MagicMock()
+    git.get_remote_url.return_value = "git@github.com:owner/repo.git"
+    git.parse_github_repo.return_value = ("owner", "repo")
+    git.get_branch_snapshot.return_value = make_snapshot(
+        {"main": "sha0", "work": "sha1", "feat-a": "sha2", "feat-b": "sha3"}, current="work"
+    )
+
+    query = build_merged_pr_query(git, Path("repo"), "main")
+
+    assert query == MergedPRQuery("owner", "repo", "main", ("feat-a", "feat-b"))
+
+
+def test_build_merged_pr_query_not_github() -> None:
+    """Test non-GitHub remotes produce no query."""
+    git = MagicMock()
+    git.get_remote_url.return_value = "https://gitlab.com/owner/repo.git"
+    git.parse_github_repo.return_value = None
+
+    assert build_merged_pr_query(git, Path("repo"), "main") is None
@@ -1,18 +1,30 @@
 """Tests for CLI."""
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 from typer.testing import CliRunner
 
 from setup_repo.cli.app import app
+from setup_repo.core.git_branch import BranchInfo, BranchSnapshot
+from setup_repo.core.inventory import RepositoryInventory
 from setup_repo.models.repository import Repository
 from setup_repo.models.result import ProcessResult, ResultStatus, SyncSummary
 
 runner = CliRunner()
 
 
+def branch_snapshot(*, merged: tuple[str, ...] = (), others: tuple[str, ...] = ()) -> BranchSnapshot:
+    """Build a snapshot of main plus merged and unmerged branches."""
+    branches = {"main": BranchInfo(name="main", sha="0" * 40, is_head=True, merged=True)}
+    for i, name in enumerate((*merged, *others), start=1):
+        branches[name] = BranchInfo(name=name, sha=f"{i:040x}", merged=name in merged)
+    return BranchSnapshot(base_branch="main", branches=branches)
+
+
 class TestAppCallback:
     """Tests for main app callback."""
 
@@ -49,6 +61,9 @@ class TestSyncCommand:
             git_ssl_no_verify=False,
             auto_cleanup=False,
             auto_cleanup_include_squash=False,
+            maintenance_after_sync=False,
+            fetch_scope="all",
+            fetch_prune="always",
         )
 
         result = runner.invoke(app, ["sync"])
@@ -73,21 +88,29 @@ class TestSyncCommand:
             github_owner="test-user",
             github_token="token",
             workspace_dir=tmp_path,
+            cache_dir=tmp_path / "cache",
             git_ssl_no_verify=False,
             use_https=True,
             auto_cleanup=False,
             auto_cleanup_include_squash=False,
+            maintenance_after_sync=False,
+            fetch_scope="all",
+            fetch_prune="always",
         )
 
         mock_client = MagicMock()
-        mock_client.get_repositories.return_value = [
-            Repository(
-                name="repo1",
-                full_name="test-user/repo1",
-                clone_url="https://github.com/test-user/repo1.git",
-                ssh_url="git@github.com:test-user/repo1.git",
-            ),
-        ]
+        mock_client.iter_repository_pages.return_value = iter(
+            [
+                [
+                    Repository(
+                        name="repo1",
+                        full_name="test-user/repo1",
+                        clone_url="https://github.com/test-user/repo1.git",
+                        ssh_url="git@github.com:test-user/repo1.git",
+                    ),
+                ]
+            ]
+        )
         mock_client_class.return_value = mock_client
 
         mock_processor = MagicMock()
@@ -123,13 +146,17 @@ class TestSyncCommand:
             github_owner="test-user",
             github_token="token",
             workspace_dir=tmp_path,
+            cache_dir=tmp_path / "cache",
             git_ssl_no_verify=False,
             auto_cleanup=False,
             auto_cleanup_include_squash=False,
+            maintenance_after_sync=False,
+            fetch_scope="all",
+            fetch_prune="always",
         )
 
         mock_client = MagicMock()
-        mock_client.get_repositories.return_value = []
+        mock_client.iter_repository_pages.return_value = iter([])
         mock_client_class.return_value = mock_client
 
         result = runner.invoke(app, ["sync"])
@@ -149,20 +176,28 @@ class TestSyncCommand:
             github_owner="test-user",
             github_token="token",
             workspace_dir=tmp_path,
+            cache_dir=tmp_path / "cache",
             git_ssl_no_verify=False,
             auto_cleanup=False,
             auto_cleanup_include_squash=False,
+            maintenance_after_sync=False,
+            fetch_scope="all",
+            fetch_prune="always",
         )
 
         mock_client = MagicMock()
-        mock_client.get_repositories.return_value = [
-            Repository(
-                name="repo1",
-                full_name="test-user/repo1",
-                clone_url="https://github.com/test-user/repo1.git",
-                ssh_url="git@github.com:test-user/repo1.git",
-            ),
-        ]
+        mock_client.iter_repository_pages.return_value = iter(
+            [
+                [
+                    Repository(
+                        name="repo1",
+                        full_name="test-user/repo1",
+                        clone_url="https://github.com/test-user/repo1.git",
+                        ssh_url="git@github.com:test-user/repo1.git",
+                    ),
+                ]
+            ]
+        )
         mock_client_class.return_value = mock_client
 
         result = runner.invoke(app, ["sync", "--dry-run"])
@@ -189,21 +224,29 @@ class TestSyncCommand:
             github_owner="test-user",
             github_token="token",
             workspace_dir=tmp_path,
+            cache_dir=tmp_path / "cache",
             git_ssl_no_verify=False,
             use_https=True,
             auto_cleanup=True,
             auto_cleanup_include_squash=False,
+            maintenance_after_sync=False,
+            fetch_scope="all",
+            fetch_prune="always",
         )
 
         mock_client = MagicMock()
-        mock_client.get_repositories.return_value = [
-            Repository(
-                name="repo1",
-                full_name="test-user/repo1",
-                clone_url="https://github.com/test-user/repo1.git",
-                ssh_url="git@github.com:test-user/repo1.git",
-            ),
-        ]
+        mock_client.iter_repository_pages.return_value = iter(
+            [
+                [
+                    Repository(
+                        name="repo1",
+                        full_name="test-user/repo1",
+                        clone_url="https://github.com/test-user/repo1.git",
+                        ssh_url="git@github.com:test-user/repo1.git",
+                    ),
+                ]
+            ]
+        )
         mock_client_class.return_value = mock_client
 
         mock_git = MagicMock()
@@ -212,17 +255,17 @@ class TestSyncCommand:
             status=ResultStatus.SUCCESS,
             message="Pulled",
         )
-        mock_git.get_merged_branches.return_value = ["feature/merged"]
-        mock_git.delete_branch.return_value = True
+        mock_git.get_branch_snapshot.return_value = branch_snapshot(merged=("feature/merged",))
+        mock_git.delete_branches.side_effect = lambda path, branches, force: dict.fromkeys(branches, True)
         mock_git_class.return_value = mock_git
 
         def process_side_effect(
-            paths: list[Path],
+            paths: Iterable[Path],
             func: Callable[[Path], ProcessResult],
             desc: str | None = None,
         ) -> SyncSummary:
             _ = desc
-            results = [func(paths[0])]
+            results = [func(next(iter(paths)))]
             return SyncSummary(
                 total=1,
                 success=1,
@@ -238,8 +281,407 @@ class TestSyncCommand:
 
         result = runner.invoke(app, ["sync"])
         assert result.exit_code == 0
-        mock_git.get_merged_branches.assert_called_once()
-        mock_git.delete_branch.assert_called_once_with(repo_path, "feature/merged", force=False)
+        mock_git.get_branch_snapshot.assert_called_once_with(repo_path, "main")
+        mock_git.delete_branches.assert_called_once_with(repo_path, {"feature/merged": f"{1:040x}"}, force=False)
+
+    @patch("setup_repo.cli.commands.sync.ParallelProcessor")
+    @patch("setup_repo.cli.commands.sync.GitOperations")
+    @patch("setup_repo.cli.commands.sync.GitHubClient")
+    @patch("setup_repo.cli.commands.sync.get_settings")
+    def test_sync_auto_cleanup_batched_squash(
+        self,
+        mock_settings: MagicMock,
+        mock_client_class: MagicMock,
+        mock_git_class: MagicMock,
+        mock_processor_class: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test squash detection resolves merged PRs in one batch after syncing."""
+        repo_path = tmp_path / "repo1"
+        (repo_path / ".git").mkdir(parents=True)
+
+        mock_settings.return_value = MagicMock(
+            github_owner="test-user",
+            github_token="token",
+            workspace_dir=tmp_path,
+            cache_dir=tmp_path / "cache",
+            git_ssl_no_verify=False,
+            use_https=True,
+            auto_cleanup=True,
+            auto_cleanup_include_squash=True,
+            maintenance_after_sync=False,
+            fetch_scope="all",
+            fetch_prune="always",
+            auto_cleanup_squash_batch=True,
+            github_max_connections=4,
+            github_http2=False,
+        )
+
+        mock_client = MagicMock()
+        mock_client.iter_repository_pages.return_value = iter(
+            [
+                [
+                    Repository(
+                        name="repo1",
+                        full_name="test-user/repo1",
+                        clone_url="https://github.com/test-user/repo1.git",
+                        ssh_url="git@github.com:test-user/repo1.git",
+                    ),
+                ]
+            ]
+        )
+        mock_client.get_merged_pull_requests_batch.side_effect = lambda queries: {
+            query: {"feature/squashed": f"{1:040x}"} for query in queries
+        }
+        mock_client_class.return_value = mock_client
+
+        mock_git = MagicMock()
+        mock_git.pull.return_value = ProcessResult(repo_name="repo1", status=ResultStatus.SUCCESS, message="Pulled")
+        mock_git.get_remote_url.return_value = "https://github.com/test-user/repo1.git"
+        mock_git.parse_github_repo.return_value = ("test-user", "repo1")
+        snapshot = branch_snapshot(others=("feature/squashed",))
+        mock_git.get_branch_snapshot.return_value = snapshot
+        mock_git.delete_branches.side_effect = lambda path, branches, force: dict.fromkeys(branches, True)
+        mock_git_class.return_value = mock_git
+
+        def process_side_effect(
+            paths: Iterable[Path],
+            func: Callable[[Path], ProcessResult],
+            desc: str | None = None,
+        ) -> SyncSummary:
+            _ = desc
+            results = [func(next(iter(paths)))]
+            # Cleanup is deferred until every repository is synced
+            mock_git.delete_branches.assert_not_called()
+            return SyncSummary(total=1, success=1, failed=0, skipped=0, duration=1.0, results=results)
+
+        mock_processor = MagicMock()
+        mock_processor.process.side_effect = process_side_effect
+        mock_processor_class.return_value = mock_processor
+
+        result = runner.invoke(app, ["sync"])
+        assert result.exit_code == 0
+        mock_client.get_merged_pull_requests_batch.assert_called_once()
+        mock_client.get_merged_pull_requests.assert_not_called()
+        # One snapshot per repository serves both the query and the cleanup
+        mock_git.get_branch_snapshot.assert_called_once_with(repo_path, "main")
+        mock_git.delete_branches.assert_called_once_with(repo_path, {"feature/squashed": f"{1:040x}"}, force=True)
+
+    @staticmethod
+    def _settings(tmp_path: Path) -> MagicMock:
+        return MagicMock(
+            github_owner="test-user",
+            github_token="token",
+            workspace_dir=tmp_path,
+            cache_dir=tmp_path / "cache",
+            git_ssl_no_verify=False,
+            use_https=True,
+            auto_cleanup=False,
+            auto_cleanup_include_squash=False,
+            maintenance_after_sync=False,
+            fetch_scope="all",
+            fetch_prune="always",
+            mirror_dir=None,
+        )
+
+    @staticmethod
+    def _summary() -> SyncSummary:
+        return SyncSummary(total=1, success=1, failed=0, skipped=0, duration=1.0, results=[])
+
+    @patch("setup_repo.cli.commands.sync.ParallelProcessor")
+    @patch("setup_repo.cli.commands.sync.GitOperations")
+    @patch("setup_repo.cli.commands.sync.GitHubClient")
+    @patch("setup_repo.cli.commands.sync.get_settings")
+    def test_sync_saves_inventory_and_runs_offline(
+        self,
+        mock_settings: MagicMock,
+        mock_client_class: MagicMock,
+        mock_git_class: MagicMock,
+        mock_processor_class: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test a complete listing is saved and reused with --offline."""
+        mock_settings.return_value = self._settings(tmp_path)
+        repo = Repository(
+            name="repo1",
+            full_name="test-user/repo1",
+            clone_url="https://github.com/test-user/repo1.git",
+            ssh_url="git@github.com:test-user/repo1.git",
+        )
+        mock_client_class.return_value.iter_repository_pages.return_value = iter([[repo]])
+        processed: list[list[Path]] = []
+
+        def process_side_effect(
+            paths: Iterable[Path],
+            func: Callable[[Path], ProcessResult],
+            desc: str | None = None,
+        ) -> SyncSummary:
+            processed.append(list(paths))
+            return self._summary()
+
+        mock_processor_class.return_value.process.side_effect = process_side_effect
+
+        assert runner.invoke(app, ["sync"]).exit_code == 0
+        mock_client_class.reset_mock()
+
+        result = runner.invoke(app, ["sync", "--offline"])
+
+        assert result.exit_code == 0
+        mock_client_class.assert_not_called()
+        assert processed == [[tmp_path / "repo1"], [tmp_path / "repo1"]]
+
+    @patch("setup_repo.cli.commands.sync.SshMultiplexer")
+    @patch("setup_repo.cli.commands.sync.ParallelProcessor")
+    @patch("setup_repo.cli.commands.sync.GitOperations")
+    @patch("setup_repo.cli.commands.sync.GitHubClient")
+    @patch("setup_repo.cli.commands.sync.get_settings")
+    def test_sync_shares_ssh_connections(
+        self,
+        mock_settings: MagicMock,
+        mock_client_class: MagicMock,
+        mock_git_class: MagicMock,
+        mock_processor_class: MagicMock,
+        mock_ssh_class: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test SSH masters are opened before the repositories are synced and closed afterwards."""
+        settings = self._settings(tmp_path)
+        settings.use_https = False
+        settings.ssh_connections = 3
+        mock_settings.return_value = settings
+        mock_client_class.return_value.iter_repository_pages.return_value = iter(
+            [
+                [
+                    Repository(
+                        name="repo1",
+                        full_name="test-user/repo1",
+                        clone_url="https://github.com/test-user/repo1.git",
+                        ssh_url="git@github.com:test-user/repo1.git",
+                    )
+                ]
+            ]
+        )
+        ssh = mock_ssh_class.return_value
+        mock_processor_class.return_value.process.side_effect = lambda *args, **kwargs: (
+            ssh.start.assert_called_once() or self._summary()
+        )
+
+        result = runner.invoke(app, ["sync"])
+
+        assert result.exit_code == 0
+        mock_ssh_class.assert_called_once_with(connections=3)
+        assert mock_git_class.call_args.kwargs["ssh"] is ssh
+        ssh.stop.assert_called_once()
+
+    @patch("setup_repo.cli.commands.sync.GitHubClient")
+    @patch("setup_repo.cli.commands.sync.get_settings")
+    def test_sync_offline_without_inventory(
+        self,
+        mock_settings: MagicMock,
+        mock_client_class: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test --offline fails clearly when nothing was saved yet."""
+        mock_settings.return_value = self._settings(tmp_path)
+
+        result = runner.invoke(app, ["sync", "--offline"])
+
+        assert result.exit_code == 1
+        assert "inventory" in result.stdout
+        mock_client_class.assert_not_called()
+
+    @patch("setup_repo.cli.commands.sync.ParallelProcessor")
+    @patch("setup_repo.cli.commands.sync.GitOperations")
+    @patch("setup_repo.cli.commands.sync.GitHubClient")
+    @patch("setup_repo.cli.commands.sync.get_settings")
+    def test_sync_falls_back_to_inventory(
+        self,
+        mock_settings: MagicMock,
+        mock_client_class: MagicMock,
+        mock_git_class: MagicMock,
+        mock_processor_class: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test an unreachable API falls back to the saved inventory."""
+        mock_settings.return_value = self._settings(tmp_path)
+        RepositoryInventory(tmp_path / "cache" / "inventory").save(
+            "test-user",
+            [
+                Repository(
+                    name="repo1",
+                    full_name="test-user/repo1",
+                    clone_url="https://github.com/test-user/repo1.git",
+                    ssh_url="git@github.com:test-user/repo1.git",
+                )
+            ],
+        )
+        mock_client_class.return_value.iter_repository_pages.side_effect = httpx.ConnectError("unreachable")
+        processed: list[Path] = []
+
+        def process_side_effect(
+            paths: Iterable[Path],
+            func: Callable[[Path], ProcessResult],
+            desc: str | None = None,
+        ) -> SyncSummary:
+            processed.extend(paths)
+            return self._summary()
+
+        mock_processor_class.return_value.process.side_effect = process_side_effect
+
+        result = runner.invoke(app, ["sync"])
+
+        assert result.exit_code == 0
+        assert "unavailable" in result.stdout
+        assert processed == [tmp_path / "repo1"]
+
+    @patch("setup_repo.cli.commands.sync.ParallelProcessor")
+    @patch("setup_repo.cli.commands.sync.GitOperations")
+    @patch("setup_repo.cli.commands.sync.GitHubClient")
+    @patch("setup_repo.cli.commands.sync.get_settings")
+    def test_sync_skips_unchanged_repositories(
+        self,
+        mock_settings: MagicMock,
+        mock_client_class: MagicMock,
+        mock_git_class: MagicMock,
+        mock_processor_class: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test repositories whose pushed_at did not move are not pulled again."""
+        mock_settings.return_value = self._settings(tmp_path)
+        (tmp_path / "repo1").mkdir()
+        repo = Repository(
+            name="repo1",
+            full_name="test-user/repo1",
+            clone_url="https://github.com/test-user/repo1.git",
+            ssh_url="git@github.com:test-user/repo1.git",
+            pushed_at=datetime(2024, 1, 1, tzinfo=UTC),
+        )
+        mock_client = mock_client_class.return_value
+        mock_git = mock_git_class.return_value
+        mock_git.pull.return_value = ProcessResult(repo_name="repo1", status=ResultStatus.SUCCESS)
+        results: list[ProcessResult] = []
+
+        def process_side_effect(
+            paths: Iterable[Path],
+            func: Callable[[Path], ProcessResult],
+            desc: str | None = None,
+        ) -> SyncSummary:
+            results.extend(func(path) for path in paths)
+            return SyncSummary.from_results(results[-1:], 1.0)
+
+        mock_processor_class.return_value.process.side_effect = process_side_effect
+
+        for args in (["sync"], ["sync"], ["sync", "--full"]):
+            mock_client.iter_repository_pages.return_value = iter([[repo]])
+            assert runner.invoke(app, args).exit_code == 0
+
+        assert [r.status for r in results] == [ResultStatus.SUCCESS, ResultStatus.SKIPPED, ResultStatus.SUCCESS]
+        assert results[1].message == "up to date"
+        assert mock_git.pull.call_count == 2
+
+        # A new push makes the repository eligible again
+        mock_client.iter_repository_pages.return_value = iter(
+            [[repo.model_copy(update={"pushed_at": datetime(2024, 1, 2, tzinfo=UTC)})]]
+        )
+        assert runner.invoke(app, ["sync"]).exit_code == 0
+        assert results[-1].status == ResultStatus.SUCCESS
+
+    @patch("setup_repo.cli.commands.sync.get_settings")
+    def test_sync_unknown_engine(self, mock_settings: MagicMock, tmp_path: Path) -> None:
+        """Test an unknown --engine is rejected."""
+        mock_settings.return_value = self._settings(tmp_path)
+
+        result = runner.invoke(app, ["sync", "--engine", "fibers"])
+
+        assert result.exit_code == 1
+        assert "Unknown engine" in result.stdout
+
+    @staticmethod
+    def _async_settings(tmp_path: Path) -> MagicMock:
+        settings = TestSyncCommand._settings(tmp_path)
+        settings.max_workers = 2
+        settings.max_concurrency = 8
+        settings.inventory_backend = "rest"
+        settings.http_cache = False
+        return settings
+
+    @patch("setup_repo.cli.commands.sync.AsyncGitOperations")
+    @patch("setup_repo.cli.commands.sync.AsyncGitHubClient")
+    @patch("setup_repo.cli.commands.sync.get_settings")
+    def test_sync_async_engine(
+        self,
+        mock_settings: MagicMock,
+        mock_client_class: MagicMock,
+        mock_git_class: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test --engine async lists, clones and pulls on one event loop."""
+        mock_settings.return_value = self._async_settings(tmp_path)
+        (tmp_path / "repo1").mkdir()
+        repos = [
+            Repository(
+                name=name,
+                full_name=f"test-user/{name}",
+                clone_url=f"https://github.com/test-user/{name}.git",
+                ssh_url=f"git@github.com:test-user/{name}.git",
+                pushed_at=datetime(2024, 1, 1, tzinfo=UTC),
+            )
+            for name in ("repo1", "repo2")
+        ]
+        mock_client = mock_client_class.return_value
+        mock_client.__aenter__.return_value = mock_client
+        mock_client.get_repositories = AsyncMock(return_value=repos)
+        mock_git = mock_git_class.return_value
+        mock_git.pull = AsyncMock(return_value=ProcessResult(repo_name="repo1", status=ResultStatus.SUCCESS))
+        mock_git.clone = AsyncMock(return_value=ProcessResult(repo_name="repo2", status=ResultStatus.SUCCESS))
+
+        result = runner.invoke(app, ["sync", "--engine", "async"])
+
+        assert result.exit_code == 0
+        mock_git.pull.assert_awaited_once_with(tmp_path / "repo1", check_remote_head=False)
+        mock_git.clone.assert_awaited_once_with(
+            "https://github.com/test-user/repo2.git", tmp_path / "repo2", "main", reference=None
+        )
+        saved = RepositoryInventory(tmp_path / "cache" / "inventory").load("test-user")
+        assert saved is not None
+        assert [repo.name for repo in saved.repositories] == ["repo1", "repo2"]
+
+    @patch("setup_repo.cli.commands.sync.AsyncGitOperations")
+    @patch("setup_repo.cli.commands.sync.AsyncGitHubClient")
+    @patch("setup_repo.cli.commands.sync.get_settings")
+    def test_sync_async_engine_falls_back_to_inventory(
+        self,
+        mock_settings: MagicMock,
+        mock_client_class: MagicMock,
+        mock_git_class: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test the async engine uses the saved inventory when the API fails."""
+        settings = self._async_settings(tmp_path)
+        settings.sync_engine = "async"
+        mock_settings.return_value = settings
+        RepositoryInventory(tmp_path / "cache" / "inventory").save(
+            "test-user",
+            [
+                Repository(
+                    name="repo1",
+                    full_name="test-user/repo1",
+                    clone_url="https://github.com/test-user/repo1.git",
+                    ssh_url="git@github.com:test-user/repo1.git",
+                )
+            ],
+        )
+        mock_client = mock_client_class.return_value
+        mock_client.__aenter__.return_value = mock_client
+        mock_client.get_repositories = AsyncMock(side_effect=httpx.ConnectError("unreachable"))
+        mock_git = mock_git_class.return_value
+        mock_git.clone = AsyncMock(return_value=ProcessResult(repo_name="repo1", status=ResultStatus.SUCCESS))
+
+        result = runner.invoke(app, ["sync"])
+
+        assert result.exit_code == 0
+        assert "unavailable" in result.stdout
+        mock_git.clone.assert_awaited_once()
 
 
 class TestCleanupCommand:
@@ -268,7 +710,7 @@ class TestCleanupCommand:
         (tmp_path / ".git").mkdir()
 
         mock_git = MagicMock()
-        mock_git.get_merged_branches.return_value = []
+        mock_git.get_branch_snapshot.return_value = branch_snapshot()
         mock_git_class.return_value = mock_git
 
         result = runner.invoke(app, ["cleanup", str(tmp_path)])
@@ -285,7 +727,7 @@ class TestCleanupCommand:
         (tmp_path / ".git").mkdir()
 
         mock_git = MagicMock()
-        mock_git.get_merged_branches.return_value = ["feature/done", "bugfix/fixed"]
+        mock_git.get_branch_snapshot.return_value = branch_snapshot(merged=("feature/done", "bugfix/fixed"))
         mock_git_class.return_value = mock_git
 
         result = runner.invoke(app, ["cleanup", str(tmp_path), "--dry-run"])
@@ -302,13 +744,14 @@ class TestCleanupCommand:
         (tmp_path / ".git").mkdir()
 
         mock_git = MagicMock()
-        mock_git.get_merged_branches.return_value = ["feature/done"]
-        mock_git.delete_branch.return_value = True
+        mock_git.get_branch_snapshot.return_value = branch_snapshot(merged=("feature/done",))
+        mock_git.delete_branches.side_effect = lambda path, branches, force: dict.fromkeys(branches, True)
         mock_git_class.return_value = mock_git
 
         result = runner.invoke(app, ["cleanup", str(tmp_path), "--force"])
         assert result.exit_code == 0
-        assert "deleted" in result.stdout
+        assert "1/1 branch(es) deleted" in result.stdout
+        mock_git.delete_branches.assert_called_once_with(tmp_path, {"feature/done": f"{1:040x}"}, force=False)
 
     @patch("setup_repo.cli.commands.cleanup.get_squash_merged_branches")
     @patch("setup_repo.cli.commands.cleanup.GitOperations")
@@ -322,7 +765,7 @@ class TestCleanupCommand:
         (tmp_path / ".git").mkdir()
 
         mock_git = MagicMock()
-        mock_git.get_merged_branches.return_value = ["feature/merged"]
+        mock_git.get_branch_snapshot.return_value = branch_snapshot(merged=("feature/merged",))
         mock_git_class.return_value = mock_git
 
         # Squash merged branches
@@ -337,6 +780,209 @@ class TestCleanupCommand:
         mock_get_squash.assert_called_once()
 
 
+class TestDeepenCommand:
+    """Tests for deepen command."""
+
+    @patch("setup_repo.cli.commands.deepen.GitOperations")
+    @patch("setup_repo.cli.commands.deepen.get_settings")
+    def test_deepen_all_repositories(
+        self,
+        mock_settings: MagicMock,
+        mock_git_class: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test every repository in the workspace is deepened."""
+        mock_settings.return_value = MagicMock(workspace_dir=tmp_path, git_ssl_no_verify=False)
+        for name in ("repo1", "repo2"):
+            (tmp_path / name / ".git").mkdir(parents=True)
+        (tmp_path / "not-a-repo").mkdir()
+        mock_git = mock_git_class.return_value
+        mock_git.deepen.side_effect = lambda path, depth: ProcessResult(
+            repo_name=path.name, status=ResultStatus.SUCCESS
+        )
+
+        result = runner.invoke(app, ["deepen", "--depth", "50"])
+
+        assert result.exit_code == 0
+        assert sorted(call.args for call in mock_git.deepen.call_args_list) == [
+            (tmp_path / "repo1", 50),
+            (tmp_path / "repo2", 50),
+        ]
+
+    @patch("setup_repo.cli.commands.deepen.GitOperations")
+    @patch("setup_repo.cli.commands.deepen.get_settings")
+    def test_deepen_named_repository(
+        self,
+        mock_settings: MagicMock,
+        mock_git_class: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test named repositories are unshallowed; unknown names are rejected."""
+        mock_settings.return_value = MagicMock(workspace_dir=tmp_path, git_ssl_no_verify=False)
+        (tmp_path / "repo1" / ".git").mkdir(parents=True)
+        mock_git = mock_git_class.return_value
+        mock_git.deepen.return_value = ProcessResult(repo_name="repo1", status=ResultStatus.SUCCESS)
+
+        result = runner.invoke(app, ["deepen", "repo1"])
+        assert result.exit_code == 0
+        mock_git.deepen.assert_called_once_with(tmp_path / "repo1", None)
+
+        result = runner.invoke(app, ["deepen", "missing"])
+        assert result.exit_code == 1
+        assert "missing" in result.stdout
+
+
+class TestMaintainCommand:
+    """Tests for maintain command."""
+
+    @patch("setup_repo.cli.commands.maintain.GitOperations")
+    @patch("setup_repo.cli.commands.maintain.get_settings")
+    def test_maintain_with_tasks_and_budget(
+        self,
+        mock_settings: MagicMock,
+        mock_git_class: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test the chosen tasks run in every repository under one deadline."""
+        mock_settings.return_value = MagicMock(workspace_dir=tmp_path, git_ssl_no_verify=False)
+        for name in ("repo1", "repo2"):
+            (tmp_path / name / ".git").mkdir(parents=True)
+        mock_git = mock_git_class.return_value
+        mock_git.maintain.side_effect = lambda path, tasks, deadline: ProcessResult(
+            repo_name=path.name, status=ResultStatus.SUCCESS
+        )
+
+        result = runner.invoke(
+            app, ["maintain", "--task", "commit-graph", "--task", "loose-objects", "--time-budget", "60"]
+        )
+
+        assert result.exit_code == 0
+        calls = sorted(mock_git.maintain.call_args_list, key=lambda call: call.args[0])
+        assert [call.args[0] for call in calls] == [tmp_path / "repo1", tmp_path / "repo2"]
+        assert all(call.args[1] == ["commit-graph", "loose-objects"] for call in calls)
+        assert calls[0].args[2] is not None
+        assert calls[0].args[2] == calls[1].args[2]
+
+    @patch("setup_repo.cli.commands.maintain.get_settings")
+    def test_maintain_unknown_task(self, mock_settings: MagicMock, tmp_path: Path) -> None:
+        """Test unknown tasks are rejected."""
+        mock_settings.return_value = MagicMock(workspace_dir=tmp_path, git_ssl_no_verify=False)
+
+        result = runner.invoke(app, ["maintain", "--task", "gc"])
+
+        assert result.exit_code == 1
+        assert "Unknown maintenance task: gc" in result.stdout
+
+    @patch("setup_repo.cli.commands.sync.ParallelProcessor")
+    @patch("setup_repo.cli.commands.sync.GitOperations")
+    @patch("setup_repo.cli.commands.sync.GitHubClient")
+    @patch("setup_repo.cli.commands.sync.get_settings")
+    def test_sync_runs_maintenance_afterwards(
+        self,
+        mock_settings: MagicMock,
+        mock_client_class: MagicMock,
+        mock_git_class: MagicMock,
+        mock_processor_class: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test sync disables auto gc and maintains the synced repositories at the end."""
+        settings = TestSyncCommand._settings(tmp_path)
+        settings.maintenance_after_sync = True
+        settings.maintenance_time_budget = 0
+        mock_settings.return_value = settings
+        (tmp_path / "repo1" / ".git").mkdir(parents=True)
+        mock_client_class.return_value.iter_repository_pages.return_value = iter(
+            [
+                [
+                    Repository(
+                        name="repo1",
+                        full_name="test-user/repo1",
+                        clone_url="https://github.com/test-user/repo1.git",
+                        ssh_url="git@github.com:test-user/repo1.git",
+                    )
+                ]
+            ]
+        )
+        mock_git = mock_git_class.return_value
+        mock_git.maintain.return_value = ProcessResult(repo_name="repo1", status=ResultStatus.SUCCESS)
+
+        def process(items: Iterable[Path], func: Callable[[Path], ProcessResult], desc: str) -> SyncSummary:
+            return SyncSummary.from_results([func(path) for path in items], duration=1.0)
+
+        mock_processor_class.return_value.process.side_effect = process
+        mock_git.pull.return_value = ProcessResult(repo_name="repo1", status=ResultStatus.SUCCESS)
+
+        result = runner.invoke(app, ["sync", "--full"])
+
+        assert result.exit_code == 0
+        assert mock_git_class.call_args_list[0].kwargs["auto_gc"] is False
+        mock_git.maintain.assert_called_once_with(
+            tmp_path / "repo1", ("loose-objects", "incremental-repack", "commit-graph"), None
+        )
+
+
+class TestMirrorCommand:
+    """Tests for mirror commands."""
+
+    @staticmethod
+    def _settings(tmp_path: Path, mirror_dir: Path | None) -> MagicMock:
+        return MagicMock(
+            github_owner="test-user",
+            github_token="token",
+            cache_dir=tmp_path / "cache",
+            mirror_dir=mirror_dir,
+            git_ssl_no_verify=False,
+            use_https=True,
+            inventory_backend="rest",
+            http_cache=False,
+        )
+
+    @patch("setup_repo.cli.commands.mirror.get_settings")
+    def test_update_requires_mirror_dir(self, mock_settings: MagicMock, tmp_path: Path) -> None:
+        """Test mirror update fails when no mirror directory is configured."""
+        mock_settings.return_value = self._settings(tmp_path, None)
+
+        result = runner.invoke(app, ["mirror", "update"])
+
+        assert result.exit_code == 1
+        assert "not configured" in result.stdout
+
+    @patch("setup_repo.core.mirror.MirrorCache.update")
+    @patch("setup_repo.cli.commands.sync.GitHubClient")
+    @patch("setup_repo.cli.commands.mirror.get_settings")
+    def test_update_all_repositories(
+        self,
+        mock_settings: MagicMock,
+        mock_client_class: MagicMock,
+        mock_update: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test every listed repository's mirror is updated and the listing saved."""
+        mock_settings.return_value = self._settings(tmp_path, tmp_path / "mirrors")
+        repos = [
+            Repository(
+                name=name,
+                full_name=f"test-user/{name}",
+                clone_url=f"https://github.com/test-user/{name}.git",
+                ssh_url=f"git@github.com:test-user/{name}.git",
+            )
+            for name in ("repo1", "repo2")
+        ]
+        mock_client_class.return_value.iter_repository_pages.return_value = iter([repos])
+        mock_update.side_effect = lambda full_name, url: ProcessResult(repo_name=full_name, status=ResultStatus.SUCCESS)
+
+        result = runner.invoke(app, ["mirror", "update"])
+
+        assert result.exit_code == 0
+        assert sorted(call.args for call in mock_update.call_args_list) == [
+            ("test-user/repo1", "https://github.com/test-user/repo1.git"),
+            ("test-user/repo2", "https://github.com/test-user/repo2.git"),
+        ]
+        saved = RepositoryInventory(tmp_path / "cache" / "inventory").load("test-user")
+        assert saved is not None
+        assert [repo.name for repo in saved.repositories] == ["repo1", "repo2"]
+
+
 class TestOutputHelpers:
     """Tests for output helper functions."""
 
@@ -76,6 +76,17 @@ class TestAppSettings:
         with pytest.raises(ValueError):
             AppSettings(github_owner="test", max_workers=33)
 
+    def test_max_concurrency_validation(self) -> None:
+        """Test the async engine allows far more concurrency than max_workers."""
+        settings = AppSettings(github_owner="test", max_concurrency=256)
+        assert settings.max_concurrency == 256
+
+        with pytest.raises(ValueError):
+            AppSettings(github_owner="test", max_concurrency=0)
+
+        with pytest.raises(ValueError):
+            AppSettings(github_owner="test", max_concurrency=257)
+
     def test_github_owner_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test github_owner from environment variable."""
         monkeypatch.setenv("GITHUB_USER", "env-user")
@@ -335,6 +346,197 @@ auto_cleanup_include_squash = true
         assert settings.auto_cleanup is True
         assert settings.auto_cleanup_include_squash is True
 
+    def test_cache_settings_from_toml(self, tmp_path: Path) -> None:
+        """Test cache settings load from the [cache] section."""
+        config_file = tmp_path / "config.toml"
+        config_file.write_text("""
+[cache]
+dir = "/toml/cache"
+http = false
+http_ttl = 3600
+http_max_mb = 10
+""")
+        with patch("setup_repo.models.config.get_config_path", return_value=config_file):
+            settings = AppSettings()
+
+        assert settings.cache_dir == Path("/toml/cache")
+        assert settings.http_cache is False
+        assert settings.http_cache_ttl == 3600
+        assert settings.http_cache_max_mb == 10
+
+    def test_mirror_dir_from_toml(self, tmp_path: Path) -> None:
+        """Test the mirror cache is disabled by default and loads from the [mirror] section."""
+        config_file = tmp_path / "config.toml"
+        with patch("setup_repo.models.config.get_config_path", return_value=config_file):
+            assert AppSettings().mirror_dir is None
+
+        config_file.write_text("""
+[mirror]
+dir = "~/mirrors"
+""")
+        with patch("setup_repo.models.config.get_config_path", return_value=config_file):
+            settings = AppSettings()
+
+        assert settings.mirror_dir == Path.home() / "mirrors"
+
+    def test_maintenance_settings_from_toml(self, tmp_path: Path) -> None:
+        """Test maintenance settings load from the [maintenance] section."""
+        config_file = tmp_path / "config.toml"
+        config_file.write_text("""
+[maintenance]
+after_sync = true
+time_budget = 600
+""")
+        with patch("setup_repo.models.config.get_config_path", return_value=config_file):
+            settings = AppSettings()
+
+        assert settings.maintenance_after_sync is True
+        assert settings.maintenance_time_budget == 600
+
+    def test_ssh_connections_from_toml(self, tmp_path: Path) -> None:
+        """Test shared SSH connections are off by default and load from the [git] section."""
+        config_file = tmp_path / "config.toml"
+        with patch("setup_repo.models.config.get_config_path", return_value=config_file):
+            assert AppSettings().ssh_connections == 0
+
+        config_file.write_text("""
+[git]
+ssh_connections = 4
+""")
+        with patch("setup_repo.models.config.get_config_path", return_value=config_file):
+            settings = AppSettings()
+
+        assert settings.ssh_connections == 4
+
+    def test_fetch_profile_from_toml(self, tmp_path: Path) -> None:
+        """Test the fetch profile loads from the [fetch] section and is validated."""
+        config_file = tmp_path / "config.toml"
+        config_file.write_text("""
+[fetch]
+scope = "branch"
+tags = false
+protocol_v2 = true
+prune = "on-change"
+""")
+        with patch("setup_repo.models.config.get_config_path", return_value=config_file):
+            settings = AppSettings()
+
+        assert settings.fetch_scope == "branch"
+        assert settings.fetch_tags is False
+        assert settings.fetch_protocol_v2 is True
+        assert settings.fetch_prune == "on-change"
+
+        config_file.write_text("""
+[fetch]
+prune = "never"
+""")
+        with (
+            patch("setup_repo.models.config.get_config_path", return_value=config_file),
+            pytest.raises(ValueError, match="prune"),
+        ):
+            AppSettings()
+
+    def test_inventory_backend_from_toml(self, tmp_path: Path) -> None:
+        """Test the inventory backend loads from the [github] section."""
+        config_file = tmp_path / "config.toml"
+        config_file.write_text("""
+[github]
+owner = "toml-owner"
+inventory = "graphql"
+""")
+        with patch("setup_repo.models.config.get_config_path", return_value=config_file):
+            settings = AppSettings()
+
+        assert settings.inventory_backend == "graphql"
+
+    def test_connection_settings_from_toml(self, tmp_path: Path) -> None:
+        """Test connection pool settings load from the [github] section."""
+        config_file = tmp_path / "config.toml"
+        config_file.write_text("""
+[github]
+owner = "toml-owner"
+max_connections = 8
+http2 = true
+""")
+        with patch("setup_repo.models.config.get_config_path", return_value=config_file):
+            settings = AppSettings()
+
+        assert settings.github_max_connections == 8
+        assert settings.github_http2 is True
+
+    def test_squash_batch_from_toml(self, tmp_path: Path) -> None:
+        """Test batched squash detection can be disabled from the [git] section."""
+        config_file = tmp_path / "config.toml"
+        config_file.write_text("""
+[git]
+auto_cleanup_squash_batch = false
+""")
+        with patch("setup_repo.models.config.get_config_path", return_value=config_file):
+            settings = AppSettings()
+
+        assert settings.auto_cleanup_squash_batch is False
+
+    def test_sync_engine_from_toml(self, tmp_path: Path) -> None:
+        """Test the sync engine and its concurrency load from the [workspace] section."""
+        config_file = tmp_path / "config.toml"
+        config_file.write_text("""
+[workspace]
+engine = "async"
+max_concurrency = 200
+""")
+        with patch("setup_repo.models.config.get_config_path", return_value=config_file):
+            settings = AppSettings()
+
+        assert settings.sync_engine == "async"
+        assert settings.max_concurrency == 200
+
+    def test_clone_strategy_from_toml(self, tmp_path: Path) -> None:
+        """Test the clone strategy loads from the [workspace] section and is validated."""
+        config_file = tmp_path / "config.toml"
+        config_file.write_text("""
+[workspace]
+clone_strategy = "blobless"
+""")
+        with patch("setup_repo.models.config.get_config_path", return_value=config_file):
+            assert AppSettings().clone_strategy == "blobless"
+
+        config_file.write_text("""
+[workspace]
+clone_strategy = "sparse"
+""")
+        with (
+            patch("setup_repo.models.config.get_config_path", return_value=config_file),
+            pytest.raises(ValueError, match="clone_strategy"),
+        ):
+            AppSettings()
+
+    def test_invalid_sync_engine_from_toml(self, tmp_path: Path) -> None:
+        """Test an unknown sync engine is rejected."""
+        config_file = tmp_path / "config.toml"
+        config_file.write_text("""
+[workspace]
+engine = "fibers"
+""")
+        with (
+            patch("setup_repo.models.config.get_config_path", return_value=config_file),
+            pytest.raises(ValueError, match="engine"),
+        ):
+            AppSettings()
+
+    def test_invalid_inventory_backend_from_toml(self, tmp_path: Path) -> None:
+        """Test an unknown inventory backend is rejected."""
+        config_file = tmp_path / "config.toml"
+        config_file.write_text("""
+[github]
+owner = "toml-owner"
+inventory = "gql"
+""")
+        with (
+            patch("setup_repo.models.config.get_config_path", return_value=config_file),
+            pytest.raises(ValueError, match="inventory"),
+        ):
+            AppSettings()
+
     def test_env_overrides_toml(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test environment variables override TOML settings."""
         config_file = tmp_path / "config.toml"
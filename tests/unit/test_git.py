@@ -1,10 +1,23 @@
 """Tests for Git operations."""
 
+import os
 import subprocess
+import time
+from collections.abc import Callable
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from setup_repo.core.git import GitOperations
+from setup_repo.core.git_branch import Ancestry, RefResolver
+from setup_repo.core.git_operations import (
+    CloneStrategy,
+    FetchProfile,
+    FetchScope,
+    MaintenanceTask,
+    PruneMode,
+)
 from setup_repo.models.result import ResultStatus
 
 
@@ -54,6 +67,28 @@ class TestGitOperations:
         assert env is not None
         assert env.get("GIT_SSL_NO_VERIFY") == "1"
 
+    def test_get_env_without_auto_gc(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test disabling auto gc appends to config already passed through the environment."""
+        monkeypatch.setenv("GIT_CONFIG_COUNT", "1")
+        monkeypatch.setenv("GIT_CONFIG_KEY_0", "user.name")
+        monkeypatch.setenv("GIT_CONFIG_VALUE_0", "test")
+
+        env = GitOperations(auto_gc=False)._get_env()
+
+        assert env is not None
+        assert env["GIT_CONFIG_COUNT"] == "3"
+        assert env["GIT_CONFIG_KEY_0"] == "user.name"
+        config = {env[f"GIT_CONFIG_KEY_{i}"]: env[f"GIT_CONFIG_VALUE_{i}"] for i in (1, 2)}
+        assert config == {"gc.auto": "0", "maintenance.auto": "false"}
+
+    def test_auto_gc_disabled_for_git(self, tmp_path: Path) -> None:
+        """Test git itself sees gc.auto=0 when auto gc is disabled."""
+        init_repo(tmp_path)
+
+        result = GitOperations(auto_gc=False)._run(["config", "gc.auto"], cwd=tmp_path)
+
+        assert result.stdout.strip() == "0"
+
 
 class TestClone:
     """Tests for clone method."""
@@ -109,6 +144,223 @@ class TestClone:
         assert "timed out" in (result.error or "")
 
 
+class TestCloneStrategy:
+    """Tests for clone strategies and deepening shallow clones."""
+
+    @pytest.mark.parametrize(
+        ("strategy", "expected"),
+        [
+            (CloneStrategy.SHALLOW, ["--depth", "1"]),
+            (CloneStrategy.BLOBLESS, ["--filter=blob:none"]),
+            (CloneStrategy.TREELESS, ["--filter=tree:0"]),
+            (CloneStrategy.SINGLE_BRANCH, ["--single-branch"]),
+            (CloneStrategy.FULL, []),
+        ],
+    )
+    def test_clone_args(self, strategy: CloneStrategy, expected: list[str], tmp_path: Path) -> None:
+        """Test each strategy maps to its clone options."""
+        ops = GitOperations(clone_strategy=strategy)._basic_ops
+
+        assert ops.clone_args("url", tmp_path / "repo", "main") == [
+            "clone",
+            *expected,
+            "--branch",
+            "main",
+            "url",
+            str(tmp_path / "repo"),
+        ]
+
+    def test_clone_args_with_reference(self, tmp_path: Path) -> None:
+        """Test a reference mirror is borrowed from and then dissociated."""
+        ops = GitOperations()._basic_ops
+
+        args = ops.clone_args("url", tmp_path / "repo", None, reference=tmp_path / "repo.git")
+
+        assert args[-5:] == ["--reference", str(tmp_path / "repo.git"), "--dissociate", "url", str(tmp_path / "repo")]
+
+    def test_unknown_strategy(self) -> None:
+        """Test an unknown strategy is rejected."""
+        with pytest.raises(ValueError):
+            GitOperations(clone_strategy="sparse")
+
+    @staticmethod
+    def origin(path: Path, commits: int = 3) -> str:
+        """Create a repository with a few commits that serves partial clones."""
+        init_repo(path)
+        env = {**os.environ, "GIT_COMMITTER_NAME": "test", "GIT_COMMITTER_EMAIL": "test@example.com"}
+        for i in range(commits - 1):
+            (path / "file.txt").write_text(f"{i}\n")
+            subprocess.run(["git", "add", "file.txt"], cwd=path, check=True)
+            subprocess.run(
+                ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", str(i)],
+                cwd=path,
+                check=True,
+                env=env,
+            )
+        subprocess.run(["git", "config", "uploadpack.allowFilter", "true"], cwd=path, check=True)
+        return path.as_uri()
+
+    @staticmethod
+    def commit_count(path: Path) -> int:
+        """Count the commits reachable from HEAD."""
+        result = subprocess.run(["git", "rev-list", "--count", "HEAD"], cwd=path, check=True, capture_output=True)
+        return int(result.stdout)
+
+    @pytest.mark.parametrize("strategy", list(CloneStrategy))
+    def test_clone_with_strategy(self, strategy: CloneStrategy, tmp_path: Path) -> None:
+        """Test every strategy produces a working clone."""
+        url = self.origin(tmp_path / "origin")
+        git = GitOperations(clone_strategy=strategy)
+        dest = tmp_path / "clone"
+
+        result = git.clone(url, dest, "main")
+
+        assert result.status == ResultStatus.SUCCESS
+        assert git.is_shallow(dest) is (strategy == CloneStrategy.SHALLOW)
+        assert self.commit_count(dest) == (1 if strategy == CloneStrategy.SHALLOW else 3)
+        assert (dest / "file.txt").read_text() == "1\n"
+
+    def test_deepen_and_unshallow(self, tmp_path: Path) -> None:
+        """Test a shallow clone can be deepened and then completed."""
+        url = self.origin(tmp_path / "origin", commits=5)
+        git = GitOperations()
+        dest = tmp_path / "clone"
+        git.clone(url, dest, "main")
+
+        result = git.deepen(dest, 2)
+        assert result.status == ResultStatus.SUCCESS
+        assert self.commit_count(dest) == 3
+
+        result = git.deepen(dest)
+        assert result.status == ResultStatus.SUCCESS
+        assert self.commit_count(dest) == 5
+        assert not git.is_shallow(dest)
+
+        result = git.deepen(dest)
+        assert result.status == ResultStatus.SKIPPED
+        assert result.message == "not shallow"
+
+
+class TestMaintain:
+    """Tests for git maintenance tasks."""
+
+    def test_maintain_writes_commit_graph_and_midx(self, tmp_path: Path) -> None:
+        """Test the tasks run in order and leave a commit-graph and a multi-pack-index."""
+        origin = tmp_path / "origin"
+        init_repo(origin)
+        dest = tmp_path / "clone"
+        git = GitOperations(clone_strategy=CloneStrategy.FULL)
+        git.clone(origin.as_uri(), dest, "main")
+
+        result = git.maintain(dest)
+
+        assert result.status == ResultStatus.SUCCESS
+        assert list(result.timings) == ["prefetch", "loose-objects", "incremental-repack", "commit-graph"]
+        assert (dest / ".git" / "objects" / "info" / "commit-graphs").exists()
+        assert (dest / ".git" / "objects" / "pack" / "multi-pack-index").exists()
+
+    def test_maintain_stops_at_deadline(self, tmp_path: Path) -> None:
+        """Test no task starts once the deadline has passed."""
+        init_repo(tmp_path)
+
+        result = GitOperations().maintain(tmp_path, deadline=time.monotonic() - 1)
+
+        assert result.status == ResultStatus.SKIPPED
+        assert result.message == "time budget exhausted"
+
+    @patch("subprocess.run")
+    def test_maintain_failure(self, mock_run: MagicMock, tmp_path: Path) -> None:
+        """Test a failing task stops the remaining ones."""
+        mock_run.side_effect = subprocess.CalledProcessError(1, "git", stderr="lock exists")
+
+        result = GitOperations().maintain(tmp_path, [MaintenanceTask.COMMIT_GRAPH, MaintenanceTask.LOOSE_OBJECTS])
+
+        assert result.status == ResultStatus.FAILED
+        assert result.error == "lock exists"
+        assert mock_run.call_count == 1
+        assert mock_run.call_args.args[0] == ["git", "maintenance", "run", "--task=commit-graph"]
+
+
+class TestHasChanges:
+    """Tests for the dirty check."""
+
+    @pytest.fixture
+    def repo(self, tmp_path: Path) -> Path:
+        """Clean repository with a tracked file and an ignored directory."""
+        init_repo(tmp_path)
+        (tmp_path / ".gitignore").write_text("build/\n")
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "app.py").write_text("print()\n")
+        subprocess.run(["git", "add", "."], cwd=tmp_path, check=True)
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "add"],
+            cwd=tmp_path,
+            check=True,
+        )
+        (tmp_path / "build").mkdir()
+        (tmp_path / "build" / "out.o").write_text("")
+        return tmp_path
+
+    @pytest.mark.parametrize("fast", [True, False])
+    def test_clean(self, repo: Path, fast: bool) -> None:
+        """Test ignored files and merely touched files are not changes."""
+        os.utime(repo / "src" / "app.py", (0, 0))
+
+        assert GitOperations()._has_changes(repo, fast=fast) is False
+
+    @pytest.mark.parametrize("fast", [True, False])
+    @pytest.mark.parametrize(
+        "change",
+        [
+            lambda repo: (repo / "src" / "app.py").write_text("changed\n"),
+            lambda repo: (repo / "src" / "app.py").unlink(),
+            lambda repo: subprocess.run(["git", "rm", "-q", "--cached", "src/app.py"], cwd=repo, check=True),
+        ],
+        ids=["modified", "deleted", "staged"],
+    )
+    def test_tracked_changes(self, repo: Path, fast: bool, change: Callable[[Path], object]) -> None:
+        """Test modified, deleted and staged files are changes."""
+        change(repo)
+
+        assert GitOperations()._has_changes(repo, fast=fast) is True
+
+    @pytest.mark.parametrize("fast", [True, False])
+    def test_untracked(self, repo: Path, fast: bool) -> None:
+        """Test a file in a new directory counts unless untracked files are excluded."""
+        (repo / "src" / "new" / "deep").mkdir(parents=True)
+        (repo / "src" / "new" / "deep" / "file.py").write_text("")
+        git = GitOperations()
+
+        assert git._has_changes(repo, fast=fast) is True
+        assert git._has_changes(repo, fast=fast, untracked=False) is False
+
+    def test_untracked_cache_and_fsmonitor(self, repo: Path) -> None:
+        """Test the optional git features don't change the answer."""
+        ops = GitOperations()._basic_ops
+
+        assert ops.has_changes(repo, fast=True, untracked_cache=True, fsmonitor=True) is False
+        (repo / "new.txt").write_text("")
+        assert ops.has_changes(repo, fast=True, untracked_cache=True, fsmonitor=True) is True
+
+    def test_no_commit_yet(self, tmp_path: Path) -> None:
+        """Test a repository without commits falls back to git status."""
+        subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+        git = GitOperations()
+
+        assert git._has_changes(tmp_path, fast=True) is False
+        (tmp_path / "file.txt").write_text("")
+        assert git._has_changes(tmp_path, fast=True) is True
+
+    @patch("subprocess.run")
+    def test_fast_stops_at_staged_change(self, mock_run: MagicMock, tmp_path: Path) -> None:
+        """Test the working tree is not scanned once a staged change is found."""
+        mock_run.return_value = MagicMock(returncode=1, stdout="")
+
+        assert GitOperations()._has_changes(tmp_path, fast=True) is True
+        assert mock_run.call_count == 1
+        assert mock_run.call_args.args[0][1:3] == ["diff-index", "--cached"]
+
+
 class TestPull:
     """Tests for pull method."""
 
@@ -152,6 +404,208 @@ class TestPull:
         assert "merge conflict" in (result.error or "")
 
 
+class TestRemoteHeadCheck:
+    """Tests for the ls-remote check before pulling."""
+
+    SHA = "a" * 40
+    REFS = (
+        f"*\0refs/heads/main\0{SHA}\0origin\0refs/heads/main\0refs/remotes/origin/main\n"
+        f" \0refs/heads/feature\0{'b' * 40}\0\0\0\n"
+        f" \0refs/remotes/origin/main\0{SHA}\0\0\0\n"
+    )
+
+    @patch("subprocess.run")
+    def test_pull_skipped_when_remote_unchanged(self, mock_run: MagicMock, tmp_path: Path) -> None:
+        """Test fetch and pull are skipped when the upstream has not moved."""
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stdout=self.REFS),
+            MagicMock(returncode=0, stdout=f"{self.SHA}\trefs/heads/main\n"),
+        ]
+
+        git = GitOperations()
+        result = git.pull(tmp_path, check_remote_head=True)
+
+        assert result.status == ResultStatus.SKIPPED
+        assert result.message == "up to date"
+        calls = [call[0][0] for call in mock_run.call_args_list]
+        assert calls[1] == ["git", "ls-remote", "origin", "refs/heads/main"]
+        assert len(calls) == 2
+
+    @patch("subprocess.run")
+    def test_pull_runs_when_remote_moved(self, mock_run: MagicMock, tmp_path: Path) -> None:
+        """Test the usual fetch and pull run when the upstream moved."""
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stdout=self.REFS),
+            MagicMock(returncode=0, stdout=f"{'c' * 40}\trefs/heads/main\n"),
+            MagicMock(returncode=0, stdout=""),
+            MagicMock(returncode=0, stdout=""),
+        ]
+
+        git = GitOperations()
+        result = git.pull(tmp_path, check_remote_head=True)
+
+        assert result.status == ResultStatus.SUCCESS
+        calls = [call[0][0] for call in mock_run.call_args_list]
+        assert calls[2:] == [["git", "fetch", "--prune"], ["git", "merge", "--ff-only", "@{upstream}"]]
+
+    @patch("subprocess.run")
+    def test_head_behind_tracking_ref(self, mock_run: MagicMock, tmp_path: Path) -> None:
+        """Test an already fetched but unmerged upstream still needs a pull."""
+        refs = self.REFS.replace(f" \0refs/remotes/origin/main\0{self.SHA}", f" \0refs/remotes/origin/main\0{'c' * 40}")
+        mock_run.return_value = MagicMock(returncode=0, stdout=refs)
+
+        git = GitOperations()
+
+        assert not git._basic_ops.remote_head_unchanged(tmp_path)
+        assert mock_run.call_count == 1
+
+    @patch("subprocess.run")
+    def test_no_upstream(self, mock_run: MagicMock, tmp_path: Path) -> None:
+        """Test branches without an upstream are never treated as unchanged."""
+        mock_run.return_value = MagicMock(returncode=0, stdout=f"*\0refs/heads/main\0{self.SHA}\0\0\0\n")
+
+        git = GitOperations()
+
+        assert not git._basic_ops.remote_head_unchanged(tmp_path)
+        assert mock_run.call_count == 1
+
+    @patch("subprocess.run")
+    def test_ls_remote_failure(self, mock_run: MagicMock, tmp_path: Path) -> None:
+        """Test an unreachable remote falls through to the usual pull."""
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stdout=self.REFS),
+            subprocess.CalledProcessError(128, "git", stderr="could not read from remote"),
+        ]
+
+        git = GitOperations()
+
+        assert not git._basic_ops.remote_head_unchanged(tmp_path)
+
+    @patch("subprocess.run")
+    def test_pull_fetches_once(self, mock_run: MagicMock, tmp_path: Path) -> None:
+        """Test pull fetches once and fast-forwards locally."""
+        mock_run.return_value = MagicMock(returncode=0, stdout="")
+
+        git = GitOperations(auto_prune=False)
+        result = git.pull(tmp_path)
+
+        calls = [call[0][0] for call in mock_run.call_args_list]
+        assert calls == [["git", "fetch"], ["git", "merge", "--ff-only", "@{upstream}"]]
+        assert set(result.timings) == {"fetch", "merge"}
+
+    @patch("subprocess.run")
+    def test_pull_uses_native_autostash(self, mock_run: MagicMock, tmp_path: Path) -> None:
+        """Test auto_stash relies on git's --autostash instead of extra commands."""
+        mock_run.return_value = MagicMock(returncode=0, stdout="")
+
+        git = GitOperations(auto_stash=True)
+        git.pull(tmp_path)
+
+        calls = [call[0][0] for call in mock_run.call_args_list]
+        assert calls == [["git", "fetch", "--prune"], ["git", "merge", "--ff-only", "--autostash", "@{upstream}"]]
+
+    @patch("subprocess.run")
+    def test_pull_fetch_failure(self, mock_run: MagicMock, tmp_path: Path) -> None:
+        """Test a failed fetch stops before the merge."""
+        mock_run.side_effect = subprocess.CalledProcessError(128, "git", stderr="could not read from remote")
+
+        git = GitOperations()
+        result = git.pull(tmp_path)
+
+        assert result.status == ResultStatus.FAILED
+        assert mock_run.call_count == 1
+        assert set(result.timings) == {"fetch"}
+
+    def test_pull_fast_forwards_real_clone(self, tmp_path: Path) -> None:
+        """Test a clone with local changes is fast-forwarded and keeps them."""
+        origin = tmp_path / "origin"
+        init_repo(origin)
+        clone = tmp_path / "clone"
+        subprocess.run(["git", "clone", "-q", str(origin), str(clone)], check=True)
+        head = TestClassifyAncestry.commit(origin, "upstream change")
+        (clone / "notes.txt").write_text("local\n")
+        subprocess.run(["git", "add", "notes.txt"], cwd=clone, check=True)
+
+        result = GitOperations(auto_stash=True).pull(clone)
+
+        assert result.status == ResultStatus.SUCCESS
+        rev = subprocess.run(["git", "rev-parse", "HEAD"], cwd=clone, check=True, capture_output=True, text=True)
+        assert rev.stdout.strip() == head
+        assert (clone / "notes.txt").read_text() == "local\n"
+
+
+class TestFetchProfile:
+    """Tests for fetch profiles."""
+
+    NARROW = FetchProfile(scope=FetchScope.BRANCH, tags=False, protocol_v2=True, prune=PruneMode.ON_CHANGE)
+
+    def test_fetch_args(self) -> None:
+        """Test a narrow profile fetches the upstream only and a default one everything."""
+        narrow = GitOperations(fetch_profile=self.NARROW)._basic_ops
+        default = GitOperations()._basic_ops
+
+        assert narrow.fetch_args(("origin", "refs/heads/main")) == [
+            "-c",
+            "protocol.version=2",
+            "fetch",
+            "--no-tags",
+            "origin",
+            "refs/heads/main",
+        ]
+        # Without an upstream nothing tells whether it moved, so prune right away
+        assert narrow.fetch_args(None) == ["-c", "protocol.version=2", "fetch", "--no-tags", "--prune"]
+        assert default.fetch_args() == ["fetch", "--prune"]
+
+    def test_prune_args(self) -> None:
+        """Test when a separate prune follows the fetch."""
+        on_change = GitOperations(fetch_profile=FetchProfile(prune=PruneMode.ON_CHANGE))._basic_ops
+        branch = GitOperations(fetch_profile=FetchProfile(scope=FetchScope.BRANCH))._basic_ops
+        no_prune = GitOperations(auto_prune=False, fetch_profile=self.NARROW)._basic_ops
+
+        assert on_change.prune_args("origin", upstream_moved=True) == ["remote", "prune", "origin"]
+        assert on_change.prune_args("origin", upstream_moved=False) is None
+        assert branch.prune_args("origin", upstream_moved=False) == ["remote", "prune", "origin"]
+        assert GitOperations()._basic_ops.prune_args("origin", upstream_moved=True) is None
+        assert no_prune.prune_args("origin", upstream_moved=True) is None
+
+    def test_pull_with_narrow_profile(self, tmp_path: Path) -> None:
+        """Test only the upstream is fetched, without tags, and pruning waits for it to move."""
+        origin = tmp_path / "origin"
+        init_repo(origin)
+        subprocess.run(["git", "branch", "stale"], cwd=origin, check=True)
+        clone = tmp_path / "clone"
+        subprocess.run(["git", "clone", "-q", str(origin), str(clone)], check=True)
+        git = GitOperations(fetch_profile=self.NARROW)
+
+        def remote_refs() -> list[str]:
+            result = subprocess.run(
+                ["git", "for-each-ref", "--format=%(refname)", "refs/remotes/origin/", "refs/tags/"],
+                cwd=clone,
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            return sorted(result.stdout.splitlines())
+
+        # A deleted branch alone is not pruned while the upstream stays put
+        subprocess.run(["git", "branch", "-q", "-D", "stale"], cwd=origin, check=True)
+        result = git.pull(clone)
+        assert result.status == ResultStatus.SUCCESS
+        assert "prune" not in result.timings
+        assert "refs/remotes/origin/stale" in remote_refs()
+
+        head = TestClassifyAncestry.commit(origin, "merge")
+        subprocess.run(["git", "branch", "new"], cwd=origin, check=True)
+        subprocess.run(["git", "tag", "v1"], cwd=origin, check=True)
+        result = git.pull(clone)
+
+        assert result.status == ResultStatus.SUCCESS
+        assert "prune" in result.timings
+        rev = subprocess.run(["git", "rev-parse", "HEAD"], cwd=clone, check=True, capture_output=True, text=True)
+        assert rev.stdout.strip() == head
+        assert remote_refs() == ["refs/remotes/origin/HEAD", "refs/remotes/origin/feature", "refs/remotes/origin/main"]
+
+
 class TestFetchAndPrune:
     """Tests for fetch_and_prune method."""
 
@@ -243,6 +697,85 @@ class TestDeleteBranch:
         assert "feature/old" in call_args
 
 
+class TestDeleteBranches:
+    """Tests for delete_branches method."""
+
+    @staticmethod
+    def branches(path: Path) -> list[str]:
+        """List local branch names."""
+        result = subprocess.run(
+            ["git", "for-each-ref", "--format=%(refname:short)", "refs/heads"],
+            cwd=path,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        return result.stdout.split()
+
+    def test_deletes_all_with_fixed_process_count(self, tmp_path: Path) -> None:
+        """Test many branches are deleted with three git calls."""
+        sha = init_repo(tmp_path)
+        names = [f"feat-{i}" for i in range(20)]
+        for name in names:
+            subprocess.run(["git", "branch", name], cwd=tmp_path, check=True)
+        subprocess.run(["git", "config", "branch.feat-0.remote", "origin"], cwd=tmp_path, check=True)
+        git = GitOperations()
+
+        with patch("subprocess.run", wraps=subprocess.run) as mock_run:
+            result = git.delete_branches(tmp_path, dict.fromkeys(names, sha))
+
+        assert result == dict.fromkeys(names, True)
+        assert mock_run.call_count == 3
+        assert self.branches(tmp_path) == ["feature", "main"]
+        config = subprocess.run(["git", "config", "--get", "branch.feat-0.remote"], cwd=tmp_path, check=False)
+        assert config.returncode == 1
+
+    def test_moved_branch_aborts_everything(self, tmp_path: Path) -> None:
+        """Test nothing is deleted when a branch is not at its expected SHA."""
+        sha = init_repo(tmp_path)
+        subprocess.run(["git", "branch", "other"], cwd=tmp_path, check=True)
+        git = GitOperations()
+
+        result = git.delete_branches(tmp_path, {"feature": sha, "other": "f" * 40})
+
+        assert result == {"feature": False, "other": False}
+        assert self.branches(tmp_path) == ["feature", "main", "other"]
+
+    def test_reports_per_branch_outcome(self, tmp_path: Path) -> None:
+        """Test -d keeps unmerged and checked-out branches and reports them."""
+        init_repo(tmp_path)
+        subprocess.run(["git", "checkout", "-q", "-b", "unmerged"], cwd=tmp_path, check=True)
+        subprocess.run(
+            [
+                "git",
+                "-c",
+                "user.name=t",
+                "-c",
+                "user.email=t@example.com",
+                "commit",
+                "-q",
+                "--allow-empty",
+                "-m",
+                "wip",
+            ],
+            cwd=tmp_path,
+            check=True,
+        )
+        subprocess.run(["git", "checkout", "-q", "main"], cwd=tmp_path, check=True)
+        git = GitOperations()
+
+        result = git.delete_branches(tmp_path, {"feature": None, "unmerged": None, "main": None, "missing": None})
+
+        assert result == {"feature": True, "unmerged": False, "main": False, "missing": False}
+        assert self.branches(tmp_path) == ["main", "unmerged"]
+
+    def test_empty(self, tmp_path: Path) -> None:
+        """Test nothing is run without branches."""
+        with patch("subprocess.run") as mock_run:
+            assert GitOperations().delete_branches(tmp_path, {}) == {}
+        mock_run.assert_not_called()
+
+
 class TestGetRemoteUrl:
     """Tests for get_remote_url method."""
 
@@ -403,6 +936,220 @@ class TestGetBranchSha:
         assert sha is None
 
 
+def init_repo(path: Path) -> str:
+    """Create a repository with one commit on main and return its SHA."""
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "test",
+        "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "test",
+        "GIT_COMMITTER_EMAIL": "test@example.com",
+    }
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True, env=env)
+    subprocess.run(["git", "commit", "-q", "--allow-empty", "-m", "init"], cwd=path, check=True, env=env)
+    subprocess.run(["git", "branch", "feature"], cwd=path, check=True, env=env)
+    result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=path, check=True, env=env, capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+class TestRefResolver:
+    """Tests for RefResolver."""
+
+    def test_resolves_many_refs_with_one_process(self, tmp_path: Path) -> None:
+        """Test all lookups are answered by a single git process."""
+        sha = init_repo(tmp_path)
+        git = GitOperations()
+
+        with patch("subprocess.Popen", wraps=subprocess.Popen) as mock_popen, git.ref_resolver(tmp_path) as refs:
+            assert refs.resolve("refs/heads/main") == sha
+            assert refs.resolve("refs/heads/feature") == sha
+            assert refs.resolve("refs/heads/missing") is None
+            assert refs.resolve("refs/heads/main") == sha
+
+        assert mock_popen.call_count == 1
+
+    def test_no_process_without_lookups(self, tmp_path: Path) -> None:
+        """Test the git process is only started on the first lookup."""
+        with patch("subprocess.Popen") as mock_popen, RefResolver(GitOperations()._basic_ops, tmp_path):
+            pass
+
+        mock_popen.assert_not_called()
+
+    def test_close_stops_process(self, tmp_path: Path) -> None:
+        """Test close() waits for the git process to exit."""
+        init_repo(tmp_path)
+        refs = GitOperations().ref_resolver(tmp_path)
+        refs.resolve("refs/heads/main")
+        process = refs._process
+
+        refs.close()
+
+        assert process is not None
+        assert process.returncode == 0
+
+    def test_not_a_repository(self, tmp_path: Path) -> None:
+        """Test lookups outside a repository return None."""
+        with GitOperations().ref_resolver(tmp_path) as refs:
+            assert refs.resolve("refs/heads/main") is None
+            assert refs.resolve("refs/heads/main") is None
+
+    def test_invalid_ref(self, tmp_path: Path) -> None:
+        """Test refs that cannot be sent over the pipe are rejected."""
+        with patch("subprocess.Popen") as mock_popen, GitOperations().ref_resolver(tmp_path) as refs:
+            assert refs.resolve("main\nHEAD") is None
+            assert refs.resolve("") is None
+
+        mock_popen.assert_not_called()
+
+
+class TestBranchSnapshot:
+    """Tests for get_branch_snapshot method."""
+
+    def test_snapshot_of_real_repository(self, tmp_path: Path) -> None:
+        """Test SHAs, HEAD and merge status are read with two git calls."""
+        sha = init_repo(tmp_path)
+        subprocess.run(["git", "checkout", "-q", "-b", "unmerged"], cwd=tmp_path, check=True)
+        subprocess.run(
+            [
+                "git",
+                "-c",
+                "user.name=t",
+                "-c",
+                "user.email=t@example.com",
+                "commit",
+                "-q",
+                "--allow-empty",
+                "-m",
+                "wip",
+            ],
+            cwd=tmp_path,
+            check=True,
+        )
+        git = GitOperations()
+
+        with patch("subprocess.run", wraps=subprocess.run) as mock_run:
+            snapshot = git.get_branch_snapshot(tmp_path, "main")
+
+        assert mock_run.call_count == 2
+        assert snapshot.local_branches == ["feature", "main", "unmerged"]
+        assert snapshot.current_branch == "unmerged"
+        assert snapshot.sha("main") == sha
+        assert snapshot.sha("missing") is None
+        assert snapshot.merged_branches() == ["feature"]
+
+    @patch("subprocess.run")
+    def test_snapshot_parses_upstream(self, mock_run: MagicMock, tmp_path: Path) -> None:
+        """Test upstreams are kept and output is parsed as bytes."""
+        mock_run.side_effect = [
+            MagicMock(
+                returncode=0,
+                stdout=(
+                    b"*\0refs/heads/main\0" + b"a" * 40 + b"\0refs/remotes/origin/main\n"
+                    b" \0refs/heads/feat/\xc3\xa9\0" + b"b" * 40 + b"\0\n"
+                ),
+            ),
+            MagicMock(returncode=0, stdout=b"refs/heads/main\n"),
+        ]
+
+        snapshot = GitOperations().get_branch_snapshot(tmp_path, "main")
+
+        assert snapshot.branches["main"].upstream == "refs/remotes/origin/main"
+        assert snapshot.branches["main"].is_head
+        assert snapshot.branches["feat/\u00e9"].upstream is None
+        assert snapshot.merged_branches() == []
+        assert "--merged=refs/heads/main" in mock_run.call_args_list[1][0][0]
+
+    @patch("subprocess.run")
+    def test_snapshot_without_base_branch(self, mock_run: MagicMock, tmp_path: Path) -> None:
+        """Test a missing base branch leaves every branch unmerged."""
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stdout=b"*\0refs/heads/dev\0" + b"a" * 40 + b"\0\n"),
+            subprocess.CalledProcessError(129, "git", stderr=b"malformed object name"),
+        ]
+
+        snapshot = GitOperations().get_branch_snapshot(tmp_path, "main")
+
+        assert snapshot.local_branches == ["dev"]
+        assert snapshot.merged_branches() == []
+
+    @patch("subprocess.run")
+    def test_snapshot_failure(self, mock_run: MagicMock, tmp_path: Path) -> None:
+        """Test an unreadable repository gives an empty snapshot."""
+        mock_run.side_effect = subprocess.CalledProcessError(128, "git", stderr=b"not a git repository")
+
+        snapshot = GitOperations().get_branch_snapshot(tmp_path, "main")
+
+        assert snapshot.local_branches == []
+        assert snapshot.current_branch is None
+
+
+class TestClassifyAncestry:
+    """Tests for classify_ancestry method."""
+
+    @staticmethod
+    def commit(path: Path, message: str) -> str:
+        """Create an empty commit on the current branch and return its SHA."""
+        subprocess.run(
+            [
+                "git",
+                "-c",
+                "user.name=t",
+                "-c",
+                "user.email=t@example.com",
+                "commit",
+                "-q",
+                "--allow-empty",
+                "-m",
+                message,
+            ],
+            cwd=path,
+            check=True,
+        )
+        result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=path, check=True, capture_output=True, text=True)
+        return result.stdout.strip()
+
+    def test_classifies_pairs_with_one_git_call(self, tmp_path: Path) -> None:
+        """Test older, newer and diverged pairs are decided from one rev-list."""
+        init_repo(tmp_path)
+        subprocess.run(["git", "checkout", "-q", "-b", "work"], cwd=tmp_path, check=True)
+        b = self.commit(tmp_path, "b")
+        c = self.commit(tmp_path, "c")
+        subprocess.run(["git", "checkout", "-q", "-b", "side", b], cwd=tmp_path, check=True)
+        d = self.commit(tmp_path, "d")
+        git = GitOperations()
+
+        with patch("subprocess.run", wraps=subprocess.run) as mock_run:
+            result = git.classify_ancestry(
+                tmp_path,
+                {"equal": (c, c), "older": (b, c), "newer": (c, b), "diverged": (d, c)},
+                "main",
+            )
+
+        assert result == {
+            "equal": Ancestry.EQUAL,
+            "older": Ancestry.OLDER,
+            "newer": Ancestry.NEWER,
+            "diverged": Ancestry.DIVERGED,
+        }
+        assert mock_run.call_count == 1
+        assert mock_run.call_args[0][0][:2] == ["git", "rev-list"]
+
+    def test_falls_back_outside_the_graph(self, tmp_path: Path) -> None:
+        """Test pairs touching the base history or missing commits still classify."""
+        base = init_repo(tmp_path)
+        subprocess.run(["git", "checkout", "-q", "-b", "work"], cwd=tmp_path, check=True)
+        b = self.commit(tmp_path, "b")
+        git = GitOperations()
+
+        result = git.classify_ancestry(
+            tmp_path,
+            {"in-base": (b, base), "missing": (b, "f" * 40)},
+            "main",
+        )
+
+        assert result == {"in-base": Ancestry.NEWER, "missing": Ancestry.DIVERGED}
+
+
 class TestIsAncestor:
     """Tests for is_ancestor method."""
 
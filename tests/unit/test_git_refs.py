@@ -0,0 +1,165 @@
+"""Tests for the in-process ref and config reader."""
+
+import os
+import subprocess
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from setup_repo.core.git import GitOperations
+from setup_repo.core.git_refs import GitRefReader, UnsupportedRepositoryError, Upstream
+
+GIT_ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+def git(path: Path, *args: str) -> str:
+    """Run git in a test repository and return its output."""
+    result = subprocess.run(["git", *args], cwd=path, check=True, env=GIT_ENV, capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+@pytest.fixture(autouse=True)
+def no_user_url_rewrites() -> Iterator[None]:
+    """Keep the developer's global git config out of the tests."""
+    with patch("setup_repo.core.git_refs._user_config_rewrites_urls", return_value=False):
+        yield
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """Create a clone with an upstream, a tag and a feature branch."""
+    origin = tmp_path / "origin"
+    origin.mkdir()
+    git(origin, "init", "-q", "-b", "main")
+    git(origin, "commit", "-q", "--allow-empty", "-m", "init")
+    clone = tmp_path / "clone"
+    git(tmp_path, "clone", "-q", str(origin), str(clone))
+    git(clone, "branch", "feature")
+    git(clone, "tag", "-a", "-m", "release", "v1")
+    return clone
+
+
+class TestGitRefReader:
+    """Tests for GitRefReader."""
+
+    def test_current_branch(self, repo: Path) -> None:
+        """Test the branch HEAD points to is read from HEAD."""
+        reader = GitRefReader.open(repo)
+        assert reader is not None
+        assert reader.current_branch() == "main"
+
+        git(repo, "checkout", "-q", "--detach")
+        assert reader.current_branch() is None
+
+    @pytest.mark.parametrize("packed", [False, True])
+    def test_rev_parse_matches_git(self, repo: Path, packed: bool) -> None:
+        """Test loose and packed refs resolve like git rev-parse."""
+        if packed:
+            git(repo, "pack-refs", "--all")
+            assert not (repo / ".git" / "refs" / "heads" / "main").exists()
+        reader = GitRefReader.open(repo)
+        assert reader is not None
+
+        for name in ("main", "feature", "v1", "origin/main", "origin", "HEAD"):
+            assert reader.rev_parse(name) == git(repo, "rev-parse", name), name
+        assert reader.rev_parse("missing") is None
+
+    def test_loose_ref_wins_over_packed(self, repo: Path) -> None:
+        """Test a loose ref updated after packing is preferred."""
+        git(repo, "pack-refs", "--all")
+        git(repo, "checkout", "-q", "feature")
+        git(repo, "commit", "-q", "--allow-empty", "-m", "more")
+        reader = GitRefReader.open(repo)
+        assert reader is not None
+
+        assert reader.resolve("refs/heads/feature") == git(repo, "rev-parse", "feature")
+
+    def test_revisions_needing_git(self, repo: Path) -> None:
+        """Test revision syntax is left to git."""
+        reader = GitRefReader.open(repo)
+        assert reader is not None
+
+        for name in ("main~1", "main^", "main@{1}", "abc1234", "main..feature"):
+            with pytest.raises(UnsupportedRepositoryError):
+                reader.rev_parse(name)
+
+    def test_remote_url_and_upstream(self, repo: Path) -> None:
+        """Test the origin URL and the upstream come from .git/config."""
+        reader = GitRefReader.open(repo)
+        assert reader is not None
+
+        assert reader.remote_url() == git(repo, "remote", "get-url", "origin")
+        assert reader.remote_url("upstream") is None
+        assert reader.upstream("main") == Upstream("origin", "refs/heads/main", "refs/remotes/origin/main")
+        assert reader.upstream("feature") is None
+
+    @pytest.mark.parametrize(
+        "config",
+        [
+            "[include]\n\tpath = other.config\n",
+            '[url "git@github.com:"]\n\tinsteadOf = https://github.com/\n',
+            '[remote "origin"]\n\turl = "quoted"\n',
+            "[extensions]\n\tworktreeConfig = true\n",
+        ],
+    )
+    def test_unusual_config_needs_git(self, repo: Path, config: str) -> None:
+        """Test config the reader does not model is left to git."""
+        with open(repo / ".git" / "config", "a", encoding="utf-8") as f:
+            f.write(config)
+        reader = GitRefReader.open(repo)
+        assert reader is not None
+
+        with pytest.raises(UnsupportedRepositoryError):
+            reader.remote_url()
+
+    def test_worktree_is_not_opened(self, repo: Path, tmp_path: Path) -> None:
+        """Test linked worktrees (.git is a file) are left to git."""
+        git(repo, "worktree", "add", "-q", str(tmp_path / "wt"), "feature")
+
+        assert GitRefReader.open(tmp_path / "wt") is None
+        assert GitRefReader.open(tmp_path / "not-a-repo") is None
+
+    def test_git_environment_is_respected(self, repo: Path) -> None:
+        """Test repositories redirected through the environment are left to git."""
+        with patch.dict(os.environ, {"GIT_DIR": str(repo / ".git")}):
+            assert GitRefReader.open(repo) is None
+
+
+class TestReadPathWithoutGit:
+    """Tests that read-only operations avoid spawning git."""
+
+    def test_no_subprocess_for_reads(self, repo: Path) -> None:
+        """Test branch, SHA and URL lookups are answered in process."""
+        ops = GitOperations()
+        expected_sha = git(repo, "rev-parse", "main")
+
+        with patch("subprocess.run") as mock_run:
+            assert ops.get_current_branch(repo) == "main"
+            assert ops.get_branch_sha(repo, "main") == expected_sha
+            assert ops.get_remote_url(repo) is not None
+
+        mock_run.assert_not_called()
+
+    def test_falls_back_to_git(self, repo: Path) -> None:
+        """Test unsupported repositories are still answered by git."""
+        with open(repo / ".git" / "config", "a", encoding="utf-8") as f:
+            f.write("[include]\n\tpath = missing.config\n")
+
+        assert GitOperations().get_remote_url(repo) == git(repo, "remote", "get-url", "origin")
+
+    def test_remote_head_check_reads_local_state(self, repo: Path) -> None:
+        """Test the pre-fetch check only spawns ls-remote."""
+        ops = GitOperations()
+
+        with patch("subprocess.run", wraps=subprocess.run) as mock_run:
+            assert ops._basic_ops.remote_head_unchanged(repo)
+
+        assert [call[0][0][1] for call in mock_run.call_args_list] == ["ls-remote"]
@@ -1,10 +1,62 @@
 """Tests for GitHub API client."""
 
+import json
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import anyio
+import httpx
 import pytest
 
-from setup_repo.core.github import AsyncGitHubClient, GitHubClient
+from setup_repo.core.github import (
+    AsyncGitHubClient,
+    GitHubClient,
+    _batch_merged_pr_queries,
+    parse_repositories,
+    parse_repository_page,
+)
+from setup_repo.core.github_graphql import (
+    GitHubGraphQLError,
+    MergedPRQuery,
+    inventory_request,
+    merged_prs_request,
+    parse_inventory_page,
+    parse_merged_prs,
+)
+from setup_repo.core.http_cache import ResponseCache
+from setup_repo.core.merged_prs import MergedPRSnapshot, MergedPRStore
+
+REPO_ITEM = {
+    "name": "repo1",
+    "full_name": "user/repo1",
+    "clone_url": "https://github.com/user/repo1.git",
+    "ssh_url": "git@github.com:user/repo1.git",
+}
+
+
+def json_response(data: object) -> httpx.Response:
+    """Build a JSON API response."""
+    return httpx.Response(200, json=data, request=httpx.Request("GET", "https://api.github.com/users/user/repos"))
+
+
+def repos_handler(
+    pages: list[list[dict[str, str]]],
+    seen: list[httpx.Request],
+) -> Callable[[httpx.Request], httpx.Response]:
+    """Build a MockTransport handler serving repo pages with ETags."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        page = int(request.url.params.get("page", "1"))
+        etag = f'"etag-{page}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        data = pages[page - 1] if page <= len(pages) else []
+        return httpx.Response(200, json=data, headers={"ETag": etag})
+
+    return handler
 
 
 class TestGitHubClient:
@@ -42,6 +94,42 @@ class TestGitHubClient:
         assert "Authorization" not in headers
         assert headers["Accept"] == "application/vnd.github+json"
 
+    def test_iter_repository_pages_is_lazy(self) -> None:
+        """Test pages are fetched only as the caller consumes them."""
+        seen: list[httpx.Request] = []
+        other = {**REPO_ITEM, "name": "repo2", "full_name": "user/repo2"}
+        transport = httpx.MockTransport(repos_handler([[REPO_ITEM], [other]], seen))
+
+        with GitHubClient(token="test") as client:
+            client._client = httpx.Client(base_url=client.BASE_URL, transport=transport)
+            pages = client.iter_repository_pages("user")
+            first = next(pages)
+            assert len(seen) == 1
+            rest = list(pages)
+
+        assert [r.name for r in first] == ["repo1"]
+        assert [[r.name for r in page] for page in rest] == [["repo2"]]
+        assert len(seen) == 3
+
+    def test_client_created_once_across_threads(self) -> None:
+        """Test concurrent first use shares one pooled HTTP client."""
+        client = GitHubClient(token="test", limits=httpx.Limits(max_connections=4, max_keepalive_connections=4))
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(executor.map(lambda _: client.client, range(16)))
+
+        assert all(c is clients[0] for c in clients)
+        client.close()
+
+    def test_http2_without_h2_falls_back(self) -> None:
+        """Test HTTP/2 is only enabled when the h2 package is available."""
+        with (
+            patch("setup_repo.core.github.importlib.util.find_spec", return_value=None),
+            patch("setup_repo.core.github.httpx.Client") as mock_client_cls,
+        ):
+            _ = GitHubClient(http2=True).client
+
+        assert mock_client_cls.call_args.kwargs["http2"] is False
+
     def test_context_manager(self) -> None:
         """Test context manager protocol."""
         with GitHubClient(token="test") as client:
@@ -72,12 +160,8 @@ class TestGitHubClient:
                 "ssh_url": "git@github.com:user/repo2.git",
             },
         ]
-        mock_response = MagicMock()
-        mock_response.json.return_value = data
-        mock_response.raise_for_status = MagicMock()
-        empty_response = MagicMock()
-        empty_response.json.return_value = []
-        empty_response.raise_for_status = MagicMock()
+        mock_response = json_response(data)
+        empty_response = json_response([])
 
         with patch("httpx.Client.get", side_effect=[mock_response, empty_response]), GitHubClient() as client:
             repos = client.get_repositories("user")
@@ -101,12 +185,8 @@ class TestGitHubClient:
                 "name": "invalid-repo",
             },
         ]
-        mock_response = MagicMock()
-        mock_response.json.return_value = data
-        mock_response.raise_for_status = MagicMock()
-        empty_response = MagicMock()
-        empty_response.json.return_value = []
-        empty_response.raise_for_status = MagicMock()
+        mock_response = json_response(data)
+        empty_response = json_response([])
 
         with patch("httpx.Client.get", side_effect=[mock_response, empty_response]), GitHubClient() as client:
             repos = client.get_repositories("user")
@@ -118,19 +198,17 @@ class TestGitHubClient:
     @patch("httpx.Client.get")
     def test_get_repositories(self, mock_get: MagicMock) -> None:
         """Test fetching repositories."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = [
-            {
-                "name": "repo1",
-                "full_name": "user/repo1",
-                "clone_url": "https://github.com/user/repo1.git",
-                "ssh_url": "git@github.com:user/repo1.git",
-            }
-        ]
-        mock_response.raise_for_status = MagicMock()
-        empty_response = MagicMock()
-        empty_response.json.return_value = []
-        empty_response.raise_for_status = MagicMock()
+        mock_response = json_response(
+            [
+                {
+                    "name": "repo1",
+                    "full_name": "user/repo1",
+                    "clone_url": "https://github.com/user/repo1.git",
+                    "ssh_url": "git@github.com:user/repo1.git",
+                }
+            ]
+        )
+        empty_response = json_response([])
 
         # First call returns data, second returns empty (end of pagination)
         mock_get.side_effect = [mock_response, empty_response]
@@ -218,6 +296,527 @@ class TestGitHubClient:
         assert len(merged_prs) == 0
 
 
+class TestGitHubClientCache:
+    """Tests for conditional requests with the response cache."""
+
+    def test_not_modified_served_from_cache(self, tmp_path: Path) -> None:
+        """Test a 304 answer is served from the on-disk cache."""
+        seen: list[httpx.Request] = []
+        cache = ResponseCache(tmp_path)
+        transport = httpx.MockTransport(repos_handler([[REPO_ITEM]], seen))
+
+        for _ in range(2):
+            with GitHubClient(token="test", cache=cache) as client:
+                client._client = httpx.Client(base_url=client.BASE_URL, transport=transport)
+                repos = client.get_repositories("user")
+            assert [r.name for r in repos] == ["repo1"]
+
+        # Second run sends validators and gets 304 for every page
+        assert "If-None-Match" not in seen[0].headers
+        assert seen[2].headers["If-None-Match"] == '"etag-1"'
+        assert seen[3].headers["If-None-Match"] == '"etag-2"'
+
+    def test_cache_is_scoped_by_token(self, tmp_path: Path) -> None:
+        """Test cached pages are not reused for a different token."""
+        seen: list[httpx.Request] = []
+        cache = ResponseCache(tmp_path)
+        transport = httpx.MockTransport(repos_handler([[REPO_ITEM]], seen))
+
+        for token in ("token-a", "token-b"):
+            with GitHubClient(token=token, cache=cache) as client:
+                client._client = httpx.Client(base_url=client.BASE_URL, transport=transport)
+                client.get_repositories("user")
+
+        assert all("If-None-Match" not in request.headers for request in seen)
+
+    @pytest.mark.anyio
+    async def test_async_not_modified_served_from_cache(self, tmp_path: Path) -> None:
+        """Test the async client revalidates against the cache too."""
+        seen: list[httpx.Request] = []
+        cache = ResponseCache(tmp_path)
+        transport = httpx.MockTransport(repos_handler([[REPO_ITEM]], seen))
+
+        for _ in range(2):
+            async with AsyncGitHubClient(token="test", cache=cache) as client:
+                client._client = httpx.AsyncClient(base_url=client.BASE_URL, transport=transport)
+                repos = await client.get_repositories("user")
+            assert [r.name for r in repos] == ["repo1"]
+
+        assert len(seen) == 2
+        assert seen[-1].headers["If-None-Match"] == '"etag-1"'
+
+
+def graphql_node(name: str, oid: str | None = "abc123") -> dict[str, object]:
+    """Build a GraphQL repository node."""
+    return {
+        "name": name,
+        "nameWithOwner": f"user/{name}",
+        "url": f"https://github.com/user/{name}",
+        "sshUrl": f"git@github.com:user/{name}.git",
+        "isPrivate": False,
+        "isArchived": False,
+        "isFork": False,
+        "pushedAt": "2024-01-01T00:00:00Z",
+        "defaultBranchRef": {"name": "develop", "target": {"oid": oid}} if oid else None,
+    }
+
+
+class TestGitHubClientGraphQL:
+    """Tests for the GraphQL inventory backend."""
+
+    def test_get_repositories_graphql(self) -> None:
+        """Test GraphQL pages are followed by cursor and mapped to Repository."""
+        payloads = [
+            {
+                "data": {
+                    "repositoryOwner": {
+                        "repositories": {
+                            "pageInfo": {"hasNextPage": True, "endCursor": "cursor1"},
+                            "nodes": [graphql_node("repo1")],
+                        }
+                    }
+                }
+            },
+            {
+                "data": {
+                    "repositoryOwner": {
+                        "repositories": {
+                            "pageInfo": {"hasNextPage": False, "endCursor": "cursor2"},
+                            "nodes": [graphql_node("empty-repo", oid=None)],
+                        }
+                    }
+                }
+            },
+        ]
+        cursors: list[object] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == "/graphql"
+            variables = json.loads(request.content)["variables"]
+            cursors.append(variables["cursor"])
+            return httpx.Response(200, json=payloads[len(cursors) - 1])
+
+        with GitHubClient(token="test", use_graphql=True) as client:
+            client._client = httpx.Client(base_url=client.BASE_URL, transport=httpx.MockTransport(handler))
+            repos = client.get_repositories("user")
+
+        assert cursors == [None, "cursor1"]
+        assert [r.name for r in repos] == ["repo1", "empty-repo"]
+        assert repos[0].clone_url == "https://github.com/user/repo1.git"
+        assert repos[0].default_branch == "develop"
+        assert repos[0].default_branch_sha == "abc123"
+        assert repos[0].private is False
+        assert repos[1].default_branch == "main"
+        assert repos[1].default_branch_sha is None
+
+    def test_graphql_errors_fall_back_to_rest(self) -> None:
+        """Test the REST listing is used when GraphQL fails."""
+        seen: list[httpx.Request] = []
+        rest_handler = repos_handler([[REPO_ITEM]], seen)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/graphql":
+                seen.append(request)
+                return httpx.Response(200, json={"errors": [{"message": "Something went wrong"}]})
+            return rest_handler(request)
+
+        with GitHubClient(token="test", use_graphql=True) as client:
+            client._client = httpx.Client(base_url=client.BASE_URL, transport=httpx.MockTransport(handler))
+            repos = client.get_repositories("user")
+
+        assert [r.name for r in repos] == ["repo1"]
+        assert [request.url.path for request in seen] == ["/graphql", "/users/user/repos", "/users/user/repos"]
+
+    def test_malformed_payload_falls_back_to_rest(self) -> None:
+        """Test an unexpected payload shape is reported as a GraphQL error."""
+        seen: list[httpx.Request] = []
+        rest_handler = repos_handler([[REPO_ITEM]], seen)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/graphql":
+                return httpx.Response(200, json={"data": {"repositoryOwner": {"repositories": None}}})
+            return rest_handler(request)
+
+        with GitHubClient(token="test", use_graphql=True) as client:
+            client._client = httpx.Client(base_url=client.BASE_URL, transport=httpx.MockTransport(handler))
+            repos = client.get_repositories("user")
+
+        assert [r.name for r in repos] == ["repo1"]
+
+    def test_mid_stream_failure_does_not_repeat_repositories(self) -> None:
+        """Test the REST fallback skips repositories GraphQL already yielded."""
+        seen: list[httpx.Request] = []
+        other = {**REPO_ITEM, "name": "repo2", "full_name": "user/repo2"}
+        rest_handler = repos_handler([[REPO_ITEM, other]], seen)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/graphql":
+                if json.loads(request.content)["variables"]["cursor"] is None:
+                    return httpx.Response(
+                        200,
+                        json={
+                            "data": {
+                                "repositoryOwner": {
+                                    "repositories": {
+                                        "pageInfo": {"hasNextPage": True, "endCursor": "c1"},
+                                        "nodes": [graphql_node("repo1")],
+                                    }
+                                }
+                            }
+                        },
+                    )
+                return httpx.Response(502)
+            return rest_handler(request)
+
+        with GitHubClient(token="test", use_graphql=True) as client:
+            client._client = httpx.Client(base_url=client.BASE_URL, transport=httpx.MockTransport(handler))
+            pages = list(client.iter_repository_pages("user"))
+
+        assert [[r.name for r in page] for page in pages] == [["repo1"], ["repo2"]]
+
+    def test_query_lists_public_repositories_only(self) -> None:
+        """Test the GraphQL query matches the public-only REST listing."""
+        body = inventory_request("user", None)
+        assert "privacy: PUBLIC" in body["query"]
+        assert "ownerAffiliations: [OWNER]" in body["query"]
+
+    def test_parse_inventory_page_invalid_shape(self) -> None:
+        """Test mapping problems surface as GitHubGraphQLError."""
+        payload = {
+            "data": {
+                "repositoryOwner": {
+                    "repositories": {
+                        "pageInfo": {"hasNextPage": False, "endCursor": None},
+                        "nodes": [{"name": "missing-fields"}],
+                    }
+                }
+            }
+        }
+        with pytest.raises(GitHubGraphQLError):
+            parse_inventory_page(payload)
+
+    def test_graphql_requires_token(self) -> None:
+        """Test GraphQL is skipped without a token."""
+        paths: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            paths.append(request.url.path)
+            return httpx.Response(200, json=[])
+
+        with GitHubClient(use_graphql=True) as client:
+            client._client = httpx.Client(base_url=client.BASE_URL, transport=httpx.MockTransport(handler))
+            client.get_repositories("user")
+
+        assert paths == ["/users/user/repos"]
+
+    @pytest.mark.anyio
+    async def test_async_get_repositories_graphql(self) -> None:
+        """Test the async client supports the GraphQL backend."""
+        payload = {
+            "data": {
+                "repositoryOwner": {
+                    "repositories": {
+                        "pageInfo": {"hasNextPage": False, "endCursor": None},
+                        "nodes": [graphql_node("repo1")],
+                    }
+                }
+            }
+        }
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=payload))
+
+        async with AsyncGitHubClient(token="test", use_graphql=True) as client:
+            client._client = httpx.AsyncClient(base_url=client.BASE_URL, transport=transport)
+            repos = await client.get_repositories("user")
+
+        assert [r.default_branch_sha for r in repos] == ["abc123"]
+
+
+class TestGitHubClientRateLimit:
+    """Tests for rate-limit handling in the clients."""
+
+    def test_retries_after_secondary_rate_limit(self) -> None:
+        """Test a 403 with Retry-After is retried instead of ending the listing."""
+        calls: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(403, headers={"Retry-After": "2"}, json={"message": "secondary rate limit"})
+            page = int(request.url.params.get("page", "1"))
+            return httpx.Response(200, json=[REPO_ITEM] if page == 1 else [])
+
+        with patch("setup_repo.core.github.time.sleep") as mock_sleep, GitHubClient(token="test") as client:
+            client._client = httpx.Client(base_url=client.BASE_URL, transport=httpx.MockTransport(handler))
+            repos = client.get_repositories("user")
+
+        assert [r.name for r in repos] == ["repo1"]
+        assert len(calls) == 3
+        assert mock_sleep.call_args_list[0].args[0] >= 2
+
+    def test_merged_pull_requests_retry_rate_limit(self) -> None:
+        """Test merged PR paging survives a 429."""
+        calls: list[httpx.Request] = []
+        pr = {
+            "merged_at": "2024-01-01T00:00:00Z",
+            "head": {"ref": "feature", "sha": "abc", "repo": {"full_name": "user/repo"}},
+        }
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "1"})
+            return httpx.Response(200, json=[pr])
+
+        with patch("setup_repo.core.github.time.sleep"), GitHubClient(token="test") as client:
+            client._client = httpx.Client(base_url=client.BASE_URL, transport=httpx.MockTransport(handler))
+            merged = client.get_merged_pull_requests("user", "repo", "main")
+
+        assert merged == {"feature": "abc"}
+
+    def test_budget_is_tracked(self) -> None:
+        """Test the remaining budget is exposed after a request."""
+        headers = {"X-RateLimit-Remaining": "4321", "X-RateLimit-Reset": "1700000000"}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json=[], headers=headers)
+
+        with GitHubClient(token="test") as client:
+            client._client = httpx.Client(base_url=client.BASE_URL, transport=httpx.MockTransport(handler))
+            client.get_repositories("user")
+
+        assert client.rate_limit.remaining == 4321
+        assert client.rate_limit.reset_at == 1700000000
+
+    def test_permission_error_is_not_retried(self) -> None:
+        """Test a plain 403 is raised without retrying."""
+        calls: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(403, json={"message": "Resource not accessible"})
+
+        with GitHubClient(token="test") as client:
+            client._client = httpx.Client(base_url=client.BASE_URL, transport=httpx.MockTransport(handler))
+            with pytest.raises(httpx.HTTPStatusError):
+                client.get_repositories("user")
+
+        assert len(calls) == 1
+
+    @pytest.mark.anyio
+    async def test_async_retries_after_rate_limit(self) -> None:
+        """Test the async client backs off and retries too."""
+        calls: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200, json=[REPO_ITEM])
+
+        async with AsyncGitHubClient(token="test") as client:
+            client.rate_limit.base_delay = 0.0
+            client._client = httpx.AsyncClient(base_url=client.BASE_URL, transport=httpx.MockTransport(handler))
+            repos = await client.get_repositories("user")
+
+        assert [r.name for r in repos] == ["repo1"]
+        assert len(calls) == 2
+
+
+def pulls_handler(
+    prs: list[dict[str, object]],
+    seen: list[httpx.Request],
+) -> Callable[[httpx.Request], httpx.Response]:
+    """Build a MockTransport handler serving closed PRs in pages of 100."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        page = int(request.url.params.get("page", "1"))
+        return httpx.Response(200, json=prs[(page - 1) * 100 : page * 100])
+
+    return handler
+
+
+def merged_pr(number: int, branch: str, updated_at: str, merged: bool = True) -> dict[str, object]:
+    """Build a closed PR as returned by the pulls endpoint."""
+    return {
+        "number": number,
+        "updated_at": updated_at,
+        "merged_at": updated_at if merged else None,
+        "head": {"ref": branch, "sha": f"sha-{number}", "repo": {"full_name": "user/repo"}},
+    }
+
+
+class TestMergedPullRequestsWatermark:
+    """Tests for incremental merged-PR fetches."""
+
+    def test_second_run_stops_at_watermark(self, tmp_path: Path) -> None:
+        """Test only PRs updated since the last run are fetched."""
+        store = MergedPRStore(tmp_path)
+        history = [merged_pr(i, f"old-{i}", f"2023-01-01T00:{i // 60:02d}:{i % 60:02d}Z") for i in range(250)]
+        history.sort(key=lambda pr: str(pr["updated_at"]), reverse=True)
+        seen: list[httpx.Request] = []
+
+        with GitHubClient(token="test", pr_store=store) as client:
+            client._client = httpx.Client(
+                base_url=client.BASE_URL, transport=httpx.MockTransport(pulls_handler(history, seen))
+            )
+            first = client.get_merged_pull_requests("user", "repo", "main")
+        assert len(first) == 250
+        assert len(seen) == 3
+
+        prs = [merged_pr(1000, "new", "2024-06-01T00:00:00Z"), *history]
+        seen.clear()
+        with GitHubClient(token="test", pr_store=store) as client:
+            client._client = httpx.Client(
+                base_url=client.BASE_URL, transport=httpx.MockTransport(pulls_handler(prs, seen))
+            )
+            second = client.get_merged_pull_requests("user", "repo", "main")
+
+        assert len(seen) == 1
+        assert second["new"] == "sha-1000"
+        assert second["old-0"] == "sha-0"
+        assert len(second) == 251
+
+    def test_failed_walk_keeps_watermark(self, tmp_path: Path) -> None:
+        """Test an interrupted walk does not advance the watermark."""
+        store = MergedPRStore(tmp_path)
+        store.save("user", "repo", "main", MergedPRSnapshot(updated_at="2023-01-01T00:00:00Z", branches={"a": "1"}))
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(500)
+
+        with GitHubClient(token="test", pr_store=store) as client:
+            client._client = httpx.Client(base_url=client.BASE_URL, transport=httpx.MockTransport(handler))
+            merged = client.get_merged_pull_requests("user", "repo", "main")
+
+        assert merged == {"a": "1"}
+        snapshot = store.load("user", "repo", "main")
+        assert snapshot is not None
+        assert snapshot.updated_at == "2023-01-01T00:00:00Z"
+
+
+def merged_pr_connection(*repos: str, oid: str = "sha1") -> dict[str, object]:
+    """Build a pullRequests connection with one node per head repository."""
+    return {"nodes": [{"headRefOid": oid, "headRepository": {"nameWithOwner": repo}} for repo in repos]}
+
+
+class TestMergedPullRequestsBatch:
+    """Tests for batched GraphQL merged-PR lookups."""
+
+    def test_request_uses_aliases_and_escapes(self) -> None:
+        """Test repositories and branches become aliased, quoted fields."""
+        queries = [
+            MergedPRQuery("user", "repo1", "main", ("feat/a", 'odd"name')),
+            MergedPRQuery("user", "repo2", "develop", ("fix",)),
+        ]
+
+        query = merged_prs_request(queries)["query"]
+
+        assert 'r0: repository(owner: "user", name: "repo1")' in query
+        assert 'b1: pullRequests(states: MERGED, baseRefName: "main", headRefName: "odd\\"name"' in query
+        assert 'r1: repository(owner: "user", name: "repo2")' in query
+        assert 'baseRefName: "develop", headRefName: "fix"' in query
+
+    def test_parse_skips_forks_and_missing_repos(self) -> None:
+        """Test fork PRs are ignored and unresolved repositories are None."""
+        queries = [
+            MergedPRQuery("user", "repo1", "main", ("feat", "gone")),
+            MergedPRQuery("user", "missing", "main", ("feat",)),
+        ]
+        payload = {
+            "data": {
+                "r0": {
+                    "b0": merged_pr_connection("fork/repo1", "User/Repo1", oid="abc"),
+                    "b1": {"nodes": []},
+                },
+                "r1": None,
+            },
+            "errors": [{"type": "NOT_FOUND", "message": "Could not resolve to a Repository"}],
+        }
+
+        assert parse_merged_prs(payload, queries) == [{"feat": "abc"}, None]
+
+    def test_parse_without_data_raises(self) -> None:
+        """Test a response without data is an error."""
+        with pytest.raises(GitHubGraphQLError, match="Bad credentials"):
+            parse_merged_prs({"errors": [{"message": "Bad credentials"}]}, [])
+
+    def test_batches_requests(self) -> None:
+        """Test many repositories are resolved with a few requests."""
+        seen: list[httpx.Request] = []
+        queries = [MergedPRQuery("user", f"repo{i}", "main", ("feat",)) for i in range(45)]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            count = json.loads(request.content)["query"].count("repository(")
+            data = {f"r{i}": {"b0": merged_pr_connection("user/placeholder")} for i in range(count)}
+            return httpx.Response(200, json={"data": data})
+
+        with GitHubClient(token="test") as client:
+            client._client = httpx.Client(base_url=client.BASE_URL, transport=httpx.MockTransport(handler))
+            results = client.get_merged_pull_requests_batch(queries)
+
+        assert len(seen) == 3
+        assert len(results) == 45
+        assert all(merged == {} for merged in results.values())
+
+    def test_failed_batch_is_left_out(self) -> None:
+        """Test repositories of a failed request are left for the REST fallback."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(502)
+
+        with GitHubClient(token="test") as client:
+            client._client = httpx.Client(base_url=client.BASE_URL, transport=httpx.MockTransport(handler))
+            results = client.get_merged_pull_requests_batch([MergedPRQuery("user", "repo", "main", ("feat",))])
+
+        assert results == {}
+
+    def test_batches_are_bounded_by_branch_count(self) -> None:
+        """Test repositories with many branches get their own request."""
+        queries = [
+            MergedPRQuery("user", "big", "main", tuple(f"b{i}" for i in range(150))),
+            MergedPRQuery("user", "other", "main", tuple(f"b{i}" for i in range(100))),
+            MergedPRQuery("user", "small", "main", ("feat",)),
+        ]
+
+        batches = _batch_merged_pr_queries(queries)
+
+        assert [[q.repo for q in batch] for batch in batches] == [["big"], ["other", "small"]]
+
+
+class TestParseRepositories:
+    """Tests for the shared bulk repository parser."""
+
+    def test_parse_repository_page_bulk(self) -> None:
+        """Test a valid page is parsed in one pass, ignoring extra fields."""
+        content = json.dumps([{**REPO_ITEM, "id": 1, "owner": {"login": "user"}, "topics": ["a"]}]).encode()
+
+        repos, count = parse_repository_page(content)
+
+        assert count == 1
+        assert repos[0].full_name == "user/repo1"
+        assert repos[0].default_branch == "main"
+
+    def test_parse_repository_page_skips_invalid_items(self) -> None:
+        """Test pages with invalid items fall back to per-item parsing."""
+        content = json.dumps([REPO_ITEM, {"name": "broken"}, "junk"]).encode()
+
+        repos, count = parse_repository_page(content)
+
+        assert count == 3
+        assert [r.name for r in repos] == ["repo1"]
+
+    def test_parse_repository_page_rejects_non_list(self) -> None:
+        """Test an error object instead of a page is reported."""
+        with pytest.raises(ValueError, match="JSON array"):
+            parse_repository_page(b'{"message": "Not Found"}')
+
+    def test_parse_repositories_items(self) -> None:
+        """Test decoded items are validated in bulk with per-item fallback."""
+        assert [r.name for r in parse_repositories([REPO_ITEM, {"name": "broken"}])] == ["repo1"]
+
+
 class TestAsyncGitHubClient:
     """Tests for AsyncGitHubClient class."""
 
@@ -243,6 +842,60 @@ class TestAsyncGitHubClient:
         assert new_client is not inner_client
         await client.close()
 
+    @pytest.mark.anyio
+    async def test_get_repositories_fans_out_pages(self) -> None:
+        """Test remaining pages are fetched concurrently using the Link header."""
+        last_page = 5
+        in_flight = 0
+        max_in_flight = 0
+        pages_requested: list[int] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, max_in_flight
+            page = int(request.url.params["page"])
+            pages_requested.append(page)
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            # Later pages answer first to check ordering is stable
+            await anyio.sleep(0.01 * (last_page - page))
+            in_flight -= 1
+            headers = {}
+            if page == 1:
+                headers["Link"] = (
+                    f'<https://api.github.com/user/1/repos?page=2&per_page=100>; rel="next", '
+                    f'<https://api.github.com/user/1/repos?page={last_page}&per_page=100>; rel="last"'
+                )
+            data = [{**REPO_ITEM, "name": f"repo{page}", "full_name": f"user/repo{page}"}]
+            return httpx.Response(200, json=data, headers=headers)
+
+        async with AsyncGitHubClient(max_concurrency=2) as client:
+            client._client = httpx.AsyncClient(base_url=client.BASE_URL, transport=httpx.MockTransport(handler))
+            repos = await client.get_repositories("user")
+
+        assert [r.name for r in repos] == [f"repo{i}" for i in range(1, last_page + 1)]
+        assert sorted(pages_requested) == list(range(1, last_page + 1))
+        assert max_in_flight == 2
+
+    @pytest.mark.anyio
+    async def test_get_repositories_without_link_header(self) -> None:
+        """Test sequential paging stops at the first short page."""
+        seen: list[httpx.Request] = []
+        full_page = [{**REPO_ITEM, "name": f"repo{i}", "full_name": f"user/repo{i}"} for i in range(100)]
+        last_page = [{**REPO_ITEM, "name": "last", "full_name": "user/last"}]
+        transport = httpx.MockTransport(repos_handler([full_page, last_page], seen))
+
+        async with AsyncGitHubClient() as client:
+            client._client = httpx.AsyncClient(base_url=client.BASE_URL, transport=transport)
+            repos = await client.get_repositories("user")
+
+        assert len(repos) == 101
+        assert len(seen) == 2
+
+    def test_max_concurrency_must_be_positive(self) -> None:
+        """Test a zero concurrency limit is rejected instead of blocking forever."""
+        with pytest.raises(ValueError, match="max_concurrency"):
+            AsyncGitHubClient(max_concurrency=0)
+
     @pytest.mark.anyio
     async def test_async_close(self) -> None:
         """Test async client close."""
@@ -0,0 +1,136 @@
+"""Tests for the GitHub API response cache."""
+
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from setup_repo.core.http_cache import ENTRY_SUFFIX, CachedResponse, ResponseCache
+
+
+class TestCachedResponse:
+    """Tests for CachedResponse."""
+
+    def test_conditional_headers(self) -> None:
+        """Test both validators are turned into conditional headers."""
+        cached = CachedResponse(content=b"[]", etag='"abc"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+
+        assert cached.conditional_headers() == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+        }
+
+    def test_conditional_headers_empty(self) -> None:
+        """Test no headers without validators."""
+        assert CachedResponse(content=b"[]").conditional_headers() == {}
+
+
+class TestResponseCache:
+    """Tests for ResponseCache class."""
+
+    def test_make_key_is_stable(self) -> None:
+        """Test keys do not depend on parameter order."""
+        key1 = ResponseCache.make_key("ns", "/users/a/repos", {"page": 1, "per_page": 100})
+        key2 = ResponseCache.make_key("ns", "/users/a/repos", {"per_page": 100, "page": 1})
+        assert key1 == key2
+
+    def test_make_key_varies_by_namespace(self) -> None:
+        """Test keys differ between namespaces."""
+        key1 = ResponseCache.make_key("ns1", "/users/a/repos", {"page": 1})
+        key2 = ResponseCache.make_key("ns2", "/users/a/repos", {"page": 1})
+        assert key1 != key2
+
+    def test_put_and_get(self, tmp_path: Path) -> None:
+        """Test storing and reading back an entry."""
+        cache = ResponseCache(tmp_path)
+        cache.put("key", b'[{"name": "repo"}]', {"etag": '"v1"'})
+
+        cached = cache.get("key")
+
+        assert cached is not None
+        assert cached.content == b'[{"name": "repo"}]'
+        assert cached.etag == '"v1"'
+        assert cached.last_modified is None
+
+    def test_get_missing(self, tmp_path: Path) -> None:
+        """Test a miss returns None."""
+        cache = ResponseCache(tmp_path)
+        assert cache.get("missing") is None
+
+    def test_put_without_validators_is_skipped(self, tmp_path: Path) -> None:
+        """Test responses that cannot be revalidated are not stored."""
+        cache = ResponseCache(tmp_path)
+        cache.put("key", b"[]", {})
+        assert cache.get("key") is None
+
+    def test_expired_entry_is_removed(self, tmp_path: Path) -> None:
+        """Test entries older than the TTL are discarded."""
+        cache = ResponseCache(tmp_path, ttl=60)
+        cache.put("key", b"[]", {"etag": '"v1"'})
+        old = time.time() - 120
+        os.utime(tmp_path / f"key{ENTRY_SUFFIX}", (old, old))
+
+        assert cache.get("key") is None
+        assert not (tmp_path / f"key{ENTRY_SUFFIX}").exists()
+
+    def test_touch_refreshes_entry(self, tmp_path: Path) -> None:
+        """Test touch() keeps a revalidated entry alive."""
+        cache = ResponseCache(tmp_path, ttl=60)
+        cache.put("key", b"[]", {"etag": '"v1"'})
+        old = time.time() - 120
+        os.utime(tmp_path / f"key{ENTRY_SUFFIX}", (old, old))
+
+        cache.touch("key")
+
+        assert cache.get("key") is not None
+
+    def test_invalid_entry_is_removed(self, tmp_path: Path) -> None:
+        """Test corrupt entries are treated as misses."""
+        (tmp_path / f"key{ENTRY_SUFFIX}").write_text("not json")
+        cache = ResponseCache(tmp_path)
+
+        assert cache.get("key") is None
+        assert not (tmp_path / f"key{ENTRY_SUFFIX}").exists()
+
+    def test_size_eviction(self, tmp_path: Path) -> None:
+        """Test least recently used entries are evicted beyond max_bytes."""
+        cache = ResponseCache(tmp_path, max_bytes=250)
+        body = b"x" * 100
+        for i in range(3):
+            cache.put(f"key{i}", body, {"etag": f'"v{i}"'})
+            old = time.time() - 100 + i
+            os.utime(tmp_path / f"key{i}{ENTRY_SUFFIX}", (old, old))
+        cache.put("key3", body, {"etag": '"v3"'})
+
+        remaining = sorted(p.stem for p in tmp_path.glob(f"*{ENTRY_SUFFIX}"))
+        assert "key0" not in remaining
+        assert "key3" in remaining
+        assert sum(p.stat().st_size for p in tmp_path.glob(f"*{ENTRY_SUFFIX}")) <= 250
+
+    def test_body_is_stored_verbatim(self, tmp_path: Path) -> None:
+        """Test the body follows the metadata line without re-encoding."""
+        cache = ResponseCache(tmp_path)
+        body = b'[{"name": "repo", "description": "line\\nbreak"}]'
+        cache.put("key", body, {"etag": '"v1"', "link": '<https://x?page=2>; rel="last"'})
+
+        raw = (tmp_path / f"key{ENTRY_SUFFIX}").read_bytes()
+        assert raw.endswith(b"\n" + body)
+        cached = cache.get("key")
+        assert cached is not None
+        assert cached.content == body
+        assert cached.link == '<https://x?page=2>; rel="last"'
+
+    def test_failed_write_removes_temp_file(self, tmp_path: Path) -> None:
+        """Test a failed write leaves no temporary file behind."""
+        cache = ResponseCache(tmp_path)
+        with patch("setup_repo.core.http_cache.os.replace", side_effect=OSError("disk full")):
+            cache.put("key", b"[]", {"etag": '"v1"'})
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_clear(self, tmp_path: Path) -> None:
+        """Test clear() removes all entries."""
+        cache = ResponseCache(tmp_path)
+        cache.put("key", b"[]", {"etag": '"v1"'})
+        cache.clear()
+        assert cache.get("key") is None
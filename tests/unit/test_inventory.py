@@ -0,0 +1,67 @@
+"""Tests for the persisted repository inventory."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from setup_repo.core.inventory import RepositoryInventory
+from setup_repo.models.repository import Repository
+
+
+def make_repo(name: str, **kwargs: object) -> Repository:
+    """Build a repository of the test owner."""
+    return Repository(
+        name=name,
+        full_name=f"user/{name}",
+        clone_url=f"https://github.com/user/{name}.git",
+        ssh_url=f"git@github.com:user/{name}.git",
+        **kwargs,
+    )
+
+
+class TestRepositoryInventory:
+    """Tests for RepositoryInventory class."""
+
+    def test_save_and_load(self, tmp_path: Path) -> None:
+        """Test a listing round-trips through disk."""
+        inventory = RepositoryInventory(tmp_path)
+        repos = [make_repo("repo1"), make_repo("repo2", default_branch="develop", archived=True)]
+
+        inventory.save("User", repos)
+        saved = inventory.load("user")
+
+        assert saved is not None
+        assert saved.repositories == repos
+        assert saved.saved_at is not None
+
+    def test_defaults_are_omitted(self, tmp_path: Path) -> None:
+        """Test fields at their default values are not written."""
+        inventory = RepositoryInventory(tmp_path)
+        inventory.save("user", [make_repo("repo1")])
+
+        data = json.loads((tmp_path / "user.json").read_text())
+        assert set(data["repositories"][0]) == {"name", "full_name", "clone_url", "ssh_url"}
+
+    def test_owner_is_sanitized(self, tmp_path: Path) -> None:
+        """Test owner names cannot escape the inventory directory."""
+        inventory = RepositoryInventory(tmp_path / "inventory")
+        inventory.save("../evil", [make_repo("repo1")])
+
+        assert [p.name for p in (tmp_path / "inventory").iterdir()] == [".._evil.json"]
+
+    def test_load_missing(self, tmp_path: Path) -> None:
+        """Test a missing inventory returns None."""
+        assert RepositoryInventory(tmp_path).load("user") is None
+
+    def test_load_invalid(self, tmp_path: Path) -> None:
+        """Test a corrupt inventory is ignored."""
+        (tmp_path / "user.json").write_text('{"repositories": {}}')
+        assert RepositoryInventory(tmp_path).load("user") is None
+
+    def test_failed_write_removes_temp_file(self, tmp_path: Path) -> None:
+        """Test a failed write leaves no temporary file behind."""
+        inventory = RepositoryInventory(tmp_path)
+        with patch("setup_repo.core.inventory.os.replace", side_effect=OSError("disk full")):
+            inventory.save("user", [make_repo("repo1")])
+
+        assert list(tmp_path.iterdir()) == []
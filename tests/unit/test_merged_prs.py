@@ -0,0 +1,44 @@
+"""Tests for the merged-PR watermark store."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+from setup_repo.core.merged_prs import MergedPRSnapshot, MergedPRStore
+
+
+class TestMergedPRStore:
+    """Tests for MergedPRStore class."""
+
+    def test_save_and_load(self, tmp_path: Path) -> None:
+        """Test a snapshot round-trips through disk."""
+        store = MergedPRStore(tmp_path)
+        store.save("owner", "repo", "main", MergedPRSnapshot(updated_at="2024-01-01T00:00:00Z", branches={"f": "abc"}))
+
+        snapshot = store.load("owner", "repo", "main")
+
+        assert snapshot == MergedPRSnapshot(updated_at="2024-01-01T00:00:00Z", branches={"f": "abc"})
+
+    def test_scoped_by_base_branch(self, tmp_path: Path) -> None:
+        """Test snapshots for different base branches are separate."""
+        store = MergedPRStore(tmp_path)
+        store.save("owner", "repo", "main", MergedPRSnapshot(updated_at="x"))
+        assert store.load("owner", "repo", "develop") is None
+
+    def test_load_missing(self, tmp_path: Path) -> None:
+        """Test a missing snapshot returns None."""
+        assert MergedPRStore(tmp_path / "missing").load("owner", "repo", "main") is None
+
+    def test_load_invalid(self, tmp_path: Path) -> None:
+        """Test a corrupt snapshot is ignored."""
+        store = MergedPRStore(tmp_path)
+        store.save("owner", "repo", "main", MergedPRSnapshot())
+        for path in tmp_path.glob("*.json"):
+            path.write_text('{"branches": []}')
+        assert store.load("owner", "repo", "main") is None
+
+    def test_failed_write_removes_temp_file(self, tmp_path: Path) -> None:
+        """Test a failed write leaves no temporary file behind."""
+        store = MergedPRStore(tmp_path)
+        with patch("setup_repo.core.merged_prs.os.replace", side_effect=OSError("disk full")):
+            store.save("owner", "repo", "main", MergedPRSnapshot())
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,100 @@
+"""Tests for the bare-mirror cache."""
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from setup_repo.core.git import GitOperations
+from setup_repo.core.git_operations import CloneStrategy
+from setup_repo.core.mirror import MirrorCache
+from setup_repo.models.result import ResultStatus
+
+ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+def git(cwd: Path, *args: str) -> str:
+    result = subprocess.run(["git", *args], cwd=cwd, check=True, env=ENV, capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def origin(tmp_path: Path) -> Path:
+    """Repository with a branch, a tag and a pull request ref."""
+    path = tmp_path / "origin"
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True, env=ENV)
+    (path / "file.txt").write_text("hello\n")
+    git(path, "add", "file.txt")
+    git(path, "commit", "-q", "-m", "init")
+    git(path, "branch", "feature")
+    git(path, "tag", "v1")
+    git(path, "update-ref", "refs/pull/1/head", "HEAD")
+    return path
+
+
+def refs(path: Path) -> list[str]:
+    return git(path, "for-each-ref", "--format=%(refname)").splitlines()
+
+
+class TestMirrorCache:
+    """Tests for MirrorCache."""
+
+    def test_path_layout(self, tmp_path: Path) -> None:
+        """Test mirrors are laid out per owner with unsafe characters replaced."""
+        cache = MirrorCache(tmp_path)
+
+        assert cache.path("Owner/Repo") == tmp_path / "owner" / "repo.git"
+        assert cache.path("owner/a b") == tmp_path / "owner" / "a_b.git"
+        assert cache.get("owner/repo") is None
+
+    def test_update_creates_and_refreshes_mirror(self, origin: Path, tmp_path: Path) -> None:
+        """Test the mirror holds branches and tags only and follows the remote."""
+        cache = MirrorCache(tmp_path / "mirrors")
+
+        result = cache.update("owner/repo", origin.as_uri())
+
+        mirror = cache.get("owner/repo")
+        assert result.status == ResultStatus.SUCCESS
+        assert result.message == "Mirror created"
+        assert mirror == tmp_path / "mirrors" / "owner" / "repo.git"
+        assert refs(mirror) == ["refs/heads/feature", "refs/heads/main", "refs/tags/v1"]
+
+        git(origin, "branch", "-D", "feature")
+        git(origin, "branch", "next")
+        result = cache.update("owner/repo", origin.as_uri())
+
+        assert result.message == "Mirror updated"
+        assert refs(mirror) == ["refs/heads/main", "refs/heads/next", "refs/tags/v1"]
+
+    def test_update_failure_leaves_no_mirror(self, tmp_path: Path) -> None:
+        """Test a failed clone reports an error and leaves nothing behind."""
+        cache = MirrorCache(tmp_path / "mirrors")
+
+        result = cache.update("owner/repo", (tmp_path / "missing").as_uri())
+
+        assert result.status == ResultStatus.FAILED
+        assert result.repo_name == "owner/repo"
+        assert cache.get("owner/repo") is None
+        assert list((tmp_path / "mirrors" / "owner").iterdir()) == []
+
+    def test_clone_with_reference(self, origin: Path, tmp_path: Path) -> None:
+        """Test a clone borrows from the mirror but does not depend on it."""
+        cache = MirrorCache(tmp_path / "mirrors")
+        cache.update("owner/repo", origin.as_uri())
+        mirror = cache.get("owner/repo")
+        git_ops = GitOperations(clone_strategy=CloneStrategy.FULL)
+        dest = tmp_path / "clone"
+
+        result = git_ops.clone(origin.as_uri(), dest, "main", reference=mirror)
+
+        assert result.status == ResultStatus.SUCCESS
+        assert (dest / "file.txt").read_text() == "hello\n"
+        assert not (dest / ".git" / "objects" / "info" / "alternates").exists()
+        assert git(dest, "remote", "get-url", "origin") == origin.as_uri()
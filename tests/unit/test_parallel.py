@@ -1,9 +1,14 @@
 """Tests for parallel processing."""
 
+import threading
+from collections.abc import Iterator
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from setup_repo.core.parallel import ParallelProcessor
+import anyio
+import pytest
+
+from setup_repo.core.parallel import AsyncParallelProcessor, ParallelProcessor
 from setup_repo.models.result import ProcessResult, ResultStatus
 
 
@@ -171,3 +176,112 @@ class TestParallelProcessor:
         # Check that individual result has duration set
         assert len(summary.results) == 1
         assert summary.results[0].duration >= 0
+
+    @patch("setup_repo.core.parallel.Progress")
+    def test_process_streamed_items(self, mock_progress: MagicMock, tmp_path: Path) -> None:
+        """Test work starts before a lazy item stream is exhausted."""
+        mock_progress_instance = MagicMock()
+        mock_progress.return_value.__enter__ = MagicMock(return_value=mock_progress_instance)
+        mock_progress.return_value.__exit__ = MagicMock(return_value=False)
+        mock_progress_instance.add_task.return_value = 1
+        first_done = threading.Event()
+
+        def items() -> Iterator[Path]:
+            yield tmp_path / "repo1"
+            # The next "page" only arrives once the first item was processed
+            assert first_done.wait(timeout=5)
+            yield tmp_path / "repo2"
+            yield tmp_path / "repo3"
+
+        def process_func(path: Path) -> ProcessResult:
+            if path.name == "repo1":
+                first_done.set()
+            return ProcessResult(repo_name=path.name, status=ResultStatus.SUCCESS)
+
+        summary = ParallelProcessor(max_workers=2).process(items(), process_func)
+
+        assert sorted(r.repo_name for r in summary.results) == ["repo1", "repo2", "repo3"]
+        mock_progress_instance.add_task.assert_called_once_with("Processing", total=None)
+        mock_progress_instance.update.assert_any_call(1, total=3)
+
+    @patch("setup_repo.core.parallel.Progress")
+    def test_process_stream_error_after_submitted_items(self, mock_progress: MagicMock, tmp_path: Path) -> None:
+        """Test a failing item stream is re-raised after submitted items finish."""
+        mock_progress_instance = MagicMock()
+        mock_progress.return_value.__enter__ = MagicMock(return_value=mock_progress_instance)
+        mock_progress.return_value.__exit__ = MagicMock(return_value=False)
+        processed: list[str] = []
+
+        def items() -> Iterator[Path]:
+            yield tmp_path / "repo1"
+            raise RuntimeError("listing failed")
+
+        def process_func(path: Path) -> ProcessResult:
+            processed.append(path.name)
+            return ProcessResult(repo_name=path.name, status=ResultStatus.SUCCESS)
+
+        with pytest.raises(RuntimeError, match="listing failed"):
+            ParallelProcessor().process(items(), process_func)
+
+        assert processed == ["repo1"]
+
+
+class TestAsyncParallelProcessor:
+    """Tests for AsyncParallelProcessor class."""
+
+    @pytest.fixture
+    def anyio_backend(self) -> str:
+        """Run on asyncio, which the sync command's async engine uses."""
+        return "asyncio"
+
+    def test_max_concurrency_must_be_positive(self) -> None:
+        """Test a zero limit is rejected."""
+        with pytest.raises(ValueError, match="max_concurrency"):
+            AsyncParallelProcessor(max_concurrency=0)
+
+    @pytest.mark.anyio
+    @patch("setup_repo.core.parallel.Progress")
+    async def test_process_bounds_concurrency(self, mock_progress: MagicMock, tmp_path: Path) -> None:
+        """Test no more than max_concurrency items run at once."""
+        mock_progress_instance = MagicMock()
+        mock_progress.return_value.__enter__ = MagicMock(return_value=mock_progress_instance)
+        mock_progress.return_value.__exit__ = MagicMock(return_value=False)
+        running = 0
+        peak = 0
+
+        async def process_func(path: Path) -> ProcessResult:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await anyio.sleep(0.01)
+            running -= 1
+            return ProcessResult(repo_name=path.name, status=ResultStatus.SUCCESS)
+
+        items = [tmp_path / f"repo{i}" for i in range(20)]
+        summary = await AsyncParallelProcessor(max_concurrency=5).process(items, process_func, desc="Test")
+
+        assert summary.total == 20
+        assert summary.success == 20
+        assert peak == 5
+        mock_progress_instance.add_task.assert_called_once_with("Test", total=20)
+
+    @pytest.mark.anyio
+    @patch("setup_repo.core.parallel.Progress")
+    async def test_process_with_exception(self, mock_progress: MagicMock, tmp_path: Path) -> None:
+        """Test an exception fails only its own item."""
+        mock_progress_instance = MagicMock()
+        mock_progress.return_value.__enter__ = MagicMock(return_value=mock_progress_instance)
+        mock_progress.return_value.__exit__ = MagicMock(return_value=False)
+
+        async def process_func(path: Path) -> ProcessResult:
+            if path.name == "bad":
+                raise RuntimeError("boom")
+            return ProcessResult(repo_name=path.name, status=ResultStatus.SUCCESS)
+
+        summary = await AsyncParallelProcessor().process([tmp_path / "good", tmp_path / "bad"], process_func)
+
+        assert summary.success == 1
+        assert summary.failed == 1
+        failed = next(r for r in summary.results if r.status == ResultStatus.FAILED)
+        assert failed.repo_name == "bad"
+        assert failed.error == "boom"
@@ -0,0 +1,92 @@
+"""Tests for the rate-limit scheduler."""
+
+import time
+
+import httpx
+
+from setup_repo.core.rate_limit import RateLimitScheduler
+
+
+def make_response(status: int, headers: dict[str, str] | None = None, text: str = "") -> httpx.Response:
+    """Build a response for the scheduler to inspect."""
+    return httpx.Response(status, headers=headers, text=text, request=httpx.Request("GET", "https://api.github.com"))
+
+
+class TestRateLimitScheduler:
+    """Tests for RateLimitScheduler class."""
+
+    def test_unknown_budget(self) -> None:
+        """Test a fresh scheduler neither paces nor refuses work."""
+        scheduler = RateLimitScheduler()
+        assert scheduler.remaining is None
+        assert scheduler.has_budget(1000)
+        assert scheduler.pacing_delay() == 0.0
+
+    def test_update_records_budget(self) -> None:
+        """Test rate-limit headers are recorded."""
+        scheduler = RateLimitScheduler()
+        scheduler.update({"x-ratelimit-remaining": "42", "x-ratelimit-reset": "1700000000"})
+        assert scheduler.remaining == 42
+        assert scheduler.reset_at == 1700000000
+
+    def test_update_ignores_invalid_headers(self) -> None:
+        """Test missing or malformed headers leave the budget unchanged."""
+        scheduler = RateLimitScheduler()
+        scheduler.update({"x-ratelimit-remaining": "many"})
+        scheduler.update({})
+        assert scheduler.remaining is None
+
+    def test_has_budget_keeps_watermark(self) -> None:
+        """Test optional work must leave the low watermark untouched."""
+        scheduler = RateLimitScheduler(low_watermark=100)
+        scheduler.update({"x-ratelimit-remaining": "150"})
+        assert scheduler.has_budget(50)
+        assert not scheduler.has_budget(51)
+
+    def test_pacing_spreads_remaining_budget(self) -> None:
+        """Test requests are spread over the time left until the reset."""
+        scheduler = RateLimitScheduler(low_watermark=100)
+        reset = int(time.time()) + 100
+        scheduler.update({"x-ratelimit-remaining": "10", "x-ratelimit-reset": str(reset)})
+        assert 5 < scheduler.pacing_delay() <= 10
+
+    def test_no_pacing_above_watermark(self) -> None:
+        """Test requests run at full speed while the budget is healthy."""
+        scheduler = RateLimitScheduler(low_watermark=100)
+        reset = int(time.time()) + 100
+        scheduler.update({"x-ratelimit-remaining": "4000", "x-ratelimit-reset": str(reset)})
+        assert scheduler.pacing_delay() == 0.0
+
+    def test_retry_after_is_honored(self) -> None:
+        """Test Retry-After sets the minimum backoff."""
+        scheduler = RateLimitScheduler(base_delay=1.0)
+        delay = scheduler.retry_delay(make_response(429, {"retry-after": "5"}), attempt=0)
+        assert delay is not None
+        assert 5 <= delay <= 6
+
+    def test_exhausted_budget_waits_for_reset(self) -> None:
+        """Test a 403 with no remaining budget waits until the reset."""
+        scheduler = RateLimitScheduler()
+        reset = int(time.time()) + 30
+        response = make_response(403, {"x-ratelimit-remaining": "0", "x-ratelimit-reset": str(reset)})
+        delay = scheduler.retry_delay(response, attempt=0)
+        assert delay is not None
+        assert 25 <= delay <= 35
+
+    def test_secondary_limit_backs_off_exponentially(self) -> None:
+        """Test secondary limits without Retry-After back off exponentially."""
+        scheduler = RateLimitScheduler(base_delay=1.0)
+        response = make_response(403, text='{"message": "You have exceeded a secondary rate limit"}')
+        first = scheduler.retry_delay(response, attempt=0)
+        third = scheduler.retry_delay(response, attempt=2)
+        assert first is not None and third is not None
+        assert 1 <= first <= 2
+        assert 4 <= third <= 5
+
+    def test_not_retryable(self) -> None:
+        """Test other errors and exhausted retries are not retried."""
+        scheduler = RateLimitScheduler(max_retries=2, max_delay=60)
+        assert scheduler.retry_delay(make_response(404), attempt=0) is None
+        assert scheduler.retry_delay(make_response(403, text="Forbidden"), attempt=0) is None
+        assert scheduler.retry_delay(make_response(429, {"retry-after": "1"}), attempt=2) is None
+        assert scheduler.retry_delay(make_response(429, {"retry-after": "3600"}), attempt=0) is None
@@ -0,0 +1,77 @@
+"""Tests for shared SSH connections."""
+
+import shlex
+import stat
+from pathlib import Path
+
+import pytest
+
+from setup_repo.core.git_operations import BasicGitOperations
+from setup_repo.core.ssh_mux import SshMultiplexer
+
+
+def fake_ssh(tmp_path: Path, exit_code: int = 0) -> tuple[Path, Path]:
+    """Write an ssh stand-in that records its arguments and exits with exit_code."""
+    script = tmp_path / "fake-ssh"
+    calls = tmp_path / "calls.txt"
+    script.write_text(f'#!/bin/sh\necho "$@" >> {calls}\necho "denied" >&2\nexit {exit_code}\n')
+    script.chmod(script.stat().st_mode | stat.S_IXUSR)
+    return script, calls
+
+
+class TestSshMultiplexer:
+    """Tests for SshMultiplexer."""
+
+    def test_start_hands_out_masters_in_turn(self, tmp_path: Path) -> None:
+        """Test each master is warmed once and git processes are spread over them."""
+        script, calls = fake_ssh(tmp_path)
+        ssh = SshMultiplexer(connections=2, persist=30, base_command=str(script))
+
+        assert ssh.command() is None
+        assert ssh.start() is True
+
+        warms = calls.read_text().splitlines()
+        assert len(warms) == 2
+        assert all("ControlMaster=yes" in warm and warm.endswith("-fN git@github.com") for warm in warms)
+        commands = [shlex.split(ssh.command() or "") for _ in range(3)]
+        assert commands[0] == commands[2] != commands[1]
+        assert commands[0][:3] == [str(script), "-o", "ControlMaster=auto"]
+        assert "ControlPersist=30" in commands[0]
+        control_dir = Path(commands[0][4].removeprefix("ControlPath=")).parent
+        assert control_dir.is_dir()
+
+        ssh.stop()
+
+        assert sum("-O exit" in call for call in calls.read_text().splitlines()) == 2
+        assert not control_dir.exists()
+        assert ssh.command() is None
+
+    def test_failed_masters_fall_back_to_plain_ssh(self, tmp_path: Path) -> None:
+        """Test git keeps using its own SSH connections when no master comes up."""
+        script, _ = fake_ssh(tmp_path, exit_code=255)
+        ssh = SshMultiplexer(base_command=str(script))
+
+        assert ssh.start() is False
+        assert ssh.active is False
+        assert ssh.command() is None
+
+    def test_custom_git_ssh_is_left_alone(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a GIT_SSH program is not replaced by the managed command."""
+        monkeypatch.setenv("GIT_SSH", "/usr/local/bin/my-ssh")
+        monkeypatch.delenv("GIT_SSH_COMMAND", raising=False)
+
+        assert SshMultiplexer().start() is False
+
+    def test_git_env_uses_started_masters(self, tmp_path: Path) -> None:
+        """Test git runs with GIT_SSH_COMMAND only while the masters are up."""
+        script, _ = fake_ssh(tmp_path)
+        ssh = SshMultiplexer(connections=1, base_command=str(script))
+        git = BasicGitOperations(ssh=ssh)
+
+        assert git.get_env() is None
+        ssh.start()
+        env = git.get_env()
+        assert env is not None
+        assert "ControlMaster=auto" in env["GIT_SSH_COMMAND"]
+        ssh.stop()
+        assert git.get_env() is None
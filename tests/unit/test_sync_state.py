@@ -0,0 +1,47 @@
+"""Tests for the per-repository sync state."""
+
+from datetime import UTC, datetime
+from pathlib import Path
+
+from setup_repo.core.sync_state import SyncState
+
+PUSHED_AT = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+class TestSyncState:
+    """Tests for SyncState class."""
+
+    def test_record_and_reload(self, tmp_path: Path) -> None:
+        """Test recorded values survive a save and load."""
+        state = SyncState(tmp_path / "state" / "sync_state.json")
+        state.record(tmp_path / "repo1", PUSHED_AT)
+        state.save()
+
+        reloaded = SyncState(tmp_path / "state" / "sync_state.json")
+        reloaded.load()
+
+        assert reloaded.is_up_to_date(tmp_path / "repo1", PUSHED_AT)
+        assert not reloaded.is_up_to_date(tmp_path / "repo1", PUSHED_AT.replace(hour=1))
+        assert not reloaded.is_up_to_date(tmp_path / "repo2", PUSHED_AT)
+
+    def test_unknown_pushed_at_is_never_up_to_date(self, tmp_path: Path) -> None:
+        """Test repositories without pushed_at are always synced."""
+        state = SyncState(tmp_path / "sync_state.json")
+        state.record(tmp_path / "repo1", None)
+
+        assert not state.is_up_to_date(tmp_path / "repo1", None)
+
+    def test_save_without_changes_writes_nothing(self, tmp_path: Path) -> None:
+        """Test an unchanged state is not rewritten."""
+        state = SyncState(tmp_path / "sync_state.json")
+        state.save()
+
+        assert not (tmp_path / "sync_state.json").exists()
+
+    def test_load_invalid(self, tmp_path: Path) -> None:
+        """Test a corrupt state file is ignored."""
+        (tmp_path / "sync_state.json").write_text("[]")
+        state = SyncState(tmp_path / "sync_state.json")
+        state.load()
+
+        assert not state.is_up_to_date(tmp_path / "repo1", PUSHED_AT)